@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,17 +42,26 @@ INSTALLED_APPS = [
     'api_authentication',
     'api_leave',
     'api_timesheet',
+    'api_sync',
+    'api_reports',
+    'api_search',
+    'api_core',
+    'api_audit',
+    'api_home',
     'rest_framework_simplejwt',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api_core.middleware.LoadSheddingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api_core.middleware.ReplicaRoutingMiddleware',
+    'api_core.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'EmployeeTimesheetAndLeaveManagement.urls'
@@ -81,8 +91,78 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+    },
+    # Read replica for list and report endpoints. Locally this is a second SQLite
+    # file refreshed with `python manage.py sync_replica`.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+# Hash-sharded timesheet storage (see api_timesheet.sharding): timesheets are
+# spread over these aliases by user. Locally, TIMESHEET_SHARD_COUNT=N adds N
+# SQLite files; migrate each with `migrate --database <alias>`. Never reorder.
+TIMESHEET_SHARD_COUNT = int(os.environ.get('TIMESHEET_SHARD_COUNT', 0))
+TIMESHEET_SHARDS = [f'timesheet_shard_{shard}' for shard in range(TIMESHEET_SHARD_COUNT)]
+for alias in TIMESHEET_SHARDS:
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / f'db_{alias}.sqlite3',
     }
+
+# Report jobs (api_reports.jobs): worker threads per process, how long a finished
+# report is reused for identical parameters, and when a RUNNING job counts as lost.
+REPORT_WORKERS = 2
+REPORT_CACHE_SECONDS = 3600
+REPORT_JOB_TIMEOUT_SECONDS = 1800
+
+# Columnar timesheet store for analytics (api_reports.columnar): where months are
+# exported, and how long after a month ends it counts as closed.
+ANALYTICS_STORE_DIR = BASE_DIR / 'analytics'
+ANALYTICS_CLOSE_DELAY_DAYS = 2
+
+# Audit trail (api_audit.buffer): buffered events are bulk-inserted this often,
+# or as soon as a batch fills; past the cap (database down) the oldest are dropped.
+AUDIT_FLUSH_SECONDS = 2
+AUDIT_FLUSH_BATCH_SIZE = 500
+AUDIT_MAX_BUFFERED = 100000
+
+# Delta sync (api_sync.views): next_since never passes changes recorded this
+# recently; keep it above the longest transaction that records a change.
+SYNC_SETTLE_SECONDS = 30
+
+# Threads shared by queries fanned out to several databases (api_core.parallel).
+PARALLEL_QUERY_WORKERS = 8
+
+DATABASE_ROUTERS = ['api_timesheet.sharding.TimesheetShardRouter', 'api_core.routers.ReadReplicaRouter']
+
+# Set to 'replica' to send read-only list/report queries to the replica.
+REPLICA_DATABASE_ALIAS = None
+# Seconds a user's reads stay on the primary after they write.
+REPLICA_PIN_SECONDS = 5
+
+# Per worker process (see LOAD_SHEDDING_CACHE); views opt out with request_priority = 'critical'.
+LOAD_SHEDDING_LIMITS = {
+    'low': {'MAX_IN_FLIGHT': 16, 'MAX_LATENCY': 1.0},
+    'default': {'MAX_IN_FLIGHT': 64, 'MAX_LATENCY': 5.0},
 }
+LOAD_SHEDDING_RETRY_AFTER = 5
+# Cache alias shared by all workers (Redis or Memcached) to count requests in flight
+# across them. None counts per process, which only works for threaded or ASGI
+# workers: a sync worker never has more than one request in flight.
+LOAD_SHEDDING_CACHE = None
+
+# Requests sent with `X-Profile: <PROFILER_TOKEN>` are profiled; None disables the header.
+PROFILER_TOKEN = os.environ.get('PROFILER_TOKEN')
+# Fraction of all requests profiled at random.
+PROFILER_SAMPLE_RATE = 0
+PROFILER_DIR = BASE_DIR / 'profiles'
+# Captures kept on disk; older ones are deleted.
+PROFILER_MAX_PROFILES = 50
 
 
 # Password validation
@@ -132,9 +212,43 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_FILTER_BACKENDS': [
         'rest_framework.filters.OrderingFilter',
-    ]
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api_core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # Token buckets for views with a throttle_scope (see api_core.throttling).
+    'DEFAULT_THROTTLE_RATES': {
+        'login_user': '5/min',
+        'login_ip': '30/min',
+        'clock_user': '10/min',
+        'clock_ip': '300/min',
+    },
 }
 
+# Tokens are checked against the revoked-token Bloom filter (api_authentication.revocation).
+SIMPLE_JWT = {
+    'AUTH_TOKEN_CLASSES': ('api_authentication.tokens.RevocableAccessToken',),
+    'TOKEN_REFRESH_SERIALIZER': 'api_authentication.serializers.RevocableTokenRefreshSerializer',
+}
+# Per worker process: full rebuild interval, sync interval for revocations made by
+# other processes, and the filter's false-positive rate (hits cost one query).
+REVOCATION_FILTER_MAX_AGE = 3600
+REVOCATION_SYNC_SECONDS = 5
+REVOCATION_FILTER_ERROR_RATE = 0.001
+
+# Cached /employee/me/ responses (api_authentication.profiles); changes invalidate them at once.
+PROFILE_CACHE_SECONDS = 3600
+# Cached direct-report ids per manager (api_authentication.rosters), invalidated the same way.
+ROSTER_CACHE_SECONDS = 3600
+# Cached per-status leave request counts per user (api_leave.counts), invalidated on change.
+LEAVE_COUNT_CACHE_SECONDS = 3600
+# Cached sections of /api/home/ (api_home.sections); changes invalidate them at once.
+HOME_CACHE_SECONDS = 300
+# Admin changelists (api_core.paginators): filtered lists count at most this many
+# rows, unfiltered lists of bigger tables show the database's row estimate.
+ADMIN_COUNT_LIMIT = 10000
+
 DEFAULT_FROM_EMAIL = 'company_email@domain.com'
 
 EMAIL_BACKEND = 'django.core.mail.backends.stmp.EmailBackend'
@@ -154,4 +268,6 @@ CACHES = {
         'default': {
             'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         }
-}
\ No newline at end of file
+}
+
+SEARCH_BACKEND = 'api_search.backends.SQLiteFTS5Backend'
@@ -21,5 +21,11 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('api_authentication.urls')),
     path('api/timesheet/', include('api_timesheet.urls')),
-    path('api/leave/', include('api_leave.urls'))
+    path('api/leave/', include('api_leave.urls')),
+    path('api/sync/', include('api_sync.urls')),
+    path('api/reports/', include('api_reports.urls')),
+    path('api/search/', include('api_search.urls')),
+    path('api/core/', include('api_core.urls')),
+    path('api/audit/', include('api_audit.urls')),
+    path('api/home/', include('api_home.urls')),
 ]
@@ -11,6 +11,11 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from api_core.startup import warm_up
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'EmployeeTimesheetAndLeaveManagement.settings')
 
 application = get_wsgi_application()
+
+# Import the URLconf and views now rather than on the first request.
+warm_up()
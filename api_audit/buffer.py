@@ -0,0 +1,140 @@
+import atexit
+import logging
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import AuditEventModel
+
+
+logger = logging.getLogger(__name__)
+
+# Buffered events are written at least this often; None writes them from the
+# thread that fills a batch instead of a background thread (used by tests).
+DEFAULT_AUDIT_FLUSH_SECONDS = 2
+# Events per INSERT, and the buffer size that triggers a write before the timer.
+DEFAULT_AUDIT_FLUSH_BATCH_SIZE = 500
+# Past this many unwritten events (database down), the oldest are dropped and logged.
+DEFAULT_AUDIT_MAX_BUFFERED = 100000
+
+
+class AuditBuffer:
+    """
+    Per-process buffer of committed audit events, written with bulk INSERTs by a
+    background thread every AUDIT_FLUSH_SECONDS, or as soon as a batch is full.
+    Requests only append to a list. Events still buffered when the process is
+    killed are lost; a normal exit flushes them.
+    """
+
+    def __init__(self):
+        self._events = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    @property
+    def batch_size(self):
+        return getattr(settings, 'AUDIT_FLUSH_BATCH_SIZE', DEFAULT_AUDIT_FLUSH_BATCH_SIZE)
+
+    def __len__(self):
+        return len(self._events)
+
+    def extend(self, events):
+        max_buffered = getattr(settings, 'AUDIT_MAX_BUFFERED', DEFAULT_AUDIT_MAX_BUFFERED)
+        with self._lock:
+            self._events.extend(events)
+            buffered = len(self._events)
+            overflow = buffered - max_buffered
+            if overflow > 0:
+                del self._events[:overflow]
+        if overflow > 0:
+            logger.error("Audit buffer full: dropped the %s oldest events", overflow)
+
+        interval = getattr(settings, 'AUDIT_FLUSH_SECONDS', DEFAULT_AUDIT_FLUSH_SECONDS)
+        if interval is None:
+            if buffered >= self.batch_size:
+                self.flush()
+            return
+
+        self._start(interval)
+        if buffered >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """Writes every buffered event; returns how many. Failed writes are kept for the next flush."""
+        with self._flush_lock:
+            with self._lock:
+                events, self._events = self._events, []
+            if not events:
+                return 0
+            try:
+                AuditEventModel.objects.bulk_create(events, batch_size=self.batch_size)
+            except Exception:
+                with self._lock:
+                    self._events[:0] = events
+                raise
+            return len(events)
+
+    def _start(self, interval):
+        # The thread does not survive a fork, so a pre-forked worker starts its own.
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._thread is None:
+                atexit.register(self._flush_at_exit)
+            self._thread = threading.Thread(target=self._run, args=(interval,), name='audit-flush', daemon=True)
+            self._thread.start()
+
+    def _run(self, interval):
+        while True:
+            self._wake.wait(interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Could not write audit events; retrying in %ss", interval)
+            finally:
+                close_old_connections()
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Could not write %s audit events at exit", len(self))
+
+
+audit_buffer = AuditBuffer()
+
+
+def record_event(action, actor, subject_type, subject_id, subject_user=None, details=None, using=None):
+    return record_events(action, actor, subject_type, [(subject_id, subject_user)], details, using)
+
+
+def record_events(action, actor, subject_type, rows, details=None, using=None):
+    """
+    Audits `action` by `actor` on (subject_id, subject_user) rows. The events are
+    buffered once the transaction on `using` commits (at once outside one), so
+    rolled-back actions leave no trace and the caller runs no INSERT.
+    """
+    now = timezone.now()
+    events = [
+        AuditEventModel(
+            action=action,
+            actor_id=getattr(actor, 'pk', actor),
+            subject_type=subject_type,
+            subject_id=subject_id,
+            subject_user_id=getattr(subject_user, 'pk', subject_user),
+            details=details or {},
+            occurred_at=now,
+        )
+        for subject_id, subject_user in rows
+    ]
+    if events:
+        transaction.on_commit(partial(audit_buffer.extend, events), using=using)
+    return events
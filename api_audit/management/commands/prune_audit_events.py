@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api_audit.models import AuditEventModel
+
+
+DEFAULT_KEEP_MONTHS = 24
+
+
+class Command(BaseCommand):
+    help = "Delete audit events from months older than --keep-months (the current month counts as one)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-months', type=int, default=DEFAULT_KEEP_MONTHS)
+
+    def handle(self, *args, **options):
+        current = AuditEventModel.month_start(timezone.now())
+        months = current.year * 12 + current.month - 1 - (options['keep_months'] - 1)
+        before = current.replace(year=months // 12, month=months % 12 + 1)
+
+        deleted, _ = AuditEventModel.objects.delete_months_before(before)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} audit events from before {before:%Y-%m}."))
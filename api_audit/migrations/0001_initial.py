@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-19 16:27
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEventModel',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('action', models.CharField(choices=[('LEAVE_APPROVED', 'Leave approved'), ('LEAVE_REJECTED', 'Leave rejected'), ('ACCOUNT_CREATED', 'Account created'), ('CLOCK_IN_CORRECTED', 'Clock-in time entered'), ('CLOCK_OUT_CORRECTED', 'Clock-out time entered'), ('SHIFT_AUTO_CLOSED', 'Stale shift auto-closed')], max_length=30)),
+                ('subject_type', models.CharField(choices=[('LEAVE_REQUEST', 'Leave request'), ('USER', 'User'), ('TIMESHEET', 'Timesheet')], max_length=20)),
+                ('subject_id', models.BigIntegerField()),
+                ('details', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('occurred_at', models.DateTimeField()),
+                ('actor', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('subject_user', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-occurred_at', '-id'],
+                'indexes': [models.Index(fields=['actor', 'occurred_at'], name='api_audit_a_actor_i_6e4c87_idx'), models.Index(fields=['subject_type', 'subject_id', 'occurred_at'], name='api_audit_a_subject_fa29a3_idx'), models.Index(fields=['subject_user', 'occurred_at'], name='api_audit_a_subject_39148f_idx'), models.Index(fields=['occurred_at'], name='api_audit_a_occurre_690d43_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,112 @@
+import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class AppendOnlyError(Exception):
+    pass
+
+
+class AuditEventQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        raise AppendOnlyError("Audit events cannot be changed.")
+
+    def delete(self):
+        raise AppendOnlyError("Audit events cannot be deleted; use delete_months_before() for retention.")
+
+    def delete_months_before(self, before):
+        """
+        Deletes every event before `before` (the first moment of a UTC month), for
+        retention: one DELETE over a range of the occurred_at index.
+        """
+        return models.QuerySet.delete(self.filter(occurred_at__lt=before))
+
+
+class AuditEventModel(models.Model):
+    """
+    Append-only audit trail of leave decisions, account creation and clock
+    corrections. Events are written in batches by buffer.AuditBuffer, not by the
+    request that caused them.
+
+    Fields:
+        action (CharField): What happened.
+        actor (ForeignKey): Who did it; null for system jobs such as scan_timesheets.
+        subject_type (CharField): The kind of record acted on (LEAVE_REQUEST, USER, TIMESHEET).
+        subject_id (BigIntegerField): Primary key of that record.
+        subject_user (ForeignKey): The employee the record belongs to.
+        details (JSONField): Action-specific values, e.g. the entered clock time.
+        occurred_at (DateTimeField): When the action happened, not when the row was
+            written. Retention works in whole UTC months of it.
+
+    Notes:
+        - Rows are never updated or deleted one by one: the queryset refuses
+          update() and delete(), and the model refuses save() of an existing row.
+          Retention deletes whole months (prune_audit_events).
+        - The table is not partitioned: old months are deleted through the
+          occurred_at index. Every query filters or orders on occurred_at, so a
+          PostgreSQL deployment could partition it by month without code changes.
+        - actor and subject_user are not database constraints, so the trail
+          survives user deletion.
+
+    Meta:
+        Indexes (actor, occurred_at), (subject_type, subject_id, occurred_at) and
+        (subject_user, occurred_at) for the query endpoint, and occurred_at for
+        time-range queries and deleting old months.
+    """
+    class Action(models.TextChoices):
+        LEAVE_APPROVED = "LEAVE_APPROVED", "Leave approved"
+        LEAVE_REJECTED = "LEAVE_REJECTED", "Leave rejected"
+        ACCOUNT_CREATED = "ACCOUNT_CREATED", "Account created"
+        CLOCK_IN_CORRECTED = "CLOCK_IN_CORRECTED", "Clock-in time entered"
+        CLOCK_OUT_CORRECTED = "CLOCK_OUT_CORRECTED", "Clock-out time entered"
+        SHIFT_AUTO_CLOSED = "SHIFT_AUTO_CLOSED", "Stale shift auto-closed"
+
+    class Subject(models.TextChoices):
+        LEAVE_REQUEST = "LEAVE_REQUEST", "Leave request"
+        USER = "USER", "User"
+        TIMESHEET = "TIMESHEET", "Timesheet"
+
+    id = models.BigAutoField(primary_key=True)
+    action = models.CharField(max_length=30, choices=Action.choices)
+    actor = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False,
+        null=True, blank=True, related_name='+',
+    )
+    subject_type = models.CharField(max_length=20, choices=Subject.choices)
+    subject_id = models.BigIntegerField()
+    subject_user = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False,
+        null=True, blank=True, related_name='+',
+    )
+    details = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    occurred_at = models.DateTimeField()
+
+    objects = AuditEventQuerySet.as_manager()
+
+    @staticmethod
+    def month_start(value):
+        """The first moment of the UTC month holding an aware datetime."""
+        return value.astimezone(datetime.timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise AppendOnlyError("Audit events cannot be changed.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise AppendOnlyError("Audit events cannot be deleted.")
+
+    def __str__(self):
+        return f'{self.get_action_display()} {self.subject_type} #{self.subject_id} at {self.occurred_at:%Y-%m-%d %H:%M}'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['actor', 'occurred_at']),
+            models.Index(fields=['subject_type', 'subject_id', 'occurred_at']),
+            models.Index(fields=['subject_user', 'occurred_at']),
+            models.Index(fields=['occurred_at']),
+        ]
+
+        ordering = ['-occurred_at', '-id']
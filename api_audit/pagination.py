@@ -0,0 +1,7 @@
+from rest_framework.pagination import CursorPagination
+
+
+class AuditEventPagination(CursorPagination):
+    """Newest first; the cursor keeps deep pages as cheap as the first one."""
+    page_size = 50
+    ordering = ('-occurred_at', '-id')
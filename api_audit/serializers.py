@@ -0,0 +1,32 @@
+from rest_framework import serializers
+
+from . import models as my_models
+
+
+class AuditEventSerializer(serializers.ModelSerializer):
+    actor_username = serializers.CharField(source='actor.username', read_only=True, default=None)
+
+    class Meta:
+        model = my_models.AuditEventModel
+        fields = [
+            'id', 'action', 'actor', 'actor_username', 'subject_type', 'subject_id', 'subject_user',
+            'details', 'occurred_at',
+        ]
+
+
+class AuditEventFilterSerializer(serializers.Serializer):
+    """Query parameters of the audit event list; every filter is optional."""
+    action = serializers.ChoiceField(choices=my_models.AuditEventModel.Action.choices, required=False)
+    actor = serializers.IntegerField(required=False)
+    subject_type = serializers.ChoiceField(choices=my_models.AuditEventModel.Subject.choices, required=False)
+    subject_id = serializers.IntegerField(required=False)
+    subject_user = serializers.IntegerField(required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        if 'subject_id' in data and 'subject_type' not in data:
+            raise serializers.ValidationError({"subject_type": "Required with subject_id."})
+        if 'since' in data and 'until' in data and data['since'] >= data['until']:
+            raise serializers.ValidationError({"until": "Must be after since."})
+        return data
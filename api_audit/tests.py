@@ -0,0 +1,112 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api_leave.models import LeaveRequestModel
+from .buffer import audit_buffer, record_event
+from .models import AppendOnlyError, AuditEventModel
+
+
+Action = AuditEventModel.Action
+Subject = AuditEventModel.Subject
+
+
+@override_settings(AUDIT_FLUSH_SECONDS=None)
+class AuditTrailTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', is_staff=True, is_superuser=True)
+        cls.employee = User.objects.create_user('employee')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def leave_request(self):
+        return LeaveRequestModel.objects.create(
+            user=self.employee, start_date=datetime.date(2026, 7, 1), end_date=datetime.date(2026, 7, 3), reason='Holiday',
+        )
+
+    def test_events_are_buffered_on_commit_and_bulk_inserted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for subject_id in range(3):
+                record_event(Action.LEAVE_APPROVED, self.admin, Subject.LEAVE_REQUEST, subject_id, self.employee)
+            self.assertEqual(len(audit_buffer), 0)
+        self.assertEqual(len(audit_buffer), 3)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(audit_buffer.flush(), 3)
+        self.assertEqual(AuditEventModel.objects.filter(actor=self.admin).count(), 3)
+
+    def test_rolled_back_actions_are_not_audited(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                record_event(Action.ACCOUNT_CREATED, self.admin, Subject.USER, self.employee.pk, self.employee)
+                transaction.set_rollback(True)
+        self.assertEqual(audit_buffer.flush(), 0)
+
+    def test_leave_decisions_are_audited(self):
+        approved, rejected, bulk = self.leave_request(), self.leave_request(), self.leave_request()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.put(f'/api/leave//api/leave-request/{approved.pk}/approve/').status_code, 200)
+            self.assertEqual(self.client.put(f'/api/leave//api/leave-request/{rejected.pk}/reject/').status_code, 200)
+            response = self.client.post(
+                '/api/leave//api/leave-request/bulk-decision/', {'decisions': [{'id': bulk.pk, 'decision': 'REJECT'}]}, format='json',
+            )
+            self.assertEqual(response.status_code, 200, response.data)
+        audit_buffer.flush()
+
+        events = AuditEventModel.objects.filter(subject_type=Subject.LEAVE_REQUEST).order_by('subject_id')
+        self.assertEqual(
+            [(event.subject_id, event.action, event.actor_id, event.subject_user_id) for event in events],
+            [
+                (approved.pk, Action.LEAVE_APPROVED, self.admin.pk, self.employee.pk),
+                (rejected.pk, Action.LEAVE_REJECTED, self.admin.pk, self.employee.pk),
+                (bulk.pk, Action.LEAVE_REJECTED, self.admin.pk, self.employee.pk),
+            ],
+        )
+
+    def test_query_endpoint_filters(self):
+        now = timezone.now()
+        events = []
+        for days_ago, actor in ((40, self.admin), (10, self.admin), (5, self.employee), (1, self.admin)):
+            occurred_at = now - datetime.timedelta(days=days_ago)
+            events.append(AuditEventModel(
+                action=Action.LEAVE_APPROVED, actor=actor, subject_type=Subject.LEAVE_REQUEST, subject_id=days_ago,
+                subject_user=self.employee, occurred_at=occurred_at,
+            ))
+        AuditEventModel.objects.bulk_create(events)
+
+        since = (now - datetime.timedelta(days=20)).isoformat()
+        response = self.client.get('/api/audit/events/', {'actor': self.admin.pk, 'since': since})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual([event['subject_id'] for event in response.data['results']], [1, 10])
+        self.assertEqual(response.data['results'][0]['actor_username'], 'admin')
+
+        response = self.client.get('/api/audit/events/', {'subject_type': Subject.LEAVE_REQUEST, 'subject_id': 40})
+        self.assertEqual([event['subject_id'] for event in response.data['results']], [40])
+
+        self.assertEqual(self.client.get('/api/audit/events/', {'subject_id': 40}).status_code, 400)
+        self.client.force_authenticate(self.employee)
+        self.assertEqual(self.client.get('/api/audit/events/').status_code, 403)
+
+    def test_events_are_append_only(self):
+        occurred_at = timezone.now()
+        event = AuditEventModel.objects.create(
+            action=Action.ACCOUNT_CREATED, actor=self.admin, subject_type=Subject.USER, subject_id=self.employee.pk,
+            occurred_at=occurred_at,
+        )
+        with self.assertRaises(AppendOnlyError):
+            event.save()
+        with self.assertRaises(AppendOnlyError):
+            AuditEventModel.objects.update(action=Action.LEAVE_APPROVED)
+        with self.assertRaises(AppendOnlyError):
+            AuditEventModel.objects.all().delete()
+
+        month = AuditEventModel.month_start(occurred_at)
+        self.assertEqual(AuditEventModel.objects.delete_months_before(month)[0], 0)
+        self.assertEqual(AuditEventModel.objects.delete_months_before(month + datetime.timedelta(days=31))[0], 1)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+
+from . import views as my_views
+
+
+urlpatterns = [
+    path('events/', my_views.AuditEventListView.as_view(), name='audit-event-list'),
+]
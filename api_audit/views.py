@@ -0,0 +1,35 @@
+from rest_framework import generics, permissions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+from . import models as my_models, serializers as my_serializers
+from .pagination import AuditEventPagination
+
+
+class AuditEventListView(generics.ListAPIView):
+    """
+    Admins: audit events, newest first, filtered by `action`, `actor`,
+    `subject_type` + `subject_id`, `subject_user` and the `since`/`until` range.
+    Every filter is served by an index that also gives the order.
+    """
+    serializer_class = my_serializers.AuditEventSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+    pagination_class = AuditEventPagination
+    read_from_replica = True
+    request_priority = 'low'
+
+    def get_queryset(self):
+        params = my_serializers.AuditEventFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+
+        queryset = my_models.AuditEventModel.objects.select_related('actor')
+        for field in ('action', 'actor', 'subject_type', 'subject_id', 'subject_user'):
+            if field in filters:
+                queryset = queryset.filter(**{field: filters[field]})
+        if 'since' in filters:
+            queryset = queryset.filter(occurred_at__gte=filters['since'])
+        if 'until' in filters:
+            queryset = queryset.filter(occurred_at__lt=filters['until'])
+        return queryset
@@ -1,3 +1,26 @@
 from django.contrib import admin
 
-# Register your models here.
+from api_core.paginators import EstimatedCountPaginator
+from .models import EmployeeModel
+
+
+@admin.register(EmployeeModel)
+class EmployeeAdmin(admin.ModelAdmin):
+    """
+    Employees with their user and manager joined in. User and manager are raw-id
+    widgets rather than selects of every user and employee. Saving goes through
+    EmployeeModel.save(), so cached profiles and team rosters are invalidated as
+    for any other change.
+    """
+    list_display = ['user', 'employee_id', 'department', 'job_title', 'role', 'manager_username', 'timezone']
+    list_select_related = ['user', 'manager__user']
+    list_filter = ['role', 'department']
+    search_fields = ['user__username', 'user__email', 'user__first_name', 'user__last_name']
+    raw_id_fields = ['user', 'manager']
+    readonly_fields = ['employee_id']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @admin.display(description='manager', ordering='manager__user__username')
+    def manager_username(self, employee):
+        return employee.manager.user.username if employee.manager else None
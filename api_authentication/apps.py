@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class ApiAuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api_authentication'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+    def warm_up(self):
+        from django.db import DatabaseError
+        from .directory import directory_index
+
+        try:
+            directory_index.build()
+        except DatabaseError:
+            # Not migrated yet; the first search builds the index instead.
+            pass
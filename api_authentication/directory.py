@@ -0,0 +1,194 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+from django.db import connections
+
+from .models import EmployeeModel
+
+
+# Each worker process keeps its own index; rebuild periodically to pick up changes made by other processes.
+DIRECTORY_INDEX_MAX_AGE = 300
+AUTOCOMPLETE_MAX_RESULTS = 20
+
+DirectoryEntry = namedtuple(
+    'DirectoryEntry',
+    ['pk', 'employee_id', 'user_id', 'username', 'email', 'full_name', 'role', 'department'],
+)
+
+ENTRY_FIELDS = (
+    'pk', 'employee_id', 'user_id', 'user__username', 'user__email',
+    'user__first_name', 'user__last_name', 'role', 'department',
+)
+
+
+def _load_entries(queryset):
+    for pk, employee_id, user_id, username, email, first_name, last_name, role, department in queryset.values_list(*ENTRY_FIELDS):
+        yield DirectoryEntry(
+            pk=pk,
+            employee_id=str(employee_id),
+            user_id=user_id,
+            username=username,
+            email=email,
+            full_name=f"{first_name} {last_name}".strip(),
+            role=role,
+            department=department,
+        )
+
+
+def _entry_keys(entry):
+    """Lowercased search keys: username, email, full name and each name part."""
+    keys = {entry.username.lower()}
+    if entry.email:
+        keys.add(entry.email.lower())
+    if entry.full_name:
+        full_name = entry.full_name.lower()
+        keys.add(full_name)
+        keys.update(full_name.split())
+    return keys
+
+
+class EmployeeDirectoryIndex:
+    """
+    Sorted, array-backed prefix index over the employee directory.
+
+    Keys live in one sorted list with a parallel array of employee primary keys,
+    so a lookup is a binary search plus a scan over the matching run. The state is
+    replaced as a whole on every change, so readers never take the lock.
+
+    Web workers build the index as they boot (ApiAuthenticationConfig.warm_up()).
+    Once it is older than max_age, the next search starts a rebuild on a
+    background thread and answers from the current index meanwhile; changes
+    applied during the rebuild are replayed onto the new index before it is
+    swapped in. Only a search before the first build waits for one.
+    """
+    def __init__(self, max_age=DIRECTORY_INDEX_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._state = None
+        self._built_at = 0.0
+        self._rebuilding = False
+        # Changes applied while a rebuild runs, replayed onto its result.
+        self._pending = []
+
+    @property
+    def is_built(self):
+        return self._state is not None
+
+    def build(self):
+        entries = {entry.pk: entry for entry in _load_entries(EmployeeModel.objects.all())}
+        self._state = self._make_state(entries)
+        self._built_at = time.monotonic()
+
+    def _rebuild_in_background(self):
+        try:
+            entries = {entry.pk: entry for entry in _load_entries(EmployeeModel.objects.all())}
+            state = self._make_state(entries)
+            with self._lock:
+                for removed_pks, added_entries in self._pending:
+                    state = self._changed(state, removed_pks, added_entries)
+                self._state = state
+                self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._rebuilding = False
+                self._pending = []
+            connections.close_all()
+
+    def ensure_built(self):
+        if self._state is None:
+            with self._lock:
+                if self._state is None:
+                    self.build()
+            return
+
+        if time.monotonic() - self._built_at > self.max_age and not self._rebuilding:
+            with self._lock:
+                if self._rebuilding:
+                    return
+                self._rebuilding = True
+            threading.Thread(target=self._rebuild_in_background, name='directory-index', daemon=True).start()
+
+    def _make_state(self, entries):
+        pairs = sorted((key, pk) for pk, entry in entries.items() for key in _entry_keys(entry))
+        keys = [key for key, _ in pairs]
+        owners = array('q', (pk for _, pk in pairs))
+        return keys, owners, entries
+
+    def upsert(self, entries):
+        entries = list(entries)
+        self._apply([entry.pk for entry in entries], entries)
+
+    def remove(self, pks):
+        self._apply(pks, [])
+
+    def _apply(self, removed_pks, added_entries):
+        if self._state is None:
+            return
+        removed_pks = list(removed_pks)
+        with self._lock:
+            self._state = self._changed(self._state, removed_pks, added_entries)
+            if self._rebuilding:
+                self._pending.append((removed_pks, added_entries))
+
+    @staticmethod
+    def _changed(state, removed_pks, added_entries):
+        keys, owners, entries = state
+        keys, owners, entries = list(keys), array('q', owners), dict(entries)
+
+        for pk in set(removed_pks):
+            entry = entries.pop(pk, None)
+            if entry is None:
+                continue
+            for key in _entry_keys(entry):
+                position = bisect_left(keys, key)
+                while owners[position] != pk:
+                    position += 1
+                del keys[position]
+                del owners[position]
+
+        for entry in added_entries:
+            entries[entry.pk] = entry
+            for key in _entry_keys(entry):
+                position = bisect_left(keys, key)
+                keys.insert(position, key)
+                owners.insert(position, entry.pk)
+
+        return keys, owners, entries
+
+    def search(self, prefix, role=None, department=None, limit=10):
+        self.ensure_built()
+        keys, owners, entries = self._state
+        prefix = prefix.strip().lower()
+        department = department.lower() if department else None
+
+        results = []
+        seen = set()
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            pk = owners[position]
+            position += 1
+            if pk in seen:
+                continue
+            seen.add(pk)
+
+            entry = entries[pk]
+            if role and entry.role != role:
+                continue
+            if department and (entry.department or '').lower() != department:
+                continue
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+
+directory_index = EmployeeDirectoryIndex()
+
+
+def refresh_employees(queryset):
+    """Re-reads the given employees into the index (no-op until the index is built)."""
+    if directory_index.is_built:
+        directory_index.upsert(list(_load_entries(queryset)))
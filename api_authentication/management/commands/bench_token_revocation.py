@@ -0,0 +1,97 @@
+import datetime
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api_authentication.models import RevokedTokenModel
+from api_authentication.revocation import revoke_token, revoked_tokens
+from api_authentication.tokens import RevocableAccessToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Per-request cost of JWT revocation checks with --revoked revoked tokens: "
+        "no check, a table lookup on every request, and the Bloom filter. The "
+        "revoked tokens are inserted in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--revoked', type=int, default=1_000_000)
+        parser.add_argument('--requests', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options['revoked'], options['requests'])
+            transaction.set_rollback(True)
+
+    def run(self, revoked, requests):
+        user = User.objects.create_user(f'bench-{uuid.uuid4().hex[:8]}')
+        expires_at = timezone.now() + datetime.timedelta(days=1)
+
+        started = time.perf_counter()
+        for offset in range(0, revoked, 10000):
+            RevokedTokenModel.objects.bulk_create([
+                RevokedTokenModel(jti=uuid.uuid4().hex, token_type='access', user=user, expires_at=expires_at)
+                for _ in range(min(10000, revoked - offset))
+            ])
+        self.stdout.write(f"Inserted {revoked:,} revoked tokens in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        revoked_tokens.build()
+        bloom = revoked_tokens.filter
+        self.stdout.write(
+            f"Built the filter in {time.perf_counter() - started:.1f}s: {len(bloom.bits) / 2 ** 20:.1f} MiB, "
+            f"{bloom.hashes} hashes"
+        )
+
+        tokens = [str(RevocableAccessToken.for_user(user)) for _ in range(requests)]
+        revoked_token = RevocableAccessToken.for_user(user)
+        revoke_token(revoked_token)
+        revoked_token = str(revoked_token)
+
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(100000))
+        self.stdout.write(f"False positives: {false_positives / 1000:.3f}% of 100,000 unrevoked jtis\n")
+
+        def table_lookup(raw):
+            token = AccessToken(raw)
+            RevokedTokenModel.objects.filter(jti=token['jti']).exists()
+
+        def rejected(raw):
+            try:
+                RevocableAccessToken(raw)
+            except TokenError:
+                return
+            raise AssertionError("revoked token was accepted")
+
+        authentication = JWTAuthentication()
+        factory = RequestFactory()
+        requests_with_token = [factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}') for token in tokens]
+
+        baseline = self.time_per_call(AccessToken, tokens)
+        self.report("decode only (no revocation)", baseline)
+        self.report("decode + table lookup", self.time_per_call(table_lookup, tokens), baseline)
+        self.report("decode + Bloom filter", self.time_per_call(RevocableAccessToken, tokens), baseline)
+        self.report("revoked token rejected", self.time_per_call(rejected, [revoked_token] * min(requests, 2000)), baseline)
+        self.report("JWTAuthentication (with user)", self.time_per_call(authentication.authenticate, requests_with_token))
+
+    def time_per_call(self, func, arguments):
+        for argument in arguments[:100]:
+            func(argument)
+        started = time.perf_counter()
+        for argument in arguments:
+            func(argument)
+        return (time.perf_counter() - started) / len(arguments)
+
+    def report(self, label, seconds, baseline=None):
+        line = f"  {label:32} {seconds * 1e6:8.1f} µs/request"
+        if baseline is not None and label != "decode only (no revocation)":
+            line += f"  ({(seconds - baseline) * 1e6:+.1f} µs)"
+        self.stdout.write(line)
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api_authentication.models import RevokedTokenModel
+
+
+class Command(BaseCommand):
+    help = "Delete revoked tokens that have expired anyway. Meant to run from cron, e.g. daily."
+
+    def handle(self, *args, **options):
+        deleted, _ = RevokedTokenModel.objects.filter(expires_at__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired revoked tokens."))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-19 16:04
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password_reset_required', models.BooleanField(default=True)),
+                ('employee_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('date_of_birth', models.DateField(blank=True, null=True)),
+                ('gender', models.CharField(blank=True, choices=[('Male', 'Male'), ('Female', 'Female')], max_length=10, null=True)),
+                ('phone_number_one', models.CharField(blank=True, max_length=20, null=True)),
+                ('phone_number_two', models.CharField(blank=True, max_length=20, null=True)),
+                ('department', models.CharField(blank=True, max_length=250, null=True)),
+                ('job_title', models.CharField(blank=True, max_length=250, null=True)),
+                ('hire_date', models.DateField(blank=True, null=True)),
+                ('leave_balance', models.FloatField(blank=True, null=True)),
+                ('role', models.CharField(choices=[('EMPLOYEE', 'EMPLOYEE'), ('MANAGER', 'MANAGER'), ('ADMIN', 'ADMIN')], default='EMPLOYEE', max_length=10)),
+                ('manager', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='api_authentication.employeemodel')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
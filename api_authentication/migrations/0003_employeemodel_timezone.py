@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 16:42
+
+import api_authentication.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_authentication', '0002_revokedtokenmodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employeemodel',
+            name='timezone',
+            field=models.CharField(blank=True, max_length=64, null=True, validators=[api_authentication.models.validate_timezone]),
+        ),
+    ]
@@ -1,6 +1,22 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.utils import timezone as django_timezone
+import functools
 import uuid
+import zoneinfo
+
+
+@functools.cache
+def available_timezones():
+    # Scans the tz database on disk, so only once per process.
+    return frozenset(zoneinfo.available_timezones())
+
+
+def validate_timezone(value):
+    if value not in available_timezones():
+        raise ValidationError(f"Unknown time zone: {value}")
+
 
 # let user to login using both email and username
 # default User model - for login, registration 
@@ -23,6 +39,8 @@ class EmployeeModel(models.Model):
         leave_balance (FloatField): Remaining leave balance for the employee.
         manager (ForeignKey): Reference to the employee's manager (self-referential).
         role (CharField): Role of the employee (EMPLOYEE, MANAGER, ADMIN).
+        timezone (CharField): IANA time zone the employee works in; empty means TIME_ZONE.
+            Decides which local date (work_date) a timesheet entry belongs to.
 
     Notes:
         - Used for employee registration and profile management.
@@ -51,4 +69,51 @@ class EmployeeModel(models.Model):
     hire_date = models.DateField(null=True, blank=True)
     leave_balance = models.FloatField(null=True, blank=True)
     manager = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL)
-    role = models.CharField(max_length=10, choices=ROLE_CHOICES, default=ROLE_CHOICES[0])
\ No newline at end of file
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES, default=ROLE_CHOICES[0][0])
+    timezone = models.CharField(max_length=64, null=True, blank=True, validators=[validate_timezone])
+
+    @property
+    def tzinfo(self):
+        return zoneinfo.ZoneInfo(self.timezone) if self.timezone else django_timezone.get_default_timezone()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the roster signal tell which manager a save moved the employee away from.
+        instance._loaded_manager_id = instance.__dict__.get('manager_id')
+        return instance
+
+class RevokedTokenModel(models.Model):
+    """
+    A revoked JWT, identified by its jti claim.
+
+    Fields:
+        jti (CharField): The token's unique identifier.
+        token_type (CharField): 'access' or 'refresh'.
+        user (ForeignKey): The token's owner.
+        expires_at (DateTimeField): When the token expires anyway; the row is
+            useless after that and is removed by prune_revoked_tokens.
+        revoked_at (DateTimeField): When the token was revoked.
+
+    Notes:
+        - Requests check revocation against an in-process Bloom filter of these
+          jtis first (see revocation.py); this table is only read on a filter hit.
+
+    Meta:
+        Adds an index on revoked_at for the filter's incremental sync and on
+        expires_at for pruning and rebuilds.
+    """
+    jti = models.CharField(max_length=255, unique=True)
+    token_type = models.CharField(max_length=20)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    expires_at = models.DateTimeField()
+    revoked_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.token_type} token {self.jti} of user {self.user_id}'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['revoked_at']),
+            models.Index(fields=['expires_at']),
+        ]
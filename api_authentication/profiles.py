@@ -0,0 +1,25 @@
+from api_core.caching import VersionedCache
+from .models import EmployeeModel
+
+
+DEFAULT_PROFILE_CACHE_SECONDS = 3600
+
+profile_cache = VersionedCache('employee_profile', 'PROFILE_CACHE_SECONDS', DEFAULT_PROFILE_CACHE_SECONDS)
+
+
+def get_profile(user_id):
+    """
+    The serialized profile (EmployeeProfileSerializer) of an active user, or None.
+    Cached per user; a miss is one query joining the user and manager.
+    """
+    from .serializers import EmployeeProfileSerializer
+
+    def load():
+        employee = EmployeeModel.objects.select_related('user', 'manager').filter(user_id=user_id, user__is_active=True).first()
+        return EmployeeProfileSerializer(employee).data if employee is not None else None
+
+    return profile_cache.get(user_id, load)
+
+
+def invalidate_profiles(user_ids):
+    profile_cache.invalidate(user_ids)
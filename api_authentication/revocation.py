@@ -0,0 +1,168 @@
+import datetime
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import RevokedTokenModel
+
+
+# Each worker process keeps its own filter: rebuilt from the table this often,
+# which drops expired tokens and resizes it ...
+DEFAULT_REVOCATION_FILTER_MAX_AGE = 3600
+# ... and synced with revocations made by other processes this often in between.
+DEFAULT_REVOCATION_SYNC_SECONDS = 5
+# Share of unrevoked tokens that hit the filter and need a database lookup.
+DEFAULT_REVOCATION_FILTER_ERROR_RATE = 0.001
+# A rebuilt filter is sized for this many times the revocations it starts with,
+# so revocations added until the next rebuild keep the error rate.
+REVOCATION_FILTER_HEADROOM = 1.5
+REVOCATION_FILTER_MIN_CAPACITY = 10000
+# Syncs re-read this far back, to catch rows committed after later ones were read.
+REVOCATION_SYNC_OVERLAP = datetime.timedelta(seconds=60)
+
+
+class BloomFilter:
+    """
+    Bloom filter over strings: no false negatives, false positives at about
+    `error_rate` while it holds at most `capacity` items. The bit positions of an
+    item come from the two halves of one BLAKE2b digest (double hashing).
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _hash(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+    def add(self, item):
+        first, step = self._hash(item)
+        bits, size = self.bits, self.size
+        for i in range(self.hashes):
+            position = (first + i * step) % size
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        first, step = self._hash(item)
+        bits, size = self.bits, self.size
+        for i in range(self.hashes):
+            position = (first + i * step) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+def _revoked_tokens():
+    # Always the primary: authentication runs inside replica_reads() on
+    # read_from_replica views, and a lagging replica would miss recent logouts.
+    return RevokedTokenModel.objects.using(DEFAULT_DB_ALIAS)
+
+
+class RevokedTokenFilter:
+    """
+    In-process Bloom filter of the jtis of revoked, unexpired tokens, so checking
+    a token that was not revoked costs no query; the table is read only on a hit.
+
+    Revocations made in this process are added at once; those made by other
+    processes within `sync_interval` seconds. Rebuilds run in a background thread
+    while the current filter keeps serving; only the first build blocks.
+    """
+
+    def __init__(self, max_age=None, sync_interval=None, error_rate=None):
+        self.max_age = max_age or getattr(settings, 'REVOCATION_FILTER_MAX_AGE', DEFAULT_REVOCATION_FILTER_MAX_AGE)
+        self.sync_interval = sync_interval or getattr(settings, 'REVOCATION_SYNC_SECONDS', DEFAULT_REVOCATION_SYNC_SECONDS)
+        self.error_rate = error_rate or getattr(settings, 'REVOCATION_FILTER_ERROR_RATE', DEFAULT_REVOCATION_FILTER_ERROR_RATE)
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        # (bloom filter, time of the last sync) is replaced as a whole.
+        self._state = None
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._rebuilding = False
+
+    @property
+    def filter(self):
+        return self._state[0] if self._state else None
+
+    def build(self):
+        synced_at = timezone.now()
+        revoked = _revoked_tokens().filter(expires_at__gt=synced_at)
+        bloom = BloomFilter(max(int(revoked.count() * REVOCATION_FILTER_HEADROOM), REVOCATION_FILTER_MIN_CAPACITY), self.error_rate)
+        for jti in revoked.values_list('jti', flat=True).iterator(chunk_size=10000):
+            bloom.add(jti)
+
+        with self._lock:
+            self._state = bloom, synced_at
+            self._built_at = self._checked_at = time.monotonic()
+            # Picks up what was revoked while the filter was being built.
+            self._sync()
+
+    def _sync(self):
+        bloom, synced_at = self._state
+        now = timezone.now()
+        for jti in _revoked_tokens().filter(revoked_at__gte=synced_at - REVOCATION_SYNC_OVERLAP).values_list('jti', flat=True):
+            bloom.add(jti)
+        self._state = bloom, now
+
+    def _rebuild_in_background(self):
+        try:
+            self.build()
+        finally:
+            self._rebuilding = False
+            connections.close_all()
+
+    def ensure_fresh(self):
+        if self._state is None:
+            with self._build_lock:
+                if self._state is None:
+                    self.build()
+            return
+
+        now = time.monotonic()
+        if now - self._built_at > self.max_age and not self._rebuilding:
+            with self._lock:
+                if self._rebuilding:
+                    return
+                self._rebuilding = True
+            threading.Thread(target=self._rebuild_in_background, name='revocation-filter', daemon=True).start()
+        elif now - self._checked_at > self.sync_interval:
+            with self._lock:
+                if time.monotonic() - self._checked_at > self.sync_interval:
+                    self._checked_at = time.monotonic()
+                    self._sync()
+
+    def is_revoked(self, jti):
+        self.ensure_fresh()
+        if jti not in self._state[0]:
+            return False
+        return _revoked_tokens().filter(jti=jti).exists()
+
+    def add(self, jti):
+        with self._lock:
+            if self._state is not None:
+                self._state[0].add(jti)
+
+
+revoked_tokens = RevokedTokenFilter()
+
+
+def revoke_token(token):
+    """Revokes a validated simplejwt token until it expires."""
+    jti = token[jwt_settings.JTI_CLAIM]
+    RevokedTokenModel.objects.get_or_create(jti=jti, defaults={
+        'token_type': token[jwt_settings.TOKEN_TYPE_CLAIM],
+        'user_id': token[jwt_settings.USER_ID_CLAIM],
+        'expires_at': datetime_from_epoch(token['exp']),
+    })
+    revoked_tokens.add(jti)
@@ -0,0 +1,39 @@
+from array import array
+
+from api_core.caching import VersionedCache
+from .models import EmployeeModel
+
+
+DEFAULT_ROSTER_CACHE_SECONDS = 3600
+
+roster_cache = VersionedCache('team_roster', 'ROSTER_CACHE_SECONDS', DEFAULT_ROSTER_CACHE_SECONDS)
+
+
+def team_user_ids(manager_user_id):
+    """
+    User ids of the direct reports of the manager with this user id, as a sorted
+    array('q'); empty for users who manage nobody or have no employee record.
+
+    Cached per manager as the packed ids (8 bytes per report). The signals in
+    signals.py invalidate a roster when an employee joins, leaves or changes
+    manager through save() or delete(); call invalidate_rosters() after
+    QuerySet.update(manager=...), which bypasses them.
+    """
+    def load():
+        return array('q', (
+            EmployeeModel.objects.filter(manager__user_id=manager_user_id)
+            .order_by('user_id').values_list('user_id', flat=True)
+        )).tobytes()
+
+    ids = array('q')
+    ids.frombytes(roster_cache.get(manager_user_id, load))
+    return ids
+
+
+def invalidate_rosters(manager_user_ids):
+    roster_cache.invalidate(manager_user_ids)
+
+
+def filter_to_team(queryset, manager_user_id, field='user'):
+    """`queryset` limited to the manager's direct reports with one `<field> IN (...)` on the cached ids."""
+    return queryset.filter(**{f'{field}__in': team_user_ids(manager_user_id).tolist()})
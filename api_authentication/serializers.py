@@ -3,16 +3,19 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
 import secrets
 from .models import EmployeeModel
-from django.core.mail import send_mail
 from django.conf import settings
 from django.urls import reverse_lazy, reverse
 import logging
-import smtplib
-from .utils import SMTP_ERROR_CODES
+from .directory import AUTOCOMPLETE_MAX_RESULTS
 from django.db import transaction
 from django.core.cache import cache
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .tokens import RevocableRefreshToken
+from api_audit.buffer import record_event
+from api_audit.models import AuditEventModel
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
 
@@ -108,7 +111,7 @@ class EmployeeAccountCreationSerializer(serializers.ModelSerializer):
         ("MANAGER", "MANAGER"),
         ("ADMIN", "ADMIN"),
     )
-    role = serializers.CharField(required=True, choices=ROLE_CHOICES)
+    role = serializers.ChoiceField(required=True, choices=ROLE_CHOICES)
     email = serializers.EmailField(required=True)
     username = serializers.CharField(required=True)
     manager_email_or_username = serializers.CharField(required=False)
@@ -167,6 +170,11 @@ class EmployeeAccountCreationSerializer(serializers.ModelSerializer):
                 manager=self._get_manager_by_email_or_username(validated_data['manager_email_or_username']),
             )
 
+            record_event(
+                AuditEventModel.Action.ACCOUNT_CREATED, self.context['request'].user,
+                AuditEventModel.Subject.USER, user.pk, user, details={'role': validated_data['role']},
+            )
+
             self._send_credentials_email(username=validated_data['username'], temp_password=temp_password, recipient=validated_data['email'])
         
         return user
@@ -184,6 +192,11 @@ class EmployeeAccountCreationSerializer(serializers.ModelSerializer):
         Login here: {reverse_lazy('Login page url')} 
         '''
         # View and url or password reset will be created later.
+        # Imported here: the mail and SMTP modules are only needed when an account is created.
+        import smtplib
+        from django.core.mail import send_mail
+        from .utils import SMTP_ERROR_CODES
+
         try:
             send_mail(
                 subject=subject,
@@ -228,6 +241,8 @@ class EmployeeAccountCreationSerializer(serializers.ModelSerializer):
 # password reset url : absolute url with domain (add expirty time for reset link)
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RevocableRefreshToken
+
     def validate(self, attrs):
         username = attrs.get('username')
         
@@ -258,6 +273,24 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
     
 
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RevocableRefreshToken
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField(required=True, write_only=True)
+
+    def validate_refresh(self, value):
+        try:
+            token = RevocableRefreshToken(value)
+        except TokenError as e:
+            raise serializers.ValidationError(str(e))
+
+        if str(token.get(jwt_settings.USER_ID_CLAIM)) != str(self.context['request'].user.pk):
+            raise serializers.ValidationError("Refresh token belongs to another user.")
+        return token
+
+
 class InitialPasswordResetSerializer(serializers.Serializer):
     username = serializers.CharField(required=True)
     password = serializers.CharField(required=True, write_only=True, style={'input_type': 'password'})
@@ -306,7 +339,7 @@ class EmployeeProfileSerializer(serializers.ModelSerializer):
     role = serializers.CharField(read_only=True)
     user = UserSerailizer()
 
-    gender = serializers.CharField(choices=GENDER_CHOICE, required=True)
+    gender = serializers.ChoiceField(choices=GENDER_CHOICE, required=True)
     phone_number_one = serializers.CharField(required=True)
     department = serializers.CharField(required=True)
     job_title = serializers.CharField(required=True)
@@ -315,20 +348,19 @@ class EmployeeProfileSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = EmployeeModel
-        fields = ['user', 'date_of_birth', 'gender', 'phone_number_one', 'phone_number_two', 'department', 'job_title', 'hire_date', 'leave_balance', 'manager', 'role']
+        fields = ['user', 'date_of_birth', 'gender', 'phone_number_one', 'phone_number_two', 'department', 'job_title', 'hire_date', 'leave_balance', 'manager', 'role', 'timezone']
     
-    def validate(self, attrs):
-        pass
-
     def update(self, instance, validated_data):
         user_data = validated_data.pop('user', None)
 
-        instance.date_of_birth = validated_data['date_of_birth']
-        instance.gender = validated_data['gender']
-        instance.phone_number_one = validated_data['phone_number_one']
-        instance.phone_number_two = validated_data['phone_number_two']
-        instance.department = validated_data['department']
-        instance.job_title = validated_data['job_title']
+        # PATCH sends only the fields being changed.
+        instance.date_of_birth = validated_data.get('date_of_birth', instance.date_of_birth)
+        instance.gender = validated_data.get('gender', instance.gender)
+        instance.phone_number_one = validated_data.get('phone_number_one', instance.phone_number_one)
+        instance.phone_number_two = validated_data.get('phone_number_two', instance.phone_number_two)
+        instance.department = validated_data.get('department', instance.department)
+        instance.job_title = validated_data.get('job_title', instance.job_title)
+        instance.timezone = validated_data.get('timezone', instance.timezone)
 
         instance.save()
 
@@ -339,4 +371,11 @@ class EmployeeProfileSerializer(serializers.ModelSerializer):
             user.last_name = user_data.get('last_name', user.last_name)
             user.save()
         
-        return instance
\ No newline at end of file
+        return instance
+
+
+class EmployeeAutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(required=True, max_length=150)
+    role = serializers.ChoiceField(choices=EmployeeModel.ROLE_CHOICES, required=False)
+    department = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=AUTOCOMPLETE_MAX_RESULTS, default=10)
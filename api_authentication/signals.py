@@ -1,13 +1,67 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from django.contrib.auth.models import User
 from .models import EmployeeModel
-from django.core import cache
+from django.core.cache import cache
+from .directory import directory_index, refresh_employees
+from .profiles import invalidate_profiles
+from .rosters import invalidate_rosters
 
 @receiver(post_save, sender=EmployeeModel)
 @receiver(post_delete, sender=EmployeeModel)
 def clear_employee_cache(sender, instance, **kwargs):
     # Clear department cache
-    cache.delete(f"user_{instance.user.id}_department")
-    # Clear manager validation cache
-    cache.delete_pattern(f"manager_validation_{instance.user.email}*")
-    cache.delete_pattern(f"manager_validation_{instance.user.username}*")
\ No newline at end of file
+    cache.delete(f"user_{instance.user_id}_department")
+    # Clear manager validation cache (keys are lowercased email/username)
+    cache.delete_many([
+        f"manager_validation_{instance.user.email.lower()}",
+        f"manager_validation_{instance.user.username.lower()}",
+    ])
+
+
+@receiver(post_save, sender=EmployeeModel)
+def refresh_directory_employee(sender, instance, **kwargs):
+    refresh_employees(EmployeeModel.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=User)
+def refresh_directory_user(sender, instance, **kwargs):
+    refresh_employees(EmployeeModel.objects.filter(user=instance))
+
+
+@receiver(post_delete, sender=EmployeeModel)
+def remove_directory_employee(sender, instance, **kwargs):
+    directory_index.remove([instance.pk])
+
+
+@receiver(post_save, sender=EmployeeModel)
+@receiver(post_delete, sender=EmployeeModel)
+def invalidate_employee_profile(sender, instance, **kwargs):
+    invalidate_profiles([instance.user_id])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_profile(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which the profile does not show.
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    invalidate_profiles([instance.pk])
+
+
+@receiver(post_save, sender=EmployeeModel)
+def invalidate_team_rosters(sender, instance, created, **kwargs):
+    loaded_manager_id = getattr(instance, '_loaded_manager_id', None)
+    if not created and loaded_manager_id == instance.manager_id:
+        return
+    # The rosters of the previous and the new manager, keyed by their user ids.
+    managers = {loaded_manager_id, instance.manager_id} - {None}
+    instance._loaded_manager_id = instance.manager_id
+    invalidate_rosters(EmployeeModel.objects.filter(pk__in=managers).values_list('user_id', flat=True))
+
+
+@receiver(post_delete, sender=EmployeeModel)
+def invalidate_team_rosters_on_delete(sender, instance, **kwargs):
+    # The deleted employee's own reports lose their manager through a set-based update.
+    invalidate_rosters([instance.user_id])
+    if instance.manager_id is not None:
+        invalidate_rosters(EmployeeModel.objects.filter(pk=instance.manager_id).values_list('user_id', flat=True))
@@ -1,3 +1,260 @@
-from django.test import TestCase
+import threading
+import uuid
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+
+from api_core.routers import replica_reads
+from api_core.startup import warm_up
+from . import directory
+from .directory import EmployeeDirectoryIndex, directory_index
+from .models import EmployeeModel, RevokedTokenModel
+from .revocation import BloomFilter, revoked_tokens
+from .rosters import team_user_ids
+from .tokens import RevocableAccessToken
+
+
+class BloomFilterTests(SimpleTestCase):
+    def test_no_false_negatives_and_error_rate(self):
+        bloom = BloomFilter(10000, 0.01)
+        added = [uuid.uuid4().hex for _ in range(10000)]
+        for jti in added:
+            bloom.add(jti)
+
+        self.assertTrue(all(jti in bloom for jti in added))
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(20000))
+        self.assertLess(false_positives / 20000, 0.02)
+
+
+class TokenRevocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('employee', password='secret-password')
+        EmployeeModel.objects.create(user=cls.user, password_reset_required=False)
+
+    def setUp(self):
+        self.client = APIClient()
+        response = self.client.post('/api/auth//token/', {'username': 'employee', 'password': 'secret-password'})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.access, self.refresh = response.data['access'], response.data['refresh']
+
+    def test_logout_revokes_access_and_refresh_tokens(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        self.assertEqual(self.client.get('/api/auth//employee/me/').status_code, 200)
+
+        response = self.client.post('/api/auth//logout/', {'refresh': self.refresh})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(RevokedTokenModel.objects.filter(user=self.user).count(), 2)
+
+        self.assertEqual(self.client.get('/api/auth//employee/me/').status_code, 401)
+        self.client.credentials()
+        self.assertEqual(self.client.post('/api/auth//token/refresh/', {'refresh': self.refresh}).status_code, 401)
+
+    def test_logout_rejects_another_users_refresh_token(self):
+        other = User.objects.create_user('other', password='secret-password')
+        other_refresh = self.client.post('/api/auth//token/', {'username': 'other', 'password': 'secret-password'}).data['refresh']
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        self.assertEqual(self.client.post('/api/auth//logout/', {'refresh': other_refresh}).status_code, 400)
+        self.assertFalse(RevokedTokenModel.objects.filter(user=other).exists())
+
+    @override_settings(REPLICA_DATABASE_ALIAS='replica')
+    def test_revocations_are_read_from_the_primary_under_replica_reads(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        self.assertEqual(self.client.post('/api/auth//logout/', {'refresh': self.refresh}).status_code, 200)
+
+        # Authentication on read_from_replica views runs inside replica_reads().
+        # 'replica' is not in this test's databases, so a query routed there fails.
+        with replica_reads():
+            revoked_tokens.build()
+            with self.assertRaises(TokenError):
+                RevocableAccessToken(self.access)
+
+    def test_unrevoked_token_costs_no_query(self):
+        revoked_tokens.build()
+        with self.assertNumQueries(0):
+            RevocableAccessToken(self.access)
+
+
+class ProfileCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user('manager')
+        cls.user = User.objects.create_user('employee', first_name='Ada')
+        cls.employee = EmployeeModel.objects.create(
+            user=cls.user, manager=EmployeeModel.objects.create(user=cls.manager), department='Engineering',
+        )
+
+    def setUp(self):
+        cache.clear()
+        revoked_tokens.build()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RevocableAccessToken.for_user(self.user)}')
+
+    def get_profile(self):
+        response = self.client.get('/api/auth//employee/me/')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_repeated_reads_run_no_query(self):
+        with self.assertNumQueries(1):
+            first = self.get_profile()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_profile(), first)
+        self.assertEqual(first['user']['first_name'], 'Ada')
+        self.assertEqual(first['department'], 'Engineering')
+
+    def test_user_and_employee_changes_invalidate(self):
+        self.get_profile()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = 'Grace'
+            self.user.save()
+        self.assertEqual(self.get_profile()['user']['first_name'], 'Grace')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.department = 'Sales'
+            self.employee.save()
+        self.assertEqual(self.get_profile()['department'], 'Sales')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.client.get('/api/auth//employee/me/').status_code, 404)
+
+
+class TeamRosterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = EmployeeModel.objects.create(user=User.objects.create_user('manager'))
+        cls.other_manager = EmployeeModel.objects.create(user=User.objects.create_user('other-manager'))
+        cls.reports = [
+            EmployeeModel.objects.create(user=User.objects.create_user(f'employee-{i}'), manager=cls.manager)
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_roster_is_cached_sorted(self):
+        with self.assertNumQueries(1):
+            ids = team_user_ids(self.manager.user_id)
+        with self.assertNumQueries(0):
+            self.assertEqual(team_user_ids(self.manager.user_id), ids)
+        self.assertEqual(ids.tolist(), sorted(report.user_id for report in self.reports))
+        self.assertEqual(len(team_user_ids(self.reports[0].user_id)), 0)
+
+    def test_manager_change_invalidates_both_rosters(self):
+        team_user_ids(self.manager.user_id)
+        team_user_ids(self.other_manager.user_id)
+        moved = EmployeeModel.objects.get(pk=self.reports[0].pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            moved.manager = self.other_manager
+            moved.save()
+
+        self.assertNotIn(moved.user_id, team_user_ids(self.manager.user_id))
+        self.assertEqual(team_user_ids(self.other_manager.user_id).tolist(), [moved.user_id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            moved.delete()
+        self.assertEqual(len(team_user_ids(self.other_manager.user_id)), 0)
+
+
+class EmployeeDirectoryTests(TestCase):
+    url = '/api/auth//employees/autocomplete/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', is_staff=True)
+        people = [
+            ('ada', 'Ada', 'Lovelace', 'EMPLOYEE', 'Engineering'),
+            ('adams', 'John', 'Adams', 'MANAGER', 'Sales'),
+            ('lovelace2', 'Ada', 'Byron', 'MANAGER', 'engineering'),
+            ('grace', 'Grace', 'Hopper', 'EMPLOYEE', 'Engineering'),
+        ]
+        cls.employees = {}
+        for username, first_name, last_name, role, department in people:
+            user = User.objects.create_user(username, email=f'{username}@example.com', first_name=first_name, last_name=last_name)
+            cls.employees[username] = EmployeeModel.objects.create(user=user, role=role, department=department)
+
+    def setUp(self):
+        # The index is process-wide; start every test from this test's data.
+        directory_index.build()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['username'] for row in response.data['results']]
+
+    def test_matches_in_key_order_once_per_employee(self):
+        # Keys 'ada' (username, first name) < 'ada byron' < 'ada lovelace' < 'adams'.
+        self.assertEqual(self.search(q='ada'), ['ada', 'lovelace2', 'adams'])
+        self.assertEqual(self.search(q='ADA L'), ['ada'])
+        self.assertEqual(self.search(q='lovelace'), ['ada', 'lovelace2'])
+        self.assertEqual(self.search(q='grace@ex'), ['grace'])
+        self.assertEqual(self.search(q='ada', limit=2), ['ada', 'lovelace2'])
+
+    def test_role_and_department_filters(self):
+        self.assertEqual(self.search(q='ada', role='MANAGER'), ['lovelace2', 'adams'])
+        self.assertEqual(self.search(q='ada', department='ENGINEERING'), ['ada', 'lovelace2'])
+        self.assertEqual(self.search(q='ada', role='MANAGER', department='sales'), ['adams'])
+
+    def test_signals_keep_the_index_current(self):
+        user = self.employees['grace'].user
+        user.first_name = 'Amazing'
+        user.save()
+        self.assertEqual(self.search(q='amaz'), ['grace'])
+        self.assertEqual(self.search(q='grace h'), [])
+
+        employee = EmployeeModel.objects.create(user=User.objects.create_user('adele'), role='ADMIN')
+        self.assertEqual(self.search(q='ade'), ['adele'])
+        employee.delete()
+        self.employees['adams'].delete()
+        self.assertEqual(self.search(q='ad'), ['ada', 'lovelace2'])
+
+    def test_built_when_the_worker_boots(self):
+        directory_index._state = None
+        warm_up()
+        self.assertTrue(directory_index.is_built)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.search(q='grace'), ['grace'])
+
+
+class EmployeeDirectoryRebuildTests(TransactionTestCase):
+    # The rebuild runs on its own thread and connection, which must see committed rows.
+
+    def test_stale_index_is_rebuilt_in_the_background(self):
+        ada = EmployeeModel.objects.create(user=User.objects.create_user('ada', first_name='Ada'))
+        index = EmployeeDirectoryIndex(max_age=60)
+        index.build()
+        # Written by another process: no signal reaches this index.
+        EmployeeModel.objects.bulk_create([EmployeeModel(user=User.objects.create_user('adele'))])
+        index._built_at -= 61
+
+        load_entries = directory._load_entries
+        release = threading.Event()
+
+        def slow_load(queryset):
+            release.wait(5)
+            return load_entries(queryset)
+
+        with mock.patch.object(directory, '_load_entries', slow_load):
+            # Answered from the old index while the rebuild waits.
+            with self.assertNumQueries(0):
+                self.assertEqual([entry.username for entry in index.search('ad')], ['ada'])
+            rebuild = next(thread for thread in threading.enumerate() if thread.name == 'directory-index')
+
+            # A change applied mid-rebuild survives the swap.
+            User.objects.filter(pk=ada.user_id).update(first_name='Adaline')
+            index.upsert(load_entries(EmployeeModel.objects.filter(pk=ada.pk)))
+            release.set()
+            rebuild.join(5)
+
+        self.assertFalse(index._rebuilding)
+        self.assertEqual([entry.username for entry in index.search('ad')], ['ada', 'adele'])
+        self.assertEqual([entry.full_name for entry in index.search('adaline')], ['Adaline'])
@@ -0,0 +1,23 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .revocation import revoked_tokens
+
+
+class RevocableTokenMixin:
+    """Rejects tokens revoked through revocation.revoke_token()."""
+
+    def verify(self):
+        super().verify()
+        if revoked_tokens.is_revoked(self[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token has been revoked"))
+
+
+class RevocableAccessToken(RevocableTokenMixin, AccessToken):
+    pass
+
+
+class RevocableRefreshToken(RevocableTokenMixin, RefreshToken):
+    access_token_class = RevocableAccessToken
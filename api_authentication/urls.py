@@ -5,7 +5,9 @@ from . import views as my_views
 urlpatterns = [
     path('/token/', my_views.LoginView.as_view(), name='token-obtain-pair'),
     path('/token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
+    path('/logout/', my_views.LogoutView.as_view(), name='logout'),
     path('/create/account/', my_views.EmployeeCreationView.as_view(), name='account-create'),
     path('/reset-initial-password/',my_views.InitialPasswordResetView.as_view(), name='password-reset'),
-    path('/employee/me/', my_views.EmployeeProfileRetrieveUpdateView.as_view(), name='employee-self-profile')
+    path('/employee/me/', my_views.EmployeeProfileRetrieveUpdateView.as_view(), name='employee-self-profile'),
+    path('/employees/autocomplete/', my_views.EmployeeAutocompleteView.as_view(), name='employee-autocomplete'),
 ]
\ No newline at end of file
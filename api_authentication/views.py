@@ -2,20 +2,25 @@ from rest_framework.response import Response
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 
 
 from . import serializers as my_serializers
 from .permissions import IsManager
 from . import models as my_models
+from .directory import directory_index
+from .profiles import get_profile
+from .revocation import revoke_token
+from api_core.throttling import UserTokenBucketThrottle, IPTokenBucketThrottle
 User = get_user_model()
 
 # The following views with their respective serializers can be added to expand the project:
-#   LogoutView
 #   PasswordResetView
 #   EmployeeList/Detail 
 #   Employee Activation/Deactivation
@@ -28,6 +33,9 @@ class EmployeeCreationView(generics.CreateAPIView):
 
 class LoginView(TokenObtainPairView):
     serializer_class = my_serializers.CustomTokenObtainPairSerializer
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scope = 'login'
+    request_priority = 'critical'
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -48,6 +56,25 @@ class LoginView(TokenObtainPairView):
         return super().post(request, *args, **kwargs)
     
 
+class LogoutView(APIView):
+    """
+    Revokes the refresh token in the body and the access token the request was
+    made with, so neither can be used again before it expires.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    request_priority = 'critical'
+
+    def post(self, request):
+        serializer = my_serializers.LogoutSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+
+        revoke_token(serializer.validated_data['refresh'])
+        revoke_token(request.auth)
+
+        return Response({"detail": "Logged out."}, status=status.HTTP_200_OK)
+
+
 class InitialPasswordResetView(APIView):
     authentication_classes = [JWTAuthentication]
     
@@ -75,8 +102,54 @@ class InitialPasswordResetView(APIView):
     
 
 class EmployeeProfileRetrieveUpdateView(generics.RetrieveUpdateAPIView):
+    """
+    GET is served from the per-user profile cache (see profiles.py). The user is
+    taken from the token rather than loaded, so a cached read runs no query;
+    deactivating a user invalidates the cache, and the next read returns 404.
+    """
+    authentication_classes = [JWTStatelessUserAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = my_serializers.EmployeeProfileSerializer
-    
+
+    def retrieve(self, request, *args, **kwargs):
+        profile = get_profile(request.user.id)
+        if profile is None:
+            raise Http404
+        return Response(profile)
+
     def get_object(self):
-        return my_models.EmployeeModel.objects.get(user=self.request.user)
\ No newline at end of file
+        return get_object_or_404(
+            my_models.EmployeeModel.objects.select_related('user', 'manager'),
+            user_id=self.request.user.id, user__is_active=True,
+        )
+
+
+class EmployeeAutocompleteView(APIView):
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser | IsManager]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request):
+        serializer = my_serializers.EmployeeAutocompleteQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        entries = directory_index.search(
+            serializer.validated_data['q'],
+            role=serializer.validated_data.get('role'),
+            department=serializer.validated_data.get('department'),
+            limit=serializer.validated_data['limit'],
+        )
+
+        return Response(
+            {"results": [
+                {
+                    "employee_id": entry.employee_id,
+                    "username": entry.username,
+                    "email": entry.email,
+                    "full_name": entry.full_name,
+                    "role": entry.role,
+                    "department": entry.department,
+                }
+                for entry in entries
+            ]},
+            status=status.HTTP_200_OK
+        )
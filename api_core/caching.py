@@ -0,0 +1,77 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class VersionedCache:
+    """
+    Per-object cache entries stored under the object's current version stamp.
+
+    invalidate() moves the stamps on once the current transaction commits, so a
+    read that raced with the change (read the database before the commit) can
+    only have cached its stale copy under the old stamp, where nobody looks.
+    Stamps are times, not counters: a stamp evicted from the cache is replaced
+    by a newer one rather than reset to a value old entries were stored under.
+    """
+
+    def __init__(self, prefix, timeout_setting, default_timeout):
+        self.prefix = prefix
+        self.timeout_setting = timeout_setting
+        self.default_timeout = default_timeout
+
+    def _version_key(self, object_id):
+        return f"{self.prefix}_version_{object_id}"
+
+    def version(self, object_id):
+        version = cache.get(self._version_key(object_id))
+        if version is None:
+            cache.add(self._version_key(object_id), time.time_ns(), None)
+            version = cache.get(self._version_key(object_id))
+        return version
+
+    def get(self, object_id, load):
+        """The cached value for `object_id`, or load() cached; None is not cached."""
+        key = f"{self.prefix}_{object_id}_{self.version(object_id)}"
+        value = cache.get(key)
+        if value is None:
+            value = load()
+            if value is not None:
+                cache.set(key, value, getattr(settings, self.timeout_setting, self.default_timeout))
+        return value
+
+    def get_many(self, object_ids, load_many):
+        """
+        {object_id: value} for `object_ids`, reading the stamps and entries with one
+        get_many() each; load_many(missing_ids) returns {object_id: value} for the
+        misses, which are cached (None values excepted).
+        """
+        object_ids = list(object_ids)
+        versions = cache.get_many([self._version_key(object_id) for object_id in object_ids])
+        keys = {
+            object_id: f"{self.prefix}_{object_id}_{versions.get(self._version_key(object_id)) or self.version(object_id)}"
+            for object_id in object_ids
+        }
+        cached = cache.get_many(list(keys.values()))
+        values = {object_id: cached[key] for object_id, key in keys.items() if key in cached}
+
+        missing = [object_id for object_id in object_ids if object_id not in values]
+        if missing:
+            loaded = load_many(missing)
+            cache.set_many(
+                {keys[object_id]: value for object_id, value in loaded.items() if value is not None},
+                getattr(settings, self.timeout_setting, self.default_timeout),
+            )
+            values.update(loaded)
+        return values
+
+    def invalidate(self, object_ids):
+        object_ids = set(object_ids)
+
+        def bump():
+            stamp = time.time_ns()
+            cache.set_many({self._version_key(object_id): stamp for object_id in object_ids}, None)
+
+        if object_ids:
+            transaction.on_commit(bump)
@@ -0,0 +1,26 @@
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+
+class TieBreakOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that ends every ordering with id, in the direction of its last
+    field, so rows with equal values (open shifts' empty clock_out_time, equal
+    working_hours) come back in the same order on every request and page.
+    """
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            ordering = [*ordering, '-id' if ordering[-1].startswith('-') else 'id']
+        return ordering
+
+
+class StrictOrderingFilter(filters.OrderingFilter):
+    """OrderingFilter that answers orderings outside `ordering_fields` with a 400 instead of ignoring them."""
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        valid = super().remove_invalid_fields(queryset, fields, view, request)
+        invalid = [field for field in fields if field not in valid]
+        if invalid:
+            allowed = ', '.join(item[0] for item in self.get_valid_fields(queryset, view, {'request': request}))
+            raise ValidationError({self.ordering_param: f"Cannot order by {', '.join(invalid)}. Choose from: {allowed}."})
+        return valid
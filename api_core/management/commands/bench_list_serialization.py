@@ -0,0 +1,94 @@
+import datetime
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api_core.projection import FieldProjectionMixin
+from api_core.renderers import FastJSONRenderer
+from api_leave.models import LeaveRequestModel
+from api_leave.serializers import EmployeeLeaveRequestListSerializer, EMPLOYEE_LEAVE_REQUEST_LIST_PROJECTION
+from api_timesheet.models import TimesheetModel
+from api_timesheet.serializers import EmployeeTimesheetSerializer, EMPLOYEE_TIMESHEET_PROJECTION
+
+
+class Command(BaseCommand):
+    help = (
+        "Microbenchmark of rows serialized per second for the timesheet and leave "
+        "list endpoints: ModelSerializer vs. the lean projection path, and "
+        "JSONRenderer vs. FastJSONRenderer. Runs in memory, no database needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        timesheets, timesheet_values = self.timesheet_rows(rows)
+        leaves, leave_values = self.leave_rows(rows)
+
+        cases = [
+            ('timesheets', EmployeeTimesheetSerializer, timesheets, EMPLOYEE_TIMESHEET_PROJECTION, timesheet_values),
+            ('leave requests', EmployeeLeaveRequestListSerializer, leaves, EMPLOYEE_LEAVE_REQUEST_LIST_PROJECTION, leave_values),
+        ]
+        for label, serializer_class, instances, projection, values in cases:
+            lean = FieldProjectionMixin()
+            lean.projection = projection
+            names = list(projection)
+
+            serializer_time, serialized = self.best_of(repeat, lambda: serializer_class(instances, many=True).data)
+            lean_time, built = self.best_of(repeat, lambda: lean.build_rows(names, values))
+            if [dict(row) for row in serialized] != built:
+                self.stderr.write(self.style.ERROR(f"{label}: lean rows differ from serializer output"))
+
+            render_time, _ = self.best_of(repeat, lambda: JSONRenderer().render(built))
+            fast_render_time, _ = self.best_of(repeat, lambda: FastJSONRenderer().render(built))
+
+            self.stdout.write(f"{label} ({rows} rows)")
+            self.report('ModelSerializer', rows, serializer_time)
+            self.report('projection rows', rows, lean_time, serializer_time)
+            self.report('JSONRenderer', rows, render_time)
+            self.report('FastJSONRenderer', rows, fast_render_time, render_time)
+
+    def best_of(self, repeat, func):
+        best, result = None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def report(self, label, rows, elapsed, baseline=None):
+        speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ""
+        self.stdout.write(f"  {label:<18} {rows / elapsed:>12,.0f} rows/s{speedup}")
+
+    def timesheet_rows(self, rows):
+        now = timezone.now()
+        instances, values = [], []
+        for pk in range(1, rows + 1):
+            clock_in = now - datetime.timedelta(days=pk, hours=8, minutes=pk % 60)
+            clock_out = clock_in + datetime.timedelta(hours=8, seconds=pk % 3600)
+            instance = TimesheetModel(id=pk, user_id=1, clock_in_time=clock_in, clock_out_time=clock_out)
+            instance.working_hours = clock_out - clock_in
+            instances.append(instance)
+            values.append((pk, clock_in, clock_out, instance.working_hours))
+        return instances, values
+
+    def leave_rows(self, rows):
+        approver = User(id=1, first_name='Ada', last_name='Lovelace')
+        today = timezone.now().date()
+        instances, values = [], []
+        for pk in range(1, rows + 1):
+            start = today + datetime.timedelta(days=pk)
+            end = start + datetime.timedelta(days=pk % 5)
+            reason = f"Family event number {pk}, travelling out of town."
+            instances.append(LeaveRequestModel(
+                id=pk, user_id=2, start_date=start, end_date=end, reason=reason,
+                status=LeaveRequestModel.Status.APPROVED, approved_by=approver,
+            ))
+            values.append((pk, start, end, reason, LeaveRequestModel.Status.APPROVED, approver.id, approver.first_name, approver.last_name))
+        return instances, values
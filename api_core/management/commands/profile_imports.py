@@ -0,0 +1,43 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from api_core.startup import STARTUP_SCRIPTS, measure_startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot manage.py, wsgi.py or asgi.py in a fresh interpreter under "
+        "`python -X importtime` and report the costliest imports."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=sorted(STARTUP_SCRIPTS), default='wsgi')
+        parser.add_argument('--limit', type=int, default=25)
+        parser.add_argument('--first-request', action='store_true', help="wsgi only: also time one unauthenticated request.")
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        result = measure_startup(options['target'], first_request=options['first_request'], import_time=True)
+        imports = result['imports']
+
+        self.stdout.write(f"{options['target']}: booted in {result['boot'] * 1000:.0f}ms, {len(result['modules'])} modules loaded")
+        if result['status'] is not None:
+            self.stdout.write(f"first request: {result['first_request'] * 1000:.0f}ms (HTTP {result['status']})")
+        self.stdout.write("(times below are measured with import tracing on, which inflates them)")
+
+        self.stdout.write(f"\nTop {limit} imports by cumulative time:")
+        for module, self_us, cumulative_us, depth in sorted(imports, key=lambda row: -row[2])[:limit]:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f}ms  {'  ' * depth}{module}")
+
+        self.stdout.write(f"\nTop {limit} modules by own time:")
+        for module, self_us, cumulative_us, depth in sorted(imports, key=lambda row: -row[1])[:limit]:
+            self.stdout.write(f"  {self_us / 1000:8.1f}ms  {module}")
+
+        packages = Counter()
+        for module, self_us, cumulative_us, depth in imports:
+            packages[module.split('.')[0]] += self_us
+        self.stdout.write(f"\nTop {limit} packages by own time:")
+        for package, self_us in packages.most_common(limit):
+            self.stdout.write(f"  {self_us / 1000:8.1f}ms  {package}")
@@ -0,0 +1,39 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Replication stand-in for local development: copies the default SQLite "
+        "database into the replica SQLite file, once or every --interval seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=None, help="Keep copying, waiting this many seconds between copies.")
+
+    def handle(self, *args, **options):
+        alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', None)
+        if alias not in settings.DATABASES:
+            raise CommandError("Set REPLICA_DATABASE_ALIAS to a configured database alias first.")
+        for name in ('default', alias):
+            if connections[name].vendor != 'sqlite':
+                raise CommandError("sync_replica only copies between SQLite databases; use real replication elsewhere.")
+
+        while True:
+            started = time.perf_counter()
+            self.copy(alias)
+            self.stdout.write(f"Replicated default -> {alias} in {time.perf_counter() - started:.3f}s")
+            if options['interval'] is None:
+                break
+            time.sleep(options['interval'])
+
+    def copy(self, alias):
+        source = connections['default']
+        source.ensure_connection()
+        connections[alias].close()
+        with sqlite3.connect(settings.DATABASES[alias]['NAME']) as target:
+            source.connection.backup(target)
@@ -0,0 +1,277 @@
+import cProfile
+import hmac
+import math
+import random
+import threading
+import time
+
+import jwt
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.http import JsonResponse
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .profiling import DEFAULT_PROFILER_MAX_QUERIES, ProfileStore, QueryLog
+from .routers import _replica_reads, replica_alias
+
+
+# After a successful write, a user's reads stay on the primary for this long.
+DEFAULT_REPLICA_PIN_SECONDS = 5
+
+# Per priority: shed new requests once this many are in flight in the worker (or
+# across workers, see LOAD_SHEDDING_CACHE), or
+# once recent requests have taken this many seconds on average. 'critical' views
+# are never shed.
+DEFAULT_LOAD_SHEDDING_LIMITS = {
+    'low': {'MAX_IN_FLIGHT': 16, 'MAX_LATENCY': 1.0},
+    'default': {'MAX_IN_FLIGHT': 64, 'MAX_LATENCY': 5.0},
+}
+DEFAULT_LOAD_SHEDDING_RETRY_AFTER = 5
+# Cache alias, shared by every worker, that counts requests in flight across them.
+# None counts per process, which only limits threaded or ASGI workers.
+DEFAULT_LOAD_SHEDDING_CACHE = None
+# The shared count expires this long after it was created, so requests leaked by
+# a killed worker stop counting.
+SHARED_IN_FLIGHT_SECONDS = 300
+# Weight of the newest request in the latency average.
+LATENCY_EWMA_ALPHA = 0.2
+# Without new samples the average halves every this many seconds, so an idle
+# worker stops shedding even if nothing low-priority got through.
+LATENCY_HALF_LIFE_SECONDS = 5.0
+
+
+def _pin_key(user_id):
+    return f"db_pinned_user_{user_id}"
+
+
+def _token_user_id(request):
+    """
+    Reads the user id claim from the bearer token without verifying it. Only
+    used to pick a database; authentication still verifies the token.
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '').split()
+    if len(header) != 2 or header[0] not in jwt_settings.AUTH_HEADER_TYPES:
+        return None
+    try:
+        claims = jwt.decode(header[1], options={'verify_signature': False})
+    except jwt.InvalidTokenError:
+        return None
+    return claims.get(jwt_settings.USER_ID_CLAIM)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Routes reads of safe requests to views with `read_from_replica = True` to the
+    replica database, unless the caller wrote something in the last
+    REPLICA_PIN_SECONDS (read-your-writes). Writes always go to the primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', DEFAULT_REPLICA_PIN_SECONDS)
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads.set(False)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated and replica_alias():
+                cache.set(_pin_key(user.pk), True, self.pin_seconds)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if (
+            request.method in SAFE_METHODS
+            and getattr(view_class, 'read_from_replica', False)
+            and replica_alias()
+            and not self.is_pinned(request)
+        ):
+            _replica_reads.set(True)
+        return None
+
+    def is_pinned(self, request):
+        user_id = _token_user_id(request)
+        return user_id is not None and cache.get(_pin_key(user_id), False)
+
+
+class SharedInFlight:
+    """Requests in flight across every worker process using the same cache."""
+    key = 'load_shedding_in_flight'
+
+    def __init__(self, cache_alias):
+        self.cache = caches[cache_alias]
+
+    def incr(self):
+        self.cache.add(self.key, 0, SHARED_IN_FLIGHT_SECONDS)
+        try:
+            self.cache.incr(self.key)
+        except ValueError:
+            # Expired between add() and incr(): this request goes uncounted.
+            pass
+
+    def decr(self):
+        try:
+            self.cache.decr(self.key)
+        except ValueError:
+            # Expired while the request ran.
+            pass
+
+    def value(self):
+        return max(self.cache.get(self.key, 0), 0)
+
+
+class LoadShedding:
+    """
+    In-flight count and latency average for one worker process. With `shared`,
+    a SharedInFlight, the in-flight count is the one across workers instead.
+    """
+
+    def __init__(self, shared=None):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.shared = shared
+        self._latency = 0.0
+        self._sampled_at = time.monotonic()
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+        if self.shared is not None:
+            self.shared.incr()
+
+    def in_flight_count(self):
+        return self.in_flight if self.shared is None else self.shared.value()
+
+    def finished(self, elapsed):
+        if self.shared is not None:
+            self.shared.decr()
+        with self._lock:
+            self.in_flight -= 1
+            if elapsed is None:
+                return
+            self._latency = self.latency() * (1 - LATENCY_EWMA_ALPHA) + elapsed * LATENCY_EWMA_ALPHA
+            self._sampled_at = time.monotonic()
+
+    def latency(self):
+        idle = time.monotonic() - self._sampled_at
+        return self._latency * math.pow(0.5, idle / LATENCY_HALF_LIFE_SECONDS)
+
+
+class LoadSheddingMiddleware:
+    """
+    Rejects low-priority work early with 503 + Retry-After while the worker is
+    overloaded, so clocking in and logging in keep working when reports or
+    search pile up.
+
+    Views declare `request_priority = 'critical' | 'default' | 'low'` (default
+    'default'); limits per priority come from LOAD_SHEDDING_LIMITS. Load is
+    requests in flight and an exponentially weighted average of response times.
+    The average is per worker process; so is the in-flight count unless
+    LOAD_SHEDDING_CACHE names a cache shared by the workers, which sync workers
+    (one request each) need for the in-flight limit to mean anything. Requests
+    rejected here never reach authentication or the database.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.limits = getattr(settings, 'LOAD_SHEDDING_LIMITS', DEFAULT_LOAD_SHEDDING_LIMITS)
+        self.retry_after = getattr(settings, 'LOAD_SHEDDING_RETRY_AFTER', DEFAULT_LOAD_SHEDDING_RETRY_AFTER)
+        cache_alias = getattr(settings, 'LOAD_SHEDDING_CACHE', DEFAULT_LOAD_SHEDDING_CACHE)
+        self.load = LoadShedding(SharedInFlight(cache_alias) if cache_alias else None)
+
+    def __call__(self, request):
+        started = time.monotonic()
+        self.load.started()
+        shed = False
+        try:
+            response = self.get_response(request)
+            shed = getattr(response, 'load_shed', False)
+            return response
+        finally:
+            # Shed responses are instant and would drag the average down.
+            self.load.finished(None if shed else time.monotonic() - started)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        priority = getattr(view_class, 'request_priority', 'default')
+        limits = self.limits.get(priority)
+        if not limits:
+            return None
+
+        # This request is already counted as in flight.
+        if self.load.in_flight_count() > limits['MAX_IN_FLIGHT'] or self.load.latency() > limits['MAX_LATENCY']:
+            response = JsonResponse(
+                {"detail": "Server is busy, please retry later."},
+                status=503,
+            )
+            response['Retry-After'] = str(self.retry_after)
+            response.load_shed = True
+            return response
+        return None
+
+
+class ProfilingMiddleware:
+    """
+    Runs selected requests under cProfile with every SQL query timed, and saves
+    the pstats and query log to the ProfileStore ring buffer.
+
+    A request is profiled when it carries `X-Profile: <PROFILER_TOKEN>`, or at
+    random with probability PROFILER_SAMPLE_RATE. The response then carries the
+    capture's id in `X-Profile-Id`. For streaming responses only the work done
+    before the first chunk is profiled.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.token = getattr(settings, 'PROFILER_TOKEN', None)
+        self.sample_rate = getattr(settings, 'PROFILER_SAMPLE_RATE', 0)
+        self.max_queries = getattr(settings, 'PROFILER_MAX_QUERIES', DEFAULT_PROFILER_MAX_QUERIES)
+        self.store = ProfileStore()
+
+    def should_profile(self, request):
+        header = request.META.get('HTTP_X_PROFILE')
+        if header and self.token and hmac.compare_digest(header, self.token):
+            return True
+        return bool(self.sample_rate) and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        queries = QueryLog(self.max_queries)
+        started = time.perf_counter()
+        with queries.capture():
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is already active on this thread.
+                return self.get_response(request)
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        elapsed = time.perf_counter() - started
+
+        user = getattr(request, 'user', None)
+        profile_id = self.store.new_id()
+        self.store.save(profiler, {
+            'id': profile_id,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'user_id': user.pk if user is not None and user.is_authenticated else None,
+            'captured_at': time.time(),
+            'duration_ms': round(elapsed * 1000, 3),
+            'query_count': queries.count,
+            'query_ms': round(queries.total * 1000, 3),
+            'queries': queries.queries,
+        })
+        response['X-Profile-Id'] = profile_id
+        return response
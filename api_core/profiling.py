@@ -0,0 +1,133 @@
+import io
+import json
+import pstats
+import re
+import threading
+import time
+import uuid
+from contextlib import ExitStack
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+
+DEFAULT_PROFILER_MAX_PROFILES = 50
+# Queries beyond this many are counted and timed but not logged individually.
+DEFAULT_PROFILER_MAX_QUERIES = 1000
+PROFILE_ID_PATTERN = re.compile(r'^\d{8}T\d{6}\.\d{6}-[0-9a-f]{8}$')
+
+_active_query_log = ContextVar('active_query_log', default=None)
+
+
+def active_query_log():
+    """The QueryLog capturing the current thread's queries, if any."""
+    return _active_query_log.get()
+
+
+class QueryLog:
+    """
+    Database execute wrapper that times every query run while it is installed.
+
+    Execute wrappers are per connection, and so per thread: parallel_map() installs
+    the active log on its pool threads too, which is why the counts are locked.
+    """
+
+    def __init__(self, max_queries):
+        self.max_queries = max_queries
+        self.queries = []
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.count += 1
+                self.total += elapsed
+                if len(self.queries) < self.max_queries:
+                    self.queries.append({
+                        'alias': context['connection'].alias,
+                        'sql': sql,
+                        'many': many,
+                        'ms': round(elapsed * 1000, 3),
+                    })
+
+    def capture(self):
+        """Installs the wrapper on every configured database of the current thread."""
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(self))
+        token = _active_query_log.set(self)
+        stack.callback(_active_query_log.reset, token)
+        return stack
+
+
+class ProfileStore:
+    """
+    Bounded on-disk ring buffer of captured profiles. Each capture is a pstats
+    file (`<id>.prof`) plus request metadata and the query log (`<id>.json`).
+    Ids start with the capture time, so name order is age order and the oldest
+    captures are dropped once there are more than `max_profiles`.
+    """
+
+    def __init__(self, directory=None, max_profiles=None):
+        self.directory = Path(directory or getattr(settings, 'PROFILER_DIR', settings.BASE_DIR / 'profiles'))
+        self.max_profiles = max_profiles or getattr(settings, 'PROFILER_MAX_PROFILES', DEFAULT_PROFILER_MAX_PROFILES)
+
+    def new_id(self):
+        now = time.time()
+        return f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))}.{int(now % 1 * 1e6):06d}-{uuid.uuid4().hex[:8]}"
+
+    def path(self, profile_id, suffix):
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            raise FileNotFoundError(profile_id)
+        return self.directory / f"{profile_id}{suffix}"
+
+    def save(self, profiler, metadata):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = metadata['id']
+        profiler.dump_stats(self.path(profile_id, '.prof'))
+        # The metadata file is written last: a capture is listed only once complete.
+        self.path(profile_id, '.json').write_text(json.dumps(metadata))
+        self.evict()
+        return profile_id
+
+    def ids(self):
+        if not self.directory.is_dir():
+            return []
+        return sorted(path.stem for path in self.directory.glob('*.json') if PROFILE_ID_PATTERN.match(path.stem))
+
+    def evict(self):
+        ids = self.ids()
+        for profile_id in ids[:max(len(ids) - self.max_profiles, 0)]:
+            for suffix in ('.json', '.prof'):
+                # Another worker may be evicting the same capture.
+                self.path(profile_id, suffix).unlink(missing_ok=True)
+
+    def metadata(self, profile_id):
+        return json.loads(self.path(profile_id, '.json').read_text())
+
+    def list(self):
+        """Metadata of every capture, newest first, without the query logs."""
+        captures = []
+        for profile_id in reversed(self.ids()):
+            try:
+                metadata = self.metadata(profile_id)
+            except FileNotFoundError:
+                continue
+            metadata.pop('queries', None)
+            captures.append(metadata)
+        return captures
+
+    def summary(self, profile_id, limit=30):
+        """The top functions by cumulative time, as pstats prints them."""
+        output = io.StringIO()
+        stats = pstats.Stats(str(self.path(profile_id, '.prof')), stream=output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return output.getvalue()
@@ -0,0 +1,139 @@
+import json
+import os
+import re
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+
+# Set to regenerate the checked-in expected plans from the current ones.
+UPDATE_ENV_VAR = 'UPDATE_QUERY_PLANS'
+
+FULL_SCAN = re.compile(r'^SCAN (\S+)$')
+TEMP_BTREE = 'USE TEMP B-TREE'
+
+
+def capture_queries(func):
+    """Runs `func` and returns the (sql, params) of every query it executed."""
+    queries = []
+
+    def wrapper(execute, sql, params, many, context):
+        if not many:
+            queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        func()
+    return queries
+
+
+def explain(sql, params):
+    """
+    SQLite's EXPLAIN QUERY PLAN as indented detail lines. Older SQLite versions
+    say "SCAN TABLE x"/"SEARCH TABLE x"; those are normalized to the current form.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        rows = cursor.fetchall()
+
+    depth = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depth[node_id] = depth.get(parent_id, -1) + 1
+        detail = re.sub(r'^(SCAN|SEARCH) TABLE ', r'\1 ', detail)
+        lines.append('  ' * depth[node_id] + detail)
+    return lines
+
+
+def plan_problems(plan):
+    problems = []
+    for line in plan:
+        detail = line.strip()
+        if FULL_SCAN.match(detail):
+            problems.append(f"full table scan: {detail}")
+        if TEMP_BTREE in detail:
+            problems.append(f"temp b-tree sort: {detail}")
+    return problems
+
+
+def run_list_view(view_class, user, query_params=None):
+    """
+    Runs a ListAPIView's list() as `user`, skipping authentication and permission
+    checks, which are not part of the plans under test.
+    """
+    request = APIRequestFactory().get('/', query_params or {})
+    force_authenticate(request, user=user)
+    view = view_class()
+    view.setup(request)
+    view.format_kwarg = None
+    view.request = view.initialize_request(request)
+    return view.list(view.request)
+
+
+class QueryPlanTestCase(TestCase):
+    """
+    Compares the SQLite query plans of hot-path queries to a checked-in JSON file.
+
+    Subclasses seed representative data in setUpTestData() and call
+    assertQueryPlans(name, func, table): every query `func` runs against `table`
+    is explained, and the test fails if any plan does a full table scan or sorts
+    through a temporary b-tree, or if the plans differ from the ones recorded
+    under `name` in `expected_plans_path`. Run the tests with
+    UPDATE_QUERY_PLANS=1 to record new expected plans after an intended change.
+    """
+    expected_plans_path = None
+    # Names of plans allowed to contain a full scan or temp b-tree, with the reason.
+    allowed_problems = {}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._expected = {}
+        cls._recorded = {}
+        if cls.expected_plans_path and Path(cls.expected_plans_path).exists():
+            cls._expected = json.loads(Path(cls.expected_plans_path).read_text())
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.environ.get(UPDATE_ENV_VAR) and cls._recorded:
+            expected = dict(cls._expected, **cls._recorded)
+            Path(cls.expected_plans_path).write_text(json.dumps(expected, indent=2, sort_keys=True) + '\n')
+        super().tearDownClass()
+
+    def setUp(self):
+        # Cached lookups (team rosters) left by other tests would change the queries.
+        cache.clear()
+
+    @classmethod
+    def analyze(cls):
+        """Refreshes planner statistics; call at the end of setUpTestData()."""
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertQueryPlans(self, name, func, table):
+        queries = [
+            (sql, params) for sql, params in capture_queries(func)
+            if f'"{table}"' in sql and not sql.lstrip().upper().startswith(('SAVEPOINT', 'RELEASE'))
+        ]
+        self.assertTrue(queries, f"{name}: no queries against {table} were captured")
+
+        plans = [{'sql': sql, 'plan': explain(sql, params)} for sql, params in queries]
+
+        if name not in self.allowed_problems:
+            for entry in plans:
+                problems = plan_problems(entry['plan'])
+                self.assertFalse(problems, f"{name}: {'; '.join(problems)}\n{entry['sql']}\n" + '\n'.join(entry['plan']))
+
+        if os.environ.get(UPDATE_ENV_VAR):
+            self._recorded[name] = plans
+            return
+
+        self.assertIn(name, self._expected, f"{name}: no expected plan recorded; run with {UPDATE_ENV_VAR}=1")
+        self.assertEqual(
+            [entry['plan'] for entry in plans],
+            [entry['plan'] for entry in self._expected[name]],
+            f"{name}: query plan changed; if intended, run with {UPDATE_ENV_VAR}=1 and commit the new plans",
+        )
@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_alias():
+    alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', None)
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Routes ORM reads inside the block to the replica (when one is configured)."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReadReplicaRouter:
+    """
+    Sends reads to the replica only inside replica_reads(), which
+    ReplicaRoutingMiddleware enters for safe requests to views marked with
+    `read_from_replica = True`. Everything else, including all writes, uses the
+    default (primary) database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives the schema through replication, never through migrate.
+        if db == replica_alias():
+            return False
+        return None
@@ -0,0 +1,87 @@
+import json
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+
+
+# What each entry point pays before it can do useful work, run in a fresh interpreter.
+STARTUP_SCRIPTS = {
+    # Every management command: settings, app registry, models and signal handlers.
+    'manage': "import django; django.setup()",
+    # A web worker booting: also middleware and, through warm_up(), the URLconf and views.
+    'wsgi': "from EmployeeTimesheetAndLeaveManagement.wsgi import application",
+    'asgi': "from EmployeeTimesheetAndLeaveManagement.asgi import application",
+}
+
+# Served after a wsgi boot to time the first request; needs no database or credentials.
+FIRST_REQUEST_PATH = '/api/timesheet/api/timesheet/me/'
+
+_MEASURE = """
+import io, json, sys, time
+started = time.perf_counter()
+{script}
+booted = time.perf_counter()
+boot_modules = sorted(sys.modules)
+status = None
+if {path!r}:
+    environ = {{
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': {path!r}, 'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80', 'HTTP_HOST': 'localhost', 'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+    }}
+    statuses = []
+    b''.join(application(environ, lambda status, headers: statuses.append(status)))
+    status = int(statuses[0].split()[0])
+print(json.dumps({{
+    'boot': booted - started,
+    'first_request': time.perf_counter() - booted,
+    'status': status,
+    'boot_modules': boot_modules,
+    'modules': sorted(sys.modules),
+}}))
+"""
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def warm_up():
+    """
+    Loads the URLconf, and with it every view, serializer and permission module,
+    while the worker boots rather than on its first request. Apps whose config
+    has a `warm_up()` method (e.g. to build an in-memory index) get it called too.
+    """
+    from django.apps import apps
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+    for app_config in apps.get_app_configs():
+        if hasattr(app_config, 'warm_up'):
+            app_config.warm_up()
+
+
+def measure_startup(target='wsgi', first_request=False, import_time=False):
+    """
+    Boots `target` in a fresh interpreter and returns its timings, the modules it
+    loaded and, with `import_time`, the `-X importtime` records as
+    (module, self_us, cumulative_us, depth) tuples.
+    """
+    path = FIRST_REQUEST_PATH if first_request and target == 'wsgi' else ''
+    command = [sys.executable]
+    if import_time:
+        command += ['-X', 'importtime']
+    command += ['-c', _MEASURE.format(script=STARTUP_SCRIPTS[target], path=path)]
+
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'EmployeeTimesheetAndLeaveManagement.settings'))
+    completed = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True)
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['imports'] = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            result['imports'].append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return result
@@ -0,0 +1,378 @@
+import cProfile
+import datetime
+import decimal
+import json
+import os
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+from unittest import mock, skipIf, skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from api_authentication.models import EmployeeModel
+from api_authentication.tokens import RevocableAccessToken
+from api_leave.models import LeaveRequestModel
+from api_leave.serializers import EmployeeLeaveRequestListSerializer
+from api_timesheet.models import TimesheetModel
+from api_timesheet.serializers import EmployeeTimesheetSerializer
+from . import renderers
+from .middleware import LoadSheddingMiddleware
+from .parallel import parallel_map
+from .profiling import ProfileStore, QueryLog
+from .renderers import FastJSONRenderer
+from .routers import replica_reads
+from .startup import FIRST_REQUEST_PATH, measure_startup
+from .throttling import IPTokenBucketThrottle
+
+
+# Cold start of a web worker (interpreter, Django, URLconf, views) plus its first
+# request. Locally this is ~0.45s; raise the budget only with a reason. Wall-clock
+# time depends on the machine, so the check only runs with CHECK_STARTUP_BUDGET=1.
+STARTUP_BUDGET_ENV_VAR = 'CHECK_STARTUP_BUDGET'
+STARTUP_BUDGET_SECONDS = 1.0
+# Best of this many cold starts, to keep noisy CI machines from failing the budget.
+STARTUP_RUNS = 3
+
+# Heavy modules that must only load when the code path that needs them runs.
+LAZY_MODULES = {
+    'wsgi': ['smtplib'],
+    'manage': ['smtplib', 'rest_framework.serializers'],
+}
+
+
+@skipUnless(os.environ.get(STARTUP_BUDGET_ENV_VAR), f"set {STARTUP_BUDGET_ENV_VAR}=1 to check the startup budget")
+class StartupBudgetTests(SimpleTestCase):
+    def test_wsgi_cold_start_and_first_request_within_budget(self):
+        timings = []
+        for _ in range(STARTUP_RUNS):
+            result = measure_startup('wsgi', first_request=True)
+            self.assertEqual(result['status'], 401)
+            timings.append(result['boot'] + result['first_request'])
+
+        self.assertLess(
+            min(timings), STARTUP_BUDGET_SECONDS,
+            f"Time to first request {min(timings):.3f}s exceeds the {STARTUP_BUDGET_SECONDS}s budget; "
+            f"see `python manage.py profile_imports --first-request`.",
+        )
+
+
+class LazyImportTests(SimpleTestCase):
+    """Startup checks that hold on any machine, unlike the wall-clock budget above."""
+    def test_heavy_modules_stay_lazy(self):
+        for target, modules in LAZY_MODULES.items():
+            loaded = set(measure_startup(target)['modules'])
+            for module in modules:
+                with self.subTest(target=target, module=module):
+                    self.assertNotIn(module, loaded)
+
+    def test_first_request_only_uses_modules_loaded_at_boot(self):
+        resolve(FIRST_REQUEST_PATH)
+        result = measure_startup('wsgi', first_request=True)
+        # Unauthenticated, so no database is needed; a 404 would mean the path is stale.
+        self.assertEqual(result['status'], 401)
+
+        # warm_up() must have loaded every view, serializer and permission module.
+        packages = {app.split('.')[0] for app in settings.INSTALLED_APPS if not app.startswith('django.')}
+        late = [module for module in set(result['modules']) - set(result['boot_modules']) if module.split('.')[0] in packages]
+        self.assertEqual(sorted(late), [])
+        for module in LAZY_MODULES['wsgi']:
+            self.assertNotIn(module, result['modules'])
+
+
+@override_settings(REPLICA_DATABASE_ALIAS='replica')
+class ReplicaRoutingTests(TransactionTestCase):
+    # In tests the replica mirrors the default database. A TestCase would keep the
+    # default connection in a transaction, locking the mirror's reads.
+    databases = {'default', 'replica', *settings.TIMESHEET_SHARDS}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('employee')
+        EmployeeModel.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RevocableAccessToken.for_user(self.user)}')
+
+    def replica_queries(self, method, url):
+        with CaptureQueriesContext(connections['replica']) as queries:
+            response = getattr(self.client, method)(url)
+        self.assertLess(response.status_code, 400, response.data)
+        return len(queries)
+
+    def test_router_reads_from_the_replica_only_inside_replica_reads(self):
+        self.assertEqual(router.db_for_read(User), 'default')
+        with replica_reads():
+            self.assertEqual(router.db_for_read(User), 'replica')
+            self.assertEqual(router.db_for_write(User), 'default')
+            with replica_reads(enabled=False):
+                self.assertEqual(router.db_for_read(User), 'default')
+        with override_settings(REPLICA_DATABASE_ALIAS=None), replica_reads():
+            self.assertEqual(router.db_for_read(User), 'default')
+
+    def test_only_views_that_opt_in_read_from_the_replica(self):
+        self.assertGreater(self.replica_queries('get', '/api/leave//api/leave-request/me/'), 0)
+        self.assertEqual(self.replica_queries('get', '/api/auth//employee/me/'), 0)
+
+    def test_writes_go_to_the_primary_and_pin_the_writer(self):
+        self.assertEqual(self.replica_queries('post', '/api/timesheet/api/timesheet/clock-in/'), 0)
+        self.assertTrue(TimesheetModel.objects.for_user(self.user).exists())
+
+        # Read-your-writes: the writer's next reads stay on the primary until the pin expires.
+        self.assertEqual(self.replica_queries('get', '/api/leave//api/leave-request/me/'), 0)
+        cache.clear()
+        self.assertGreater(self.replica_queries('get', '/api/leave//api/leave-request/me/'), 0)
+
+
+class TokenBucketThrottleTests(SimpleTestCase):
+    view = SimpleNamespace(throttle_scope='test')
+
+    def setUp(self):
+        cache.clear()
+        self.now = 6000.0  # The start of a one-minute window.
+
+    def allow(self):
+        throttle = IPTokenBucketThrottle()
+        throttle.THROTTLE_RATES = {'test_ip': '3/min'}
+        throttle.timer = lambda: self.now
+        allowed = throttle.allow_request(Request(APIRequestFactory().get('/')), self.view)
+        return allowed, throttle
+
+    def test_a_full_bucket_allows_a_burst_then_waits_for_the_window(self):
+        self.assertEqual([self.allow()[0] for _ in range(4)], [True, True, True, False])
+        self.now += 15
+        allowed, throttle = self.allow()
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.wait(), 45)
+
+    def test_tokens_refill_as_the_previous_window_drains(self):
+        for _ in range(3):
+            self.allow()
+        # Half-way through the next window, half of the previous window's tokens are back.
+        self.now += 90
+        self.assertEqual([self.allow()[0] for _ in range(2)], [True, False])
+        # Rejected requests handed their token back: one more refills in 10s.
+        self.now += 9
+        self.assertFalse(self.allow()[0])
+        self.now += 1
+        self.assertTrue(self.allow()[0])
+
+    def test_views_without_a_scope_are_not_throttled(self):
+        request = Request(APIRequestFactory().get('/'))
+        self.assertTrue(IPTokenBucketThrottle().allow_request(request, SimpleNamespace()))
+
+
+@override_settings(
+    LOAD_SHEDDING_LIMITS={
+        'low': {'MAX_IN_FLIGHT': 2, 'MAX_LATENCY': 1.0},
+        'default': {'MAX_IN_FLIGHT': 4, 'MAX_LATENCY': 5.0},
+    },
+    LOAD_SHEDDING_RETRY_AFTER=7,
+)
+class LoadSheddingMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.middleware = LoadSheddingMiddleware(lambda request: HttpResponse())
+        self.request = RequestFactory().get('/')
+
+    def process_view(self, priority=None):
+        view_class = type('View', (), {} if priority is None else {'request_priority': priority})
+        return self.middleware.process_view(self.request, SimpleNamespace(view_class=view_class), (), {})
+
+    def shed(self, priority=None):
+        return self.process_view(priority) is not None
+
+    def test_sheds_by_priority_when_too_many_requests_are_in_flight(self):
+        self.middleware.load.in_flight = 3
+        self.assertEqual((self.shed('low'), self.shed(), self.shed('critical')), (True, False, False))
+        self.middleware.load.in_flight = 100
+        self.assertEqual((self.shed('low'), self.shed(), self.shed('critical')), (True, True, False))
+
+    def test_sheds_by_priority_when_responses_are_slow(self):
+        self.middleware.load._latency = 3.0
+        self.assertEqual((self.shed('low'), self.shed(), self.shed('critical')), (True, False, False))
+        # The average decays while idle, so shedding stops without new samples.
+        self.middleware.load._sampled_at = time.monotonic() - 20
+        self.assertFalse(self.shed('low'))
+
+    @override_settings(LOAD_SHEDDING_CACHE='default')
+    def test_in_flight_count_shared_through_the_cache(self):
+        # Two sync workers, one request each: only the shared count sees both.
+        cache.clear()
+        workers = [LoadSheddingMiddleware(lambda request: HttpResponse()) for _ in range(2)]
+        for _ in range(3):
+            workers[0].load.started()
+        self.middleware = workers[1]
+        self.middleware.load.started()
+        self.assertEqual((self.middleware.load.in_flight, self.middleware.load.in_flight_count()), (1, 4))
+        self.assertTrue(self.shed('low'))
+
+        for _ in range(3):
+            workers[0].load.finished(0.01)
+        self.assertEqual(self.middleware.load.in_flight_count(), 1)
+        self.assertFalse(self.shed('low'))
+
+    def test_shed_response_and_accounting(self):
+        self.middleware.load.in_flight = 10
+        response = self.process_view('low')
+        self.assertEqual((response.status_code, response['Retry-After']), (503, '7'))
+
+        self.middleware.load.in_flight = 0
+        self.middleware.get_response = lambda request: response
+        self.middleware(self.request)
+        # Shed responses leave the latency average alone.
+        self.assertEqual((self.middleware.load.in_flight, self.middleware.load.latency()), (0, 0.0))
+
+
+@skipIf(renderers.orjson is None, "orjson is not installed")
+class FastJSONRendererTests(SimpleTestCase):
+    def assertSameAsJSONRenderer(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_output_matches_json_renderer(self):
+        paris = datetime.timezone(datetime.timedelta(hours=2))
+        self.assertSameAsJSONRenderer({
+            'utc': datetime.datetime(2026, 7, 1, 9, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'offset': datetime.datetime(2026, 7, 1, 9, 30, tzinfo=paris),
+            'naive': datetime.datetime(2026, 7, 1, 9, 30),
+            'date': datetime.date(2026, 7, 1),
+            'time': datetime.time(9, 30, 0, 500),
+            'durations': [datetime.timedelta(hours=8, minutes=3), datetime.timedelta(days=-1, microseconds=5)],
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'decimal': decimal.Decimal('7.50'),
+            'text': 'Zoë\u2028left\u2029',
+            'nested': [{'id': 1, 'ok': True, 'none': None, 'ratio': 0.1}],
+            1: 'non-string key',
+        })
+
+    def test_indented_output_uses_json_renderer(self):
+        self.assertSameAsJSONRenderer({'a': [1, 2]}, 'application/json; indent=2')
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+@override_settings(TIME_ZONE='Asia/Kolkata')
+class FieldProjectionTests(TestCase):
+    databases = {'default', *settings.TIMESHEET_SHARDS}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('employee')
+        approver = User.objects.create_user('approver', first_name='Grace', last_name='Hopper')
+        clock_in = datetime.datetime(2026, 7, 1, 3, 30, 15, 250000, tzinfo=datetime.timezone.utc)
+        for day, hours in enumerate([8.5, None, 0.25]):
+            start = clock_in + datetime.timedelta(days=day)
+            end = start + datetime.timedelta(hours=hours) if hours is not None else None
+            TimesheetModel.objects.create(user=cls.user, clock_in_time=start, clock_out_time=end)
+        for day, approved_by in enumerate([approver, None]):
+            start = datetime.date(2026, 8, 1) + datetime.timedelta(days=10 * day)
+            LeaveRequestModel.objects.create(
+                user=cls.user, start_date=start, end_date=start, reason='Trip', approved_by=approved_by,
+                status=LeaveRequestModel.Status.APPROVED if approved_by else LeaveRequestModel.Status.PENDING,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertMatchesSerializer(self, url, serializer_class, queryset, fields=None):
+        response = self.client.get(url, {'fields': ','.join(fields)} if fields else None)
+        self.assertEqual(response.status_code, 200, response.data)
+        expected = json.loads(JSONRenderer().render(serializer_class(queryset, many=True).data))
+        if fields:
+            expected = [{name: row[name] for name in fields} for row in expected]
+        rows = json.loads(response.content)
+        self.assertEqual(rows['results'] if isinstance(rows, dict) else rows, expected)
+
+    def test_timesheets_match_the_serializer(self):
+        url = '/api/timesheet/api/timesheet/me/'
+        queryset = TimesheetModel.objects.for_user(self.user).order_by('-clock_in_time', '-id')
+        self.assertMatchesSerializer(url, EmployeeTimesheetSerializer, queryset)
+        self.assertMatchesSerializer(url, EmployeeTimesheetSerializer, queryset, ['working_hours', 'id'])
+
+    def test_leave_requests_match_the_serializer(self):
+        url = '/api/leave//api/leave-request/me/'
+        queryset = LeaveRequestModel.objects.filter(user=self.user).order_by('-start_date', '-id')
+        self.assertMatchesSerializer(url, EmployeeLeaveRequestListSerializer, queryset)
+        self.assertMatchesSerializer(url, EmployeeLeaveRequestListSerializer, queryset, ['approved_by', 'start_date'])
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get('/api/timesheet/api/timesheet/me/', {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', response.data['fields'])
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_store_keeps_the_newest_captures(self):
+        store = ProfileStore(self.directory, max_profiles=2)
+        ids = [store.save(cProfile.Profile(), {'id': store.new_id(), 'queries': []}) for _ in range(3)]
+        self.assertEqual(store.ids(), ids[1:])
+        self.assertEqual([capture['id'] for capture in store.list()], ids[:0:-1])
+        with self.assertRaises(FileNotFoundError):
+            store.path('../settings', '.json')
+
+    def test_profiled_request_is_listed_for_admins_only(self):
+        with override_settings(PROFILER_TOKEN='secret', PROFILER_DIR=self.directory):
+            client = APIClient()
+            client.force_authenticate(User.objects.create_user('admin', is_staff=True))
+            self.assertNotIn('X-Profile-Id', client.get('/api/core/profiles/'))
+            self.assertNotIn('X-Profile-Id', client.get('/api/core/profiles/', headers={'x-profile': 'wrong'}))
+            profile_id = client.get('/api/core/profiles/?page=1', headers={'x-profile': 'secret'})['X-Profile-Id']
+
+            profile = client.get(f'/api/core/profiles/{profile_id}/').data
+            self.assertEqual((profile['path'], profile['status']), ('/api/core/profiles/?page=1', 200))
+            self.assertEqual(profile['query_count'], len(profile['queries']))
+            self.assertIn('cumulative', profile['summary'])
+            self.assertEqual(client.get('/api/core/profiles/').data['profiles'][0]['id'], profile_id)
+
+            client.force_authenticate(User.objects.create_user('employee'))
+            self.assertEqual(client.get('/api/core/profiles/').status_code, 403)
+            self.assertEqual(client.get(f'/api/core/profiles/{profile_id}/download/').status_code, 403)
+
+    def test_pool_threads_keep_usable_connections(self):
+        def query(_):
+            with connections['default'].cursor() as cursor:
+                cursor.execute('SELECT 1')
+
+        def fail(_):
+            query(_)
+            connections['default'].errors_occurred = True
+
+        wrapper = type(connections['default'])
+        # CONN_MAX_AGE is 0 in settings: a request thread would close after each request.
+        with mock.patch.object(wrapper, 'close', autospec=True) as close:
+            parallel_map(query, range(4))
+        close.assert_not_called()
+
+        with mock.patch.object(wrapper, 'close', autospec=True) as close, mock.patch.object(wrapper, 'is_usable', return_value=False):
+            parallel_map(fail, range(2))
+        self.assertEqual(close.call_count, 2)
+
+    def test_parallel_queries_are_logged(self):
+        def query(_):
+            with connections['default'].cursor() as cursor:
+                cursor.execute('SELECT 1')
+
+        log = QueryLog(max_queries=10)
+        with log.capture():
+            parallel_map(query, range(3))
+        self.assertEqual(log.count, 3)
+        parallel_map(query, range(3))
+        self.assertEqual(log.count, 3)
@@ -0,0 +1,103 @@
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket throttle kept in the shared cache.
+
+    A bucket holds `num_requests` tokens and refills continuously over the rate's
+    duration. It is approximated with two consecutive fixed-window counters: the
+    previous window's count drains linearly as the current window advances. Every
+    request costs one atomic `incr`, so concurrent workers never overwrite each
+    other's counts the way SimpleRateThrottle's read-modify-write history list
+    does. Rejected requests hand their token back, so a retry storm from one
+    client does not keep it locked out once it slows down.
+
+    The rate is looked up per scope: subclasses build the scope from the view's
+    `throttle_scope` plus their own suffix (e.g. 'login_ip').
+    """
+    scope_suffix = None
+    cache_format = 'throttle_%(scope)s_%(ident)s'
+
+    def __init__(self):
+        # The scope (and so the rate) comes from the view, in allow_request().
+        pass
+
+    def allow_request(self, request, view):
+        base_scope = getattr(view, 'throttle_scope', None)
+        if not base_scope:
+            return True
+
+        self.scope = f"{base_scope}_{self.scope_suffix}"
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        current_key = f"{self.key}_{window}"
+
+        # Both windows must outlive the next one, which reads this one as "previous".
+        self.cache.add(current_key, 0, 2 * self.duration)
+        try:
+            self.current = self.cache.incr(current_key)
+        except ValueError:
+            # Evicted between add() and incr().
+            self.cache.set(current_key, 1, 2 * self.duration)
+            self.current = 1
+        self.previous = self.cache.get(f"{self.key}_{window - 1}", 0)
+
+        self.elapsed = (self.now % self.duration) / self.duration
+        if self.previous * (1 - self.elapsed) + self.current <= self.num_requests:
+            return True
+
+        try:
+            self.cache.decr(current_key)
+        except ValueError:
+            pass
+        self.current -= 1
+        return self.throttle_failure()
+
+    def wait(self):
+        remaining = self.duration * (1 - self.elapsed)
+        if not self.previous:
+            return remaining
+        # Seconds until the draining previous window frees one token.
+        excess = self.previous * (1 - self.elapsed) + self.current + 1 - self.num_requests
+        return min(remaining, excess * self.duration / self.previous)
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Per-account bucket. Authenticated requests are keyed by user id; unauthenticated
+    ones by the username they submit, so password guessing against one account is
+    limited however many addresses it comes from.
+    """
+    scope_suffix = 'user'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            username = request.data.get('username') if hasattr(request.data, 'get') else None
+            if not username or not isinstance(username, str):
+                return None
+            # Hashed so arbitrary input makes a valid cache key.
+            ident = hashlib.sha1(username.strip().lower().encode()).hexdigest()
+
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Per-client-address bucket (honours NUM_PROXIES like DRF's throttles)."""
+    scope_suffix = 'ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
@@ -0,0 +1,11 @@
+from django.urls import path
+
+
+from . import views as my_views
+
+
+urlpatterns = [
+    path('profiles/', my_views.ProfileListView.as_view(), name='profile-list'),
+    path('profiles/<str:profile_id>/', my_views.ProfileDetailView.as_view(), name='profile-detail'),
+    path('profiles/<str:profile_id>/download/', my_views.ProfileDownloadView.as_view(), name='profile-download'),
+]
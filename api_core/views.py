@@ -0,0 +1,44 @@
+from django.http import FileResponse, Http404
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+from .profiling import ProfileStore
+
+
+class ProfileListView(generics.GenericAPIView):
+    """Captured request profiles, newest first."""
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response({'profiles': ProfileStore().list()}, status=status.HTTP_200_OK)
+
+
+class ProfileDetailView(generics.GenericAPIView):
+    """One capture's metadata, query log and top functions by cumulative time."""
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+
+    def get(self, request, profile_id, *args, **kwargs):
+        store = ProfileStore()
+        try:
+            profile = store.metadata(profile_id)
+            profile['summary'] = store.summary(profile_id)
+        except FileNotFoundError:
+            raise Http404
+        return Response(profile, status=status.HTTP_200_OK)
+
+
+class ProfileDownloadView(generics.GenericAPIView):
+    """The raw pstats file, for `python -m pstats` or snakeviz."""
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+
+    def get(self, request, profile_id, *args, **kwargs):
+        try:
+            profile = ProfileStore().path(profile_id, '.prof').open('rb')
+        except FileNotFoundError:
+            raise Http404
+        return FileResponse(profile, as_attachment=True, filename=f"{profile_id}.prof", content_type='application/octet-stream')
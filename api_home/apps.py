@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ApiHomeConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'api_home'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,150 @@
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from api_authentication.models import EmployeeModel
+from api_authentication.rosters import filter_to_team, roster_cache, team_user_ids
+from api_core.caching import VersionedCache
+from api_core.parallel import parallel_map
+from api_leave.models import LeaveRequestModel
+from api_leave.serializers import EmployeeLeaveRequestListSerializer
+from api_timesheet.models import TimesheetModel
+from api_timesheet.serializers import EmployeeTimesheetSerializer
+
+
+DEFAULT_HOME_CACHE_SECONDS = 300
+DEFAULT_HOME_RECENT_TIMESHEETS = 5
+DEFAULT_HOME_TEAM_PENDING_LIMIT = 20
+
+
+def load_open_shift(user_id):
+    timesheet = (
+        TimesheetModel.objects.for_user(user_id)
+        .filter(clock_in_time__isnull=False, clock_out_time__isnull=True)
+        .order_by('-clock_in_time').first()
+    )
+    return EmployeeTimesheetSerializer(timesheet).data if timesheet is not None else None
+
+
+def load_recent_timesheets(user_id):
+    limit = getattr(settings, 'HOME_RECENT_TIMESHEETS', DEFAULT_HOME_RECENT_TIMESHEETS)
+    timesheets = TimesheetModel.objects.for_user(user_id).order_by('-clock_in_time', '-id')[:limit]
+    return EmployeeTimesheetSerializer(timesheets, many=True).data
+
+
+def load_leave(user_id):
+    """Pending requests and approved leave that has not ended yet, soonest first."""
+    requests = LeaveRequestModel.objects.filter(
+        user_id=user_id,
+        end_date__gte=timezone.localdate(),
+        status__in=[LeaveRequestModel.Status.PENDING, LeaveRequestModel.Status.APPROVED],
+    ).select_related('approved_by').order_by('start_date', 'id')
+    rows = EmployeeLeaveRequestListSerializer(requests, many=True).data
+    return {
+        'pending_requests': [row for row in rows if row['status'] == LeaveRequestModel.Status.PENDING],
+        'upcoming_leave': [row for row in rows if row['status'] == LeaveRequestModel.Status.APPROVED],
+    }
+
+
+def load_team(user_id):
+    """The team's pending leave requests, oldest first: what waits on the manager."""
+    limit = getattr(settings, 'HOME_TEAM_PENDING_LIMIT', DEFAULT_HOME_TEAM_PENDING_LIMIT)
+    pending = filter_to_team(LeaveRequestModel.objects.filter(status=LeaveRequestModel.Status.PENDING), user_id)
+    rows = list(
+        pending.order_by('start_date', 'id')
+        .values('id', 'user_id', 'user__username', 'user__first_name', 'user__last_name', 'start_date', 'end_date', 'reason')[:limit + 1]
+    )
+    return {
+        'members': len(team_user_ids(user_id)),
+        'pending_leave_count': len(rows) if len(rows) <= limit else pending.count(),
+        'pending_leave_requests': [
+            {
+                'id': row['id'],
+                'user': {
+                    'id': row['user_id'],
+                    'username': row['user__username'],
+                    'first_name': row['user__first_name'],
+                    'last_name': row['user__last_name'],
+                },
+                'start_date': row['start_date'].isoformat(),
+                'end_date': row['end_date'].isoformat(),
+                'reason': row['reason'],
+            }
+            for row in rows[:limit]
+        ],
+    }
+
+
+class Section:
+    """
+    One independently cached part of the home screen: load(user_id) returns its
+    JSON-ready value, cached per user in a VersionedCache of its own.
+    """
+
+    def __init__(self, name, load):
+        self.name = name
+        self.load = load
+        self.cache = VersionedCache(f'home_{name}', 'HOME_CACHE_SECONDS', DEFAULT_HOME_CACHE_SECONDS)
+
+    def cache_key(self, user_id):
+        return user_id
+
+    def get(self, user_id):
+        # Boxed so that a None section (no open shift) is cached too.
+        return self.cache.get(self.cache_key(user_id), lambda: (self.load(user_id),))[0]
+
+    def invalidate(self, user_ids):
+        self.cache.invalidate(user_ids)
+
+
+class TeamSection(Section):
+    def cache_key(self, user_id):
+        # Keyed by the roster version as well, so team changes show at once.
+        return f'{user_id}_{roster_cache.version(user_id)}'
+
+    def invalidate(self, user_ids):
+        # Entries under older roster versions are no longer read.
+        super().invalidate(self.cache_key(user_id) for user_id in user_ids)
+
+
+SECTIONS = {
+    section.name: section for section in (
+        Section('open_shift', load_open_shift),
+        Section('recent_timesheets', load_recent_timesheets),
+        Section('leave', load_leave),
+        TeamSection('team', load_team),
+    )
+}
+TIMESHEET_SECTIONS = ('open_shift', 'recent_timesheets')
+
+
+def load_sections(user_id, names):
+    """
+    {name: value} of the named sections. Cache misses run concurrently on the
+    shared query pool; inside a transaction (as in tests) they run in this
+    thread, where its uncommitted writes are visible.
+    """
+    def get(name):
+        return SECTIONS[name].get(user_id)
+
+    names = list(names)
+    if any(connection.in_atomic_block for connection in connections.all(initialized_only=True)):
+        values = [get(name) for name in names]
+    else:
+        values = parallel_map(get, names)
+    return dict(zip(names, values))
+
+
+def invalidate_timesheet_sections(user_ids):
+    for name in TIMESHEET_SECTIONS:
+        SECTIONS[name].invalidate(user_ids)
+
+
+def invalidate_leave_sections(user_ids):
+    """The owners' leave sections and their managers' team sections."""
+    user_ids = set(user_ids)
+    SECTIONS['leave'].invalidate(user_ids)
+    SECTIONS['team'].invalidate(
+        EmployeeModel.objects.filter(user_id__in=user_ids, manager__isnull=False)
+        .values_list('manager__user_id', flat=True).distinct()
+    )
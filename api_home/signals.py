@@ -0,0 +1,16 @@
+from django.dispatch import receiver
+
+from api_sync.models import ChangeLogModel
+from api_sync.utils import changes_recorded
+
+
+@receiver(changes_recorded)
+def invalidate_home_sections(sender, resource, rows, **kwargs):
+    # Imported here: the sections pull in serializers, which startup keeps lazy.
+    from .sections import invalidate_leave_sections, invalidate_timesheet_sections
+
+    owners = {owner_id for _, owner_id in rows}
+    if resource == ChangeLogModel.Resource.TIMESHEET:
+        invalidate_timesheet_sections(owners)
+    elif resource == ChangeLogModel.Resource.LEAVE_REQUEST:
+        invalidate_leave_sections(owners)
@@ -0,0 +1,96 @@
+import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api_authentication.models import EmployeeModel
+from api_authentication.revocation import revoked_tokens
+from api_authentication.tokens import RevocableAccessToken
+from api_leave.models import LeaveRequestModel
+from api_timesheet.models import TimesheetModel
+
+
+class HomeViewTests(TestCase):
+    databases = {'default', *settings.TIMESHEET_SHARDS}
+
+    @classmethod
+    def setUpTestData(cls):
+        # Staff: IsManager does not recognise managers yet, and bulk decisions require one of the two.
+        cls.manager = User.objects.create_user('manager', is_staff=True)
+        manager_employee = EmployeeModel.objects.create(user=cls.manager, role='MANAGER')
+        cls.user = User.objects.create_user('employee', first_name='Ada')
+        EmployeeModel.objects.create(user=cls.user, manager=manager_employee, leave_balance=12.5)
+
+        now = timezone.now()
+        TimesheetModel.objects.bulk_create([
+            TimesheetModel(
+                user=cls.user, clock_in_time=now - datetime.timedelta(days=day, hours=9),
+                clock_out_time=now - datetime.timedelta(days=day, hours=1), working_hours=datetime.timedelta(hours=8),
+            )
+            for day in range(1, 9)
+        ])
+        today = timezone.localdate()
+        cls.pending = LeaveRequestModel.objects.create(
+            user=cls.user, start_date=today + datetime.timedelta(days=10), end_date=today + datetime.timedelta(days=12), reason='Trip',
+        )
+
+    def setUp(self):
+        cache.clear()
+        revoked_tokens.build()
+
+    def get_home(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RevocableAccessToken.for_user(user)}')
+        response = client.get('/api/home/')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_sections_and_cached_reads(self):
+        home = self.get_home(self.user)
+        self.assertEqual(home['profile']['user']['first_name'], 'Ada')
+        self.assertIsNone(home['open_shift'])
+        self.assertEqual(len(home['recent_timesheets']), 5)
+        self.assertEqual(home['leave']['balance'], 12.5)
+        self.assertEqual([row['id'] for row in home['leave']['pending_requests']], [self.pending.pk])
+        self.assertIsNone(home['team'])
+
+        team = self.get_home(self.manager)['team']
+        self.assertEqual(team['members'], 1)
+        self.assertEqual(team['pending_leave_count'], 1)
+        self.assertEqual(team['pending_leave_requests'][0]['user']['username'], 'employee')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_home(self.user), home)
+
+    def test_changes_invalidate_their_sections(self):
+        self.get_home(self.user)
+        self.get_home(self.manager)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            timesheet = TimesheetModel.objects.create(user=self.user, clock_in_time=timezone.now())
+        home = self.get_home(self.user)
+        self.assertEqual(home['open_shift']['id'], timesheet.pk)
+        self.assertEqual(home['recent_timesheets'][0]['id'], timesheet.pk)
+
+        # A set-based decision bypasses model signals but still reaches both caches.
+        client = APIClient()
+        client.force_authenticate(self.manager)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                '/api/leave//api/leave-request/bulk-decision/', {'decisions': [{'id': self.pending.pk, 'decision': 'APPROVE'}]}, format='json',
+            )
+            self.assertEqual(response.status_code, 200, response.data)
+
+        leave = self.get_home(self.user)['leave']
+        self.assertEqual(leave['pending_requests'], [])
+        self.assertEqual([row['id'] for row in leave['upcoming_leave']], [self.pending.pk])
+        self.assertEqual(self.get_home(self.manager)['team']['pending_leave_count'], 0)
+
+    def test_user_without_profile_gets_404(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RevocableAccessToken.for_user(User.objects.create_user("admin"))}')
+        self.assertEqual(client.get('/api/home/').status_code, 404)
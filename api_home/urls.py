@@ -0,0 +1,9 @@
+from django.urls import path
+
+
+from . import views as my_views
+
+
+urlpatterns = [
+    path('', my_views.HomeView.as_view(), name='home'),
+]
@@ -0,0 +1,43 @@
+from django.http import Http404
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+
+
+from api_authentication.profiles import get_profile
+from api_authentication.rosters import team_user_ids
+from .sections import load_sections
+
+
+class HomeView(APIView):
+    """
+    Everything the app shows on launch in one response: the profile, the open
+    shift, recent timesheets, leave balance and upcoming leave, and for managers
+    the team's pending leave requests.
+
+    The user is taken from the token, as for /employee/me/. Each section is
+    cached per user; the ones that miss are loaded in parallel. With every
+    section cached the request runs no query.
+    """
+    authentication_classes = [JWTStatelessUserAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        user_id = request.user.id
+        profile = get_profile(user_id)
+        if profile is None:
+            raise Http404
+
+        names = ['open_shift', 'recent_timesheets', 'leave']
+        if len(team_user_ids(user_id)):
+            names.append('team')
+        sections = load_sections(user_id, names)
+
+        return Response({
+            'profile': profile,
+            'open_shift': sections['open_shift'],
+            'recent_timesheets': sections['recent_timesheets'],
+            'leave': {'balance': profile['leave_balance'], **sections['leave']},
+            'team': sections.get('team'),
+        })
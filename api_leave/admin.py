@@ -1,3 +1,52 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db import transaction
 
-# Register your models here.
+from api_audit.buffer import record_events
+from api_audit.models import AuditEventModel
+from api_core.paginators import EstimatedCountPaginator
+from api_sync.models import ChangeLogModel
+from api_sync.utils import record_changes
+from .models import LeaveRequestModel
+
+
+Status = LeaveRequestModel.Status
+
+
+@admin.register(LeaveRequestModel)
+class LeaveRequestAdmin(admin.ModelAdmin):
+    """
+    Leave requests with their user and approver joined in, no full-table
+    COUNT(*), a date hierarchy on the indexed start_date and raw-id user widgets.
+    Approve and reject apply to every selected pending request with one UPDATE.
+    """
+    list_display = ['id', 'user', 'start_date', 'end_date', 'status', 'approved_by']
+    list_select_related = ['user', 'approved_by']
+    list_filter = ['status']
+    date_hierarchy = 'start_date'
+    raw_id_fields = ['user', 'approved_by']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    change_list_template = 'admin/api_core/indexed_change_list.html'
+    actions = ['approve', 'reject']
+
+    def decide(self, request, queryset, new_status, action):
+        with transaction.atomic():
+            rows = list(queryset.filter(status=Status.PENDING).select_for_update().order_by().values_list('pk', 'user_id'))
+            LeaveRequestModel.objects.filter(pk__in=[pk for pk, _ in rows], status=Status.PENDING).update(
+                status=new_status,
+                approved_by=request.user,
+            )
+            # Set-based updates bypass model signals.
+            record_changes(ChangeLogModel.Resource.LEAVE_REQUEST, rows)
+            record_events(action, request.user, AuditEventModel.Subject.LEAVE_REQUEST, rows, details={'admin': True})
+
+        skipped = queryset.count() - len(rows)
+        self.message_user(request, f"{new_status.label}: {len(rows)} requests; skipped {skipped} that were not pending.", messages.SUCCESS)
+
+    @admin.action(description="Approve selected pending requests")
+    def approve(self, request, queryset):
+        self.decide(request, queryset, Status.APPROVED, AuditEventModel.Action.LEAVE_APPROVED)
+
+    @admin.action(description="Reject selected pending requests")
+    def reject(self, request, queryset):
+        self.decide(request, queryset, Status.REJECTED, AuditEventModel.Action.LEAVE_REJECTED)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ApiLeaveConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api_leave'
+
+    def ready(self):
+        from . import signals  # noqa: F401
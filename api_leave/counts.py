@@ -0,0 +1,40 @@
+from django.db.models import Count
+
+from api_core.caching import VersionedCache
+from .models import LeaveRequestModel
+
+
+DEFAULT_LEAVE_COUNT_CACHE_SECONDS = 3600
+
+status_count_cache = VersionedCache('leave_status_counts', 'LEAVE_COUNT_CACHE_SECONDS', DEFAULT_LEAVE_COUNT_CACHE_SECONDS)
+
+
+def load_status_counts(user_ids):
+    counts = {user_id: dict.fromkeys(LeaveRequestModel.Status.values, 0) for user_id in user_ids}
+    rows = (
+        LeaveRequestModel.objects.filter(user_id__in=user_ids)
+        .order_by().values_list('user_id', 'status').annotate(requests=Count('id'))
+    )
+    for user_id, status, requests in rows:
+        counts[user_id][status] = requests
+    return counts
+
+
+def status_counts(user_ids):
+    """
+    Leave requests per status, summed over `user_ids`, e.g. {'PENDING': 2,
+    'APPROVED': 10, 'REJECTED': 1}.
+
+    Counted once per user and cached; the signal in signals.py invalidates a
+    user's counts whenever their requests change, saves and set-based updates
+    alike (both go through api_sync.utils.record_changes).
+    """
+    totals = dict.fromkeys(LeaveRequestModel.Status.values, 0)
+    for counts in status_count_cache.get_many(user_ids, load_status_counts).values():
+        for status, requests in counts.items():
+            totals[status] += requests
+    return totals
+
+
+def invalidate_status_counts(user_ids):
+    status_count_cache.invalidate(user_ids)
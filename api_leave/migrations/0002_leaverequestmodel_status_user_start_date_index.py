@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-19 16:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_leave', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='leaverequestmodel',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected')], default='PENDING', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequestmodel',
+            index=models.Index(fields=['status', 'user', 'start_date'], name='api_leave_l_status_9f0fea_idx'),
+        ),
+    ]
@@ -23,7 +23,9 @@ class LeaveRequestModel(models.Model):
         __str__(): Returns a human-readable representation of the leave request.
 
     Meta:
-        Adds an index on user and start_date for efficient querying.
+        Adds an index on user and start_date for efficient querying, and one on
+        status, user and start_date so a status filter (a team's pending queue)
+        reads only the matching rows of each user. It also serves status-only lookups.
     """
     class Status(models.TextChoices):
         PENDING = "PENDING", "Pending"
@@ -44,7 +46,6 @@ class LeaveRequestModel(models.Model):
         max_length=20, 
         choices=Status.choices, 
         default=Status.PENDING, 
-        db_index=True,
     )
     approved_by = models.ForeignKey(
         User, 
@@ -75,5 +76,6 @@ class LeaveRequestModel(models.Model):
     
     class Meta:
         indexes = [
-            models.Index(fields=['user', 'start_date'])
+            models.Index(fields=['user', 'start_date']),
+            models.Index(fields=['status', 'user', 'start_date']),
         ]
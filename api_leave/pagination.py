@@ -1,4 +1,36 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
 
-class LeaveRequestPagination(PageNumberPagination):
-    page_size = 15
\ No newline at end of file
+
+class LeaveRequestPagination(CursorPagination):
+    """
+    Latest start first unless the view's `?ordering=` says otherwise; the cursor
+    keeps deep pages as cheap as the first one. Pages carry the view's cached
+    per-status `counts` in place of a COUNT of the filtered rows.
+
+    Views should only allow ordering by near-unique fields such as the dates:
+    ties are broken by id in the same direction, so the order is total and each
+    page picks up exactly where the last one stopped, but the cursor steps
+    through a tie by offset, which a column like `status` would push past
+    `offset_cutoff`.
+    """
+    page_size = 15
+    ordering = ('-start_date', '-id')
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if len(ordering) == 1:
+            ordering += ('-id' if ordering[0].startswith('-') else 'id',)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'counts': self.view.get_status_counts(),
+            'results': data,
+        })
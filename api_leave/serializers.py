@@ -1,9 +1,19 @@
 from rest_framework import serializers
-from rest_framework.utils import timezone
+from django.utils import timezone
+from django.db import transaction
 
 
 from . import models as my_models
 from api_authentication.models import EmployeeModel
+from api_authentication.rosters import filter_to_team
+from api_sync.models import ChangeLogModel
+from api_sync.utils import record_changes
+from api_core.projection import Projection, date_representation, full_name_representation
+from api_audit.buffer import record_event, record_events
+from api_audit.models import AuditEventModel
+
+
+BULK_DECISION_MAX_ITEMS = 500
 
 
 class EmployeeLeaveRequestCreateSerializer(serializers.ModelSerializer):
@@ -20,8 +30,8 @@ class EmployeeLeaveRequestCreateSerializer(serializers.ModelSerializer):
         
         overlapping_requests = my_models.LeaveRequestModel.objects.filter(
             user=self.context['request'].user,
-            start_data__lte=attrs['start_date'],
-            end_date__gte=attrs['end_date']
+            start_date__lte=attrs['end_date'],
+            end_date__gte=attrs['start_date']
             )
         
         if overlapping_requests.exists():
@@ -48,6 +58,20 @@ class EmployeeLeaveRequestListSerializer(serializers.ModelSerializer):
         return obj.approved_by.get_full_name() if obj.approved_by else None
 
 
+# Lean equivalent of EmployeeLeaveRequestListSerializer for list endpoints (see api_core.projection).
+EMPLOYEE_LEAVE_REQUEST_LIST_PROJECTION = {
+    'id': Projection('id'),
+    'start_date': Projection('start_date', build=date_representation),
+    'end_date': Projection('end_date', build=date_representation),
+    'reason': Projection('reason'),
+    'status': Projection('status'),
+    'approved_by': Projection(
+        'approved_by_id', 'approved_by__first_name', 'approved_by__last_name',
+        build=full_name_representation,
+    ),
+}
+
+
 class EmployeeBasicInfoSerializer(serializers.ModelSerializer):
     class Meta:
         model = EmployeeModel
@@ -78,6 +102,41 @@ class TeamLeaveRequestSerializer(serializers.ModelSerializer):
             }
         
 
+class LeaveRequestFilterSerializer(serializers.Serializer):
+    """
+    Query parameters of the leave request lists, all optional: `status`, and
+    `since`/`until` to keep the requests whose leave overlaps those dates.
+    """
+    status = serializers.ChoiceField(choices=my_models.LeaveRequestModel.Status.choices, required=False)
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if 'since' in data and 'until' in data and data['since'] > data['until']:
+            raise serializers.ValidationError({"until": "Must not be before since."})
+        return data
+
+    def filter(self, queryset):
+        filters = self.validated_data
+        if 'status' in filters:
+            queryset = queryset.filter(status=filters['status'])
+        if 'until' in filters:
+            queryset = queryset.filter(start_date__lte=filters['until'])
+        if 'since' in filters:
+            queryset = queryset.filter(end_date__gte=filters['since'])
+        return queryset
+
+
+class TeamLeaveRequestFilterSerializer(LeaveRequestFilterSerializer):
+    """Adds `employee`: one team member's user id."""
+    employee = serializers.IntegerField(required=False)
+
+    def filter(self, queryset):
+        if 'employee' in self.validated_data:
+            queryset = queryset.filter(user_id=self.validated_data['employee'])
+        return super().filter(queryset)
+
+
 class ApproveEmployeeLeaveRequestSerializer(serializers.ModelSerializer):
     class Meta:
         model = my_models.LeaveRequestModel
@@ -92,6 +151,10 @@ class ApproveEmployeeLeaveRequestSerializer(serializers.ModelSerializer):
         instance.status = my_models.LeaveRequestModel.Status.APPROVED
         instance.approved_by = self.context['request'].user
         instance.save()
+        record_event(
+            AuditEventModel.Action.LEAVE_APPROVED, instance.approved_by,
+            AuditEventModel.Subject.LEAVE_REQUEST, instance.pk, instance.user_id,
+        )
 
         return instance
 
@@ -109,5 +172,88 @@ class RejectEmployeeLeaveRequestSerializer(serializers.ModelSerializer):
         instance.status = my_models.LeaveRequestModel.Status.REJECTED
         instance.approved_by = self.context['request'].user
         instance.save()
+        record_event(
+            AuditEventModel.Action.LEAVE_REJECTED, instance.approved_by,
+            AuditEventModel.Subject.LEAVE_REQUEST, instance.pk, instance.user_id,
+        )
+
+        return instance
+
+
+class LeaveDecisionSerializer(serializers.Serializer):
+    DECISION_CHOICES = (
+        ("APPROVE", "APPROVE"),
+        ("REJECT", "REJECT"),
+    )
+
+    id = serializers.IntegerField()
+    decision = serializers.ChoiceField(choices=DECISION_CHOICES)
+
+
+class BulkLeaveDecisionSerializer(serializers.Serializer):
+    """
+    Applies approve/reject decisions to many leave requests in one transaction.
+
+    The targeted rows are locked and read once, then each target status is applied
+    with a single set-based UPDATE guarded by status=PENDING. Managers can only
+    decide on their direct reports' requests; staff (as for IsAdminUser) on any request.
+
+    save() returns one outcome per id:
+        APPROVED / REJECTED:  The decision was applied.
+        NOT_PENDING:          The request was already decided (current status included).
+        NOT_FOUND:            No such request within the caller's team.
+    """
+    decisions = LeaveDecisionSerializer(many=True, allow_empty=False, max_length=BULK_DECISION_MAX_ITEMS)
+
+    def validate_decisions(self, value):
+        ids = [item['id'] for item in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each leave request can only appear once.")
+        return value
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+        decisions = {item['id']: item['decision'] for item in validated_data['decisions']}
+        Status = my_models.LeaveRequestModel.Status
+        target_status = {'APPROVE': Status.APPROVED, 'REJECT': Status.REJECTED}
+
+        with transaction.atomic():
+            queryset = my_models.LeaveRequestModel.objects.filter(pk__in=decisions.keys())
+            if not user.is_staff:
+                queryset = filter_to_team(queryset, user.pk)
+
+            current = {
+                pk: (status, owner_id)
+                for pk, status, owner_id in queryset.select_for_update().order_by().values_list('pk', 'status', 'user_id')
+            }
+
+            outcomes = []
+            transitions = {Status.APPROVED: [], Status.REJECTED: []}
+            for pk, decision in decisions.items():
+                if pk not in current:
+                    outcomes.append({'id': pk, 'outcome': 'NOT_FOUND', 'status': None})
+                elif current[pk][0] != Status.PENDING:
+                    outcomes.append({'id': pk, 'outcome': 'NOT_PENDING', 'status': current[pk][0]})
+                else:
+                    transitions[target_status[decision]].append(pk)
+                    outcomes.append({'id': pk, 'outcome': target_status[decision], 'status': target_status[decision]})
+
+            for new_status, ids in transitions.items():
+                if ids:
+                    my_models.LeaveRequestModel.objects.filter(pk__in=ids, status=Status.PENDING).update(
+                        status=new_status,
+                        approved_by=user,
+                    )
+
+            record_changes(
+                ChangeLogModel.Resource.LEAVE_REQUEST,
+                [(pk, current[pk][1]) for ids in transitions.values() for pk in ids],
+            )
+            audit_action = {Status.APPROVED: AuditEventModel.Action.LEAVE_APPROVED, Status.REJECTED: AuditEventModel.Action.LEAVE_REJECTED}
+            for new_status, ids in transitions.items():
+                record_events(
+                    audit_action[new_status], user, AuditEventModel.Subject.LEAVE_REQUEST,
+                    [(pk, current[pk][1]) for pk in ids], details={'bulk': True},
+                )
 
-        return instance    
\ No newline at end of file
+        return outcomes
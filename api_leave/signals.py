@@ -0,0 +1,11 @@
+from django.dispatch import receiver
+
+from api_sync.models import ChangeLogModel
+from api_sync.utils import changes_recorded
+from .counts import invalidate_status_counts
+
+
+@receiver(changes_recorded)
+def invalidate_leave_counts(sender, resource, rows, **kwargs):
+    if resource == ChangeLogModel.Resource.LEAVE_REQUEST:
+        invalidate_status_counts({owner_id for _, owner_id in rows})
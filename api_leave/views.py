@@ -1,11 +1,14 @@
 from django.shortcuts import render
-from rest_framework import generics, permissions, status, pagination, filters
+from rest_framework import generics, permissions, status, pagination
 from rest_framework_simplejwt import authentication
 from rest_framework.response import Response
 
 
 from . import models as my_models, serializers as my_serializers, permissions as my_permissions, pagination as my_pagination
-from api_authentication.models import EmployeeModel
+from .counts import status_counts
+from api_authentication.rosters import filter_to_team, team_user_ids
+from api_core.filters import StrictOrderingFilter
+from api_core.projection import FieldProjectionMixin
 
 
 class EmployeeLeaveRequestCreateView(generics.CreateAPIView):
@@ -31,35 +34,62 @@ class EmployeeLeaveRequestCreateView(generics.CreateAPIView):
         )
     
 
-class EmployeeLeaveRequestListView(generics.ListAPIView):
+class EmployeeLeaveRequestListView(FieldProjectionMixin, generics.ListAPIView):
+    """
+    The caller's leave requests, filtered by `status` and the `since`/`until`
+    range, with their per-status counts.
+    """
     permission_classes = [permissions.IsAuthenticated]
     authentication_classes = [authentication.JWTAuthentication]
     serializer_class = my_serializers.EmployeeLeaveRequestListSerializer
+    projection = my_serializers.EMPLOYEE_LEAVE_REQUEST_LIST_PROJECTION
     pagination_class = my_pagination.LeaveRequestPagination
+    read_from_replica = True
 
-    filter_backends = [filters.OrderingFilter]
-    ordering_fields = ['start_date', 'end_date', 'status']
-    ordering = ['-start_date', '-end_date']
+    filter_backends = [StrictOrderingFilter]
+    # Near-unique dates only: the cursor steps through ties by offset (see LeaveRequestPagination).
+    ordering_fields = ['start_date', 'end_date']
+    # Ties broken by id, which the (user, start_date) index already orders.
+    ordering = ['-start_date', '-id']
 
     def get_queryset(self):
-        return my_models.LeaveRequestModel.objects.filter(user=self.request.user)
+        self.params = my_serializers.LeaveRequestFilterSerializer(data=self.request.query_params)
+        self.params.is_valid(raise_exception=True)
+        return self.params.filter(my_models.LeaveRequestModel.objects.filter(user=self.request.user))
+
+    def get_status_counts(self):
+        return status_counts([self.request.user.pk])
 
 
 class TeamLeaveRequestView(generics.ListAPIView):
+    """
+    Managers: their direct reports' leave requests, filtered by `status`,
+    `employee` and the `since`/`until` range, with the team's (or that
+    employee's) per-status counts. `?status=PENDING` is the approval queue: the
+    (status, user, start_date) index finds each member's pending requests, and
+    merging them by date sorts only those rows.
+    """
     serializer_class = my_serializers.TeamLeaveRequestSerializer
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser | my_permissions.IsManager]
     pagination_class = my_pagination.LeaveRequestPagination
     authentication_classes = [authentication.JWTAuthentication]
+    read_from_replica = True
 
-
-    filter_backends = [filters.OrderingFilter]
-    ordering_fields = ['start_date', 'end_date', 'status']
-    ordering = ['-start_date', '-end_date']
+    filter_backends = [StrictOrderingFilter]
+    ordering_fields = ['start_date', 'end_date']
+    ordering = ['-start_date', '-id']
 
     def get_queryset(self):
-        current_employee = EmployeeModel.objects.get(user=self.request.user)
-        team_employee = EmployeeModel.objects.filter(manager=current_employee).values_list('user', flat=True)
-        return my_models.LeaveRequestModel.objects.filter(user__in=team_employee)
+        self.params = my_serializers.TeamLeaveRequestFilterSerializer(data=self.request.query_params)
+        self.params.is_valid(raise_exception=True)
+        return self.params.filter(filter_to_team(my_models.LeaveRequestModel.objects.all(), self.request.user.pk))
+
+    def get_status_counts(self):
+        user_ids = team_user_ids(self.request.user.pk).tolist()
+        employee = self.params.validated_data.get('employee')
+        if employee is not None:
+            user_ids = [employee] if employee in user_ids else []
+        return status_counts(user_ids)
     
 
 class ApproveEmployeeLeaveRequestView(generics.UpdateAPIView):
@@ -68,6 +98,7 @@ class ApproveEmployeeLeaveRequestView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser | my_permissions.IsManager]
     queryset = my_models.LeaveRequestModel.objects.all()
     lookup_field = 'pk'
+    lookup_url_kwarg = 'id'
 
     
 class RejectEmployeeLeaveRequestView(generics.UpdateAPIView):
@@ -75,4 +106,18 @@ class RejectEmployeeLeaveRequestView(generics.UpdateAPIView):
     authentication_classes = [authentication.JWTAuthentication]
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser | my_permissions.IsManager]
     queryset = my_models.LeaveRequestModel.objects.all()
-    lookup_field = 'pk'
\ No newline at end of file
+    lookup_field = 'pk'
+    lookup_url_kwarg = 'id'
+
+
+class BulkLeaveDecisionView(generics.GenericAPIView):
+    serializer_class = my_serializers.BulkLeaveDecisionSerializer
+    authentication_classes = [authentication.JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser | my_permissions.IsManager]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        outcomes = serializer.save()
+
+        return Response({'results': outcomes}, status=status.HTTP_200_OK)
@@ -0,0 +1,90 @@
+import numpy as np
+
+from .columnar import ColumnStore
+
+
+# Queries over the memory-mapped months of columnar.ColumnStore between `since` and
+# `until` ('YYYY-MM', inclusive). Counts and sums run month by month on the mapped
+# arrays; percentiles gather only the department and duration columns.
+DEFAULT_HOUR_BINS = (0, 2, 4, 6, 8, 9, 10, 12, 16, 24)
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+
+def _hours(seconds):
+    return np.round(np.asarray(seconds, dtype=np.float64) / 3600, 2)
+
+
+def hours_distribution(store=None, bins=DEFAULT_HOUR_BINS, since=None, until=None):
+    """Number of shifts by length, in the hour `bins`; longer shifts count in the last bin."""
+    store = store or ColumnStore()
+    edges = np.asarray(bins, dtype=np.int64) * 3600
+    edges[-1] = np.iinfo(np.int32).max
+    counts = np.zeros(len(bins) - 1, dtype=np.int64)
+    for _, columns in store.partitions(since, until):
+        counts += np.histogram(columns['duration'], bins=edges)[0]
+    return {'bins': list(bins), 'counts': counts.tolist()}
+
+
+def department_hours(store=None, since=None, until=None):
+    """Shifts and hours worked per department and month."""
+    store = store or ColumnStore()
+    departments = store.manifest()['departments']
+    rows = []
+    for name, columns in store.partitions(since, until):
+        shifts = np.bincount(columns['department'], minlength=len(departments))
+        seconds = np.bincount(columns['department'], weights=columns['duration'], minlength=len(departments))
+        for code in np.flatnonzero(shifts):
+            rows.append({
+                'month': name, 'department': departments[code],
+                'shifts': int(shifts[code]), 'hours': float(_hours(seconds[code])),
+            })
+    return rows
+
+
+def department_percentiles(store=None, percentiles=DEFAULT_PERCENTILES, since=None, until=None):
+    """Shift length percentiles in hours per department."""
+    store = store or ColumnStore()
+    departments = store.manifest()['departments']
+    parts = [(columns['department'], columns['duration']) for _, columns in store.partitions(since, until)]
+    if not parts:
+        return {}
+
+    codes = np.concatenate([codes for codes, _ in parts])
+    durations = np.concatenate([durations for _, durations in parts])
+    order = np.argsort(codes, kind='stable')
+    codes, durations = codes[order], durations[order]
+    boundaries = np.flatnonzero(np.diff(codes)) + 1
+
+    result = {}
+    for group_codes, group in zip(np.split(codes, boundaries), np.split(durations, boundaries)):
+        values = _hours(np.percentile(group, percentiles))
+        result[departments[group_codes[0]]] = {f'p{p}': float(value) for p, value in zip(percentiles, values)}
+    return result
+
+
+def lateness_by_month(store=None, start_minute=9 * 60, grace_minutes=0, since=None, until=None):
+    """
+    Per month: employee-days, how many started late (first clock-in of the local
+    day after `start_minute` + `grace_minutes`), and the mean minutes late of those.
+    """
+    store = store or ColumnStore()
+    rows = []
+    for name, columns in store.partitions(since, until):
+        if not len(columns['start']):
+            continue
+        # First shift of each (user, local day): sort by user, day, start and
+        # keep the rows where (user, day) changes.
+        order = np.lexsort((columns['start'], columns['local_day'], columns['user_id']))
+        users, days = columns['user_id'][order], columns['local_day'][order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (users[1:] != users[:-1]) | (days[1:] != days[:-1])
+
+        minutes_late = columns['local_minute'][order][first].astype(np.int32) - start_minute
+        late = minutes_late > grace_minutes
+        rows.append({
+            'month': name,
+            'employee_days': int(first.sum()),
+            'late_days': int(late.sum()),
+            'mean_minutes_late': float(np.round(minutes_late[late].mean(), 1)) if late.any() else 0.0,
+        })
+    return rows
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ApiReportsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'api_reports'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,189 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
+from array import array
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Min
+from django.utils import timezone
+
+from api_authentication.models import EmployeeModel
+from api_timesheet import sharding
+from api_timesheet.models import TimesheetModel
+from .reports import iter_chunks
+
+
+DEFAULT_ANALYTICS_STORE_DIR = settings.BASE_DIR / 'analytics'
+# A month is exported once it ended this long ago, leaving time for late
+# clock-outs and for scan_timesheets to close forgotten shifts.
+DEFAULT_ANALYTICS_CLOSE_DELAY_DAYS = 2
+
+# One .npy file per column and month, one row per closed shift, ordered by start.
+COLUMNS = {
+    'user_id': np.int32,
+    'start': np.int64,          # clock-in, seconds since the epoch
+    'duration': np.int32,       # seconds worked
+    'department': np.int16,     # index into the manifest's department list; 0 is none
+    'local_day': np.int32,      # clock-in date in TIME_ZONE, days since 1970-01-01
+    'local_minute': np.int16,   # clock-in minute of the day in TIME_ZONE
+}
+
+EPOCH_DATE = datetime.date(1970, 1, 1)
+
+
+def month_name(year, month):
+    return f'{year:04d}-{month:02d}'
+
+
+def month_bounds(year, month):
+    """Start and end of a calendar month in TIME_ZONE, as reports count it."""
+    return (
+        timezone.make_aware(datetime.datetime(year, month, 1)),
+        timezone.make_aware(datetime.datetime(year + month // 12, month % 12 + 1, 1)),
+    )
+
+
+class ColumnStore:
+    """
+    Memory-mapped columnar copy of closed months of timesheets, under
+    `<ANALYTICS_STORE_DIR>/timesheets/<YYYY-MM>/<column>.npy`.
+
+    `manifest.json` lists the exported months and the department names the codes
+    refer to; it is replaced atomically after a month is written, so readers see
+    a month either completely or not at all. Reads map the files read-only and
+    never copy them.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root or getattr(settings, 'ANALYTICS_STORE_DIR', DEFAULT_ANALYTICS_STORE_DIR)) / 'timesheets'
+
+    @property
+    def manifest_path(self):
+        return self.root / 'manifest.json'
+
+    def manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'departments': [''], 'partitions': {}}
+
+    def write_manifest(self, manifest):
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=self.root, suffix='.json')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(path, self.manifest_path)
+
+    def load(self, name, rows):
+        if not rows:
+            # numpy cannot map an empty array.
+            return {column: np.empty(0, dtype) for column, dtype in COLUMNS.items()}
+        return {column: np.load(self.root / name / f'{column}.npy', mmap_mode='r') for column in COLUMNS}
+
+    def partitions(self, since=None, until=None):
+        """Yields (month name, {column: array}) in month order, `since`/`until` as 'YYYY-MM' inclusive."""
+        for name, info in sorted(self.manifest()['partitions'].items()):
+            if (since is None or name >= since) and (until is None or name <= until):
+                yield name, self.load(name, info['rows'])
+
+    def write_partition(self, name, columns):
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.root, prefix=f'.{name}-'))
+        for column, values in columns.items():
+            np.save(staging / f'{column}.npy', values)
+        target = self.root / name
+        if not target.exists():
+            os.rename(staging, target)
+            return
+        # Move the old month aside rather than deleting it first, so a failed
+        # swap leaves it in place. Open maps of the old files stay valid after
+        # they are unlinked.
+        aside = staging.with_name(f'{staging.name}-old')
+        os.rename(target, aside)
+        try:
+            os.rename(staging, target)
+        except OSError:
+            os.rename(aside, target)
+            shutil.rmtree(staging)
+            raise
+        shutil.rmtree(aside)
+
+
+class TimesheetColumnExporter:
+    """
+    Exports closed months of closed shifts into a ColumnStore. Months already in
+    the store are skipped unless `rebuild` is set, so a daily run only adds the
+    month that closed since. Departments are the employees' current ones.
+    """
+
+    def __init__(self, store=None, now=None, close_delay=None):
+        self.store = store or ColumnStore()
+        self.now = now or timezone.now()
+        self.close_delay = close_delay or datetime.timedelta(
+            days=getattr(settings, 'ANALYTICS_CLOSE_DELAY_DAYS', DEFAULT_ANALYTICS_CLOSE_DELAY_DAYS)
+        )
+
+    def closed_months(self):
+        starts = [
+            TimesheetModel.objects.using(using).aggregate(first=Min('clock_in_time'))['first']
+            for using in sharding.shard_aliases() or [None]
+        ]
+        starts = [start for start in starts if start is not None]
+        if not starts:
+            return []
+
+        first = timezone.localtime(min(starts))
+        year, month = first.year, first.month
+        months = []
+        while month_bounds(year, month)[1] <= self.now - self.close_delay:
+            months.append((year, month))
+            year, month = year + month // 12, month % 12 + 1
+        return months
+
+    def export(self, months=None, rebuild=False):
+        """Exports `months` ((year, month) pairs; default every closed month); returns the names written."""
+        manifest = self.store.manifest()
+        codes = {department: code for code, department in enumerate(manifest['departments'])}
+        departments = {
+            user_id: codes.setdefault(department or '', len(codes))
+            for user_id, department in EmployeeModel.objects.values_list('user_id', 'department')
+        }
+        manifest['departments'] = list(codes)
+
+        written = []
+        for year, month in months or self.closed_months():
+            name = month_name(year, month)
+            if name in manifest['partitions'] and not rebuild:
+                continue
+            columns = self.read_month(year, month, departments)
+            self.store.write_partition(name, columns)
+            manifest['partitions'][name] = {'rows': len(columns['start']), 'exported_at': self.now.isoformat()}
+            self.store.write_manifest(manifest)
+            written.append(name)
+        return written
+
+    def read_month(self, year, month, departments):
+        start, end = month_bounds(year, month)
+        values = {column: array(np.dtype(dtype).char) for column, dtype in COLUMNS.items()}
+        for using in sharding.shard_aliases() or [None]:
+            queryset = TimesheetModel.objects.using(using).filter(
+                clock_in_time__gte=start, clock_in_time__lt=end, working_hours__isnull=False,
+            )
+            for user_id, clock_in_time, working_hours in iter_chunks(queryset, 'clock_in_time', ('user_id', 'clock_in_time', 'working_hours')):
+                local = timezone.localtime(clock_in_time)
+                values['user_id'].append(user_id)
+                values['start'].append(int(clock_in_time.timestamp()))
+                values['duration'].append(int(working_hours.total_seconds()))
+                values['department'].append(departments.get(user_id, 0))
+                values['local_day'].append((local.date() - EPOCH_DATE).days)
+                values['local_minute'].append(local.hour * 60 + local.minute)
+
+        columns = {column: np.frombuffer(values[column], dtype=dtype) for column, dtype in COLUMNS.items()}
+        # Shards are each read in order; merge them.
+        order = np.argsort(columns['start'], kind='stable')
+        return {column: array_[order] for column, array_ in columns.items()}
@@ -0,0 +1,189 @@
+import datetime
+from collections import defaultdict
+from functools import partial
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from api_authentication.models import EmployeeModel
+from api_timesheet import sharding
+from api_timesheet.models import TimesheetModel
+from api_leave.models import LeaveRequestModel
+
+
+# Cached aggregates are recomputed at least once per bucket (this also rolls "today"/"this week").
+DASHBOARD_BUCKET_SECONDS = 300
+# A metric touched by a clock or leave event is recomputed at most this often.
+DASHBOARD_MIN_REFRESH_SECONDS = 10
+UPCOMING_ABSENCE_DAYS = 14
+
+METRICS = (
+    'headcount',
+    'hours_today',
+    'hours_this_week',
+    'clocked_in',
+    'pending_leave',
+    'upcoming_absences',
+)
+TIMESHEET_METRICS = ('hours_today', 'hours_this_week', 'clocked_in')
+LEAVE_METRICS = ('pending_leave', 'upcoming_absences')
+
+# Timesheets and leave requests reach the department through the owner's employee profile.
+DEPARTMENT = F('user__employeemodel__department')
+
+
+def _grouped(queryset, aggregate):
+    return {row['department']: row['value'] for row in queryset.values('department').annotate(value=aggregate).order_by()}
+
+
+def _timesheets_grouped(condition, aggregate, combine):
+    """
+    `aggregate` over the timesheets matching `condition`, per department. Sharded
+    timesheets cannot be joined to employees, so each shard aggregates per user in
+    parallel and `combine` folds the per-user values of a department into one.
+    """
+    if not sharding.sharding_enabled():
+        return _grouped(TimesheetModel.objects.filter(condition).annotate(department=DEPARTMENT), aggregate)
+
+    def per_user(alias):
+        return list(
+            TimesheetModel.objects.using(alias).filter(condition)
+            .values('user_id').annotate(value=aggregate).order_by()
+            .values_list('user_id', 'value')
+        )
+
+    departments = dict(EmployeeModel.objects.values_list('user_id', 'department'))
+    values = defaultdict(list)
+    for rows in sharding.fan_out(per_user).values():
+        for user_id, value in rows:
+            values[departments.get(user_id)].append(value)
+    return {department: combine(department_values) for department, department_values in values.items()}
+
+
+def _hours(condition):
+    totals = _timesheets_grouped(
+        condition & Q(working_hours__isnull=False),
+        Sum('working_hours'),
+        partial(sum, start=datetime.timedelta()),
+    )
+    return {department: round(total.total_seconds() / 3600, 2) for department, total in totals.items() if total}
+
+
+def compute_headcount(now):
+    return _grouped(EmployeeModel.objects.all(), Count('pk'))
+
+
+def compute_hours_today(now):
+    start = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    return _hours(Q(clock_in_time__gte=start))
+
+
+def compute_hours_this_week(now):
+    today = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    start = today - datetime.timedelta(days=today.weekday())
+    return _hours(Q(clock_in_time__gte=start))
+
+
+def compute_clocked_in(now):
+    # Per user the distinct count is 1, so summing gives the department's count.
+    return _timesheets_grouped(
+        Q(clock_in_time__isnull=False, clock_out_time__isnull=True),
+        Count('user', distinct=True),
+        sum,
+    )
+
+
+def compute_pending_leave(now):
+    return _grouped(
+        LeaveRequestModel.objects.filter(
+            status=LeaveRequestModel.Status.PENDING,
+        ).annotate(department=DEPARTMENT),
+        Count('pk'),
+    )
+
+
+def compute_upcoming_absences(now):
+    today = timezone.localdate(now)
+    return _grouped(
+        LeaveRequestModel.objects.filter(
+            status=LeaveRequestModel.Status.APPROVED,
+            start_date__lte=today + datetime.timedelta(days=UPCOMING_ABSENCE_DAYS),
+            end_date__gte=today,
+        ).annotate(department=DEPARTMENT),
+        Count('user', distinct=True),
+    )
+
+
+METRIC_FUNCTIONS = {
+    'headcount': compute_headcount,
+    'hours_today': compute_hours_today,
+    'hours_this_week': compute_hours_this_week,
+    'clocked_in': compute_clocked_in,
+    'pending_leave': compute_pending_leave,
+    'upcoming_absences': compute_upcoming_absences,
+}
+
+
+def _bucket(now):
+    return int(now.timestamp()) // DASHBOARD_BUCKET_SECONDS
+
+
+def _metric_key(metric, bucket):
+    return f"department_dashboard_{metric}_{bucket}"
+
+
+def _dirty_key(metric):
+    return f"department_dashboard_{metric}_dirty"
+
+
+def mark_dirty(metrics):
+    """
+    Flags metrics for recomputation after a clock or leave event. Only the flagged
+    metrics are recomputed, and no more than once per DASHBOARD_MIN_REFRESH_SECONDS.
+    """
+    now = timezone.now()
+    cache.set_many({_dirty_key(metric): now for metric in metrics}, DASHBOARD_BUCKET_SECONDS * 2)
+
+
+def _is_stale(entry, dirty_at, now):
+    if entry is None:
+        return True
+    if dirty_at is None or dirty_at < entry['computed_at']:
+        return False
+    return (now - entry['computed_at']).total_seconds() >= DASHBOARD_MIN_REFRESH_SECONDS
+
+
+def get_department_dashboard(now=None):
+    """
+    Returns one row per department with all dashboard metrics.
+
+    Each metric is one grouped query across all departments, cached per time
+    bucket; a request recomputes only metrics that are missing for the current
+    bucket or have been flagged dirty by an event since they were computed.
+    """
+    now = now or timezone.now()
+    bucket = _bucket(now)
+    keys = {metric: _metric_key(metric, bucket) for metric in METRICS}
+    cached = cache.get_many(list(keys.values()) + [_dirty_key(metric) for metric in METRICS])
+
+    values = {}
+    refreshed = {}
+    for metric in METRICS:
+        entry = cached.get(keys[metric])
+        if _is_stale(entry, cached.get(_dirty_key(metric)), now):
+            entry = {'computed_at': now, 'data': METRIC_FUNCTIONS[metric](now)}
+            refreshed[keys[metric]] = entry
+        values[metric] = entry['data']
+
+    if refreshed:
+        cache.set_many(refreshed, DASHBOARD_BUCKET_SECONDS * 2)
+
+    departments = set()
+    for data in values.values():
+        departments.update(data)
+
+    return [
+        {'department': department, **{metric: values[metric].get(department, 0) for metric in METRICS}}
+        for department in sorted(departments, key=lambda department: (department is None, department or ''))
+    ]
@@ -0,0 +1,138 @@
+import datetime
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ReportJobModel
+from .reports import REPORTS
+
+
+logger = logging.getLogger(__name__)
+
+# Report jobs run on this many threads per web process, apart from the request threads.
+DEFAULT_REPORT_WORKERS = 2
+# A finished report is handed out again for identical parameters for this long.
+DEFAULT_REPORT_CACHE_SECONDS = 3600
+# A job still RUNNING after this long is assumed lost with its worker and requeued.
+DEFAULT_REPORT_JOB_TIMEOUT_SECONDS = 1800
+# Lookup-then-create rounds submit() tries before settling for the latest job.
+SUBMIT_ATTEMPTS = 3
+
+Status = ReportJobModel.Status
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'REPORT_WORKERS', DEFAULT_REPORT_WORKERS),
+                    thread_name_prefix='report-worker',
+                )
+    return _executor
+
+
+def parameters_hash(report, parameters):
+    encoded = json.dumps([report, parameters], sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def reusable_job(digest):
+    fresh_after = timezone.now() - datetime.timedelta(
+        seconds=getattr(settings, 'REPORT_CACHE_SECONDS', DEFAULT_REPORT_CACHE_SECONDS)
+    )
+    return ReportJobModel.objects.filter(parameters_hash=digest).filter(
+        Q(status__in=[Status.PENDING, Status.RUNNING]) | Q(status=Status.SUCCEEDED, finished_at__gte=fresh_after)
+    ).defer('result').first()
+
+
+def submit(report, parameters, user):
+    """
+    Returns (job, created). A queued, running or recently finished job with the
+    same report and parameters is returned instead of generating it again;
+    otherwise a new job is saved and handed to the worker pool on commit.
+    """
+    digest = parameters_hash(report, parameters)
+    for _ in range(SUBMIT_ATTEMPTS):
+        existing = reusable_job(digest)
+        if existing is not None:
+            return existing, False
+
+        try:
+            with transaction.atomic():
+                job = ReportJobModel.objects.create(report=report, parameters=parameters, parameters_hash=digest, requested_by=user)
+        except IntegrityError:
+            # An identical job was submitted since the lookup; the unique constraint
+            # on active jobs kept it the only one. Look again: it may also have
+            # failed since, which frees the constraint for a new job.
+            continue
+        transaction.on_commit(partial(enqueue, job.pk))
+        return job, True
+
+    # Still racing other submitters: hand out the latest job, whatever its state.
+    return ReportJobModel.objects.filter(parameters_hash=digest).defer('result').latest('created_at'), False
+
+
+def enqueue(job_id):
+    _get_executor().submit(_run_in_worker, job_id)
+
+
+def _run_in_worker(job_id):
+    close_old_connections()
+    try:
+        run_job(job_id)
+    except Exception:
+        logger.exception("Report job %s could not be run", job_id)
+    finally:
+        close_old_connections()
+
+
+def run_job(job_id):
+    """
+    Claims a PENDING job and generates its report. Returns False when the job was
+    not pending, e.g. because another worker claimed it first.
+    """
+    claimed = ReportJobModel.objects.filter(pk=job_id, status=Status.PENDING).update(
+        status=Status.RUNNING, started_at=timezone.now(),
+    )
+    if not claimed:
+        return False
+
+    job = ReportJobModel.objects.only('report', 'parameters').get(pk=job_id)
+    try:
+        result = REPORTS[job.report](**job.parameters)
+    except Exception as e:
+        logger.exception("Report job %s failed", job_id)
+        ReportJobModel.objects.filter(pk=job_id).update(status=Status.FAILED, error=str(e), finished_at=timezone.now())
+    else:
+        ReportJobModel.objects.filter(pk=job_id).update(
+            status=Status.SUCCEEDED, result=result, row_count=len(result['rows']), finished_at=timezone.now(),
+        )
+    return True
+
+
+def requeue_stale_jobs():
+    """Puts jobs whose worker died mid-run back in the queue; returns how many."""
+    cutoff = timezone.now() - datetime.timedelta(
+        seconds=getattr(settings, 'REPORT_JOB_TIMEOUT_SECONDS', DEFAULT_REPORT_JOB_TIMEOUT_SECONDS)
+    )
+    return ReportJobModel.objects.filter(status=Status.RUNNING, started_at__lt=cutoff).update(
+        status=Status.PENDING, started_at=None,
+    )
+
+
+def pending_job_ids():
+    return list(ReportJobModel.objects.filter(status=Status.PENDING).order_by('created_at').values_list('pk', flat=True))
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api_reports.columnar import TimesheetColumnExporter
+
+
+class Command(BaseCommand):
+    help = (
+        "Export closed months of timesheets to the columnar analytics store "
+        "(ANALYTICS_STORE_DIR). Months already exported are skipped, so a daily run "
+        "only adds newly closed months."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', action='append', default=None, help="YYYY-MM to export; repeatable. Defaults to every closed month.")
+        parser.add_argument('--rebuild', action='store_true', help="Export months again even if they are in the store.")
+
+    def handle(self, *args, **options):
+        months = None
+        if options['month']:
+            try:
+                months = [tuple(int(part) for part in month.split('-')) for month in options['month']]
+            except ValueError:
+                raise CommandError("--month must be YYYY-MM.")
+            if not all(len(month) == 2 and 1 <= month[1] <= 12 for month in months):
+                raise CommandError("--month must be YYYY-MM.")
+
+        started = time.perf_counter()
+        exporter = TimesheetColumnExporter()
+        written = exporter.export(months, rebuild=options['rebuild'])
+        manifest = exporter.store.manifest()['partitions']
+        for name in written:
+            self.stdout.write(f"  {name}: {manifest[name]['rows']:,} shifts")
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {len(written)} months in {time.perf_counter() - started:.1f}s to {exporter.store.root}."
+        ))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api_reports import jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued report jobs in this process: jobs left PENDING by a restarted "
+        "web worker, and RUNNING jobs older than REPORT_JOB_TIMEOUT_SECONDS. With "
+        "--interval, keep polling, as a dedicated report worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=None, help="Keep polling, waiting this many seconds when the queue is empty.")
+
+    def handle(self, *args, **options):
+        while True:
+            requeued = jobs.requeue_stale_jobs()
+            if requeued:
+                self.stdout.write(f"Requeued {requeued} stale jobs.")
+
+            for job_id in jobs.pending_job_ids():
+                started = time.perf_counter()
+                if jobs.run_job(job_id):
+                    self.stdout.write(f"Ran report job {job_id} in {time.perf_counter() - started:.2f}s")
+
+            if options['interval'] is None:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-19 16:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJobModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report', models.CharField(choices=[('DEPARTMENT_MONTHLY_HOURS', 'Department monthly hours'), ('ANNUAL_LEAVE_SUMMARY', 'Annual leave summary')], max_length=40)),
+                ('parameters', models.JSONField(default=dict)),
+                ('parameters_hash', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('SUCCEEDED', 'Succeeded'), ('FAILED', 'Failed')], default='PENDING', max_length=20)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('row_count', models.PositiveIntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['parameters_hash', 'status'], name='api_reports_paramet_e0fbed_idx'), models.Index(fields=['created_at'], name='api_reports_created_5e1d38_idx')],
+            },
+        ),
+    ]
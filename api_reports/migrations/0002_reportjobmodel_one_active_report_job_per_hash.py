@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 17:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_reports', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='reportjobmodel',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['PENDING', 'RUNNING'])), fields=('parameters_hash',), name='one_active_report_job_per_hash'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class ReportJobModel(models.Model):
+    """
+    A report requested through the report job API and generated in the background.
+
+    Fields:
+        report (CharField): Which report to generate (see reports.REPORTS).
+        parameters (JSONField): The report's validated parameters.
+        parameters_hash (CharField): SHA-256 of report and parameters, used to reuse
+            the result of an identical, recent job instead of generating it again.
+        status (CharField): PENDING, RUNNING, SUCCEEDED or FAILED.
+        requested_by (ForeignKey): The admin who submitted the job.
+        result (JSONField): Column names and rows of the finished report.
+        row_count (PositiveIntegerField): Number of result rows.
+        error (TextField): Why the job failed.
+        created_at, started_at, finished_at (DateTimeField): Job lifecycle times.
+
+    Meta:
+        Adds an index on (parameters_hash, status) for the reuse lookup and on
+        created_at for the job list. At most one job per parameters_hash can be
+        PENDING or RUNNING, so concurrent identical submissions share one job.
+    """
+    class Report(models.TextChoices):
+        DEPARTMENT_MONTHLY_HOURS = "DEPARTMENT_MONTHLY_HOURS", "Department monthly hours"
+        ANNUAL_LEAVE_SUMMARY = "ANNUAL_LEAVE_SUMMARY", "Annual leave summary"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        SUCCEEDED = "SUCCEEDED", "Succeeded"
+        FAILED = "FAILED", "Failed"
+
+    report = models.CharField(max_length=40, choices=Report.choices)
+    parameters = models.JSONField(default=dict)
+    parameters_hash = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    result = models.JSONField(null=True, blank=True)
+    row_count = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.get_report_display()} #{self.pk} ({self.get_status_display()})'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['parameters_hash', 'status']),
+            models.Index(fields=['created_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['parameters_hash'],
+                condition=models.Q(status__in=['PENDING', 'RUNNING']),
+                name='one_active_report_job_per_hash',
+            ),
+        ]
+
+        ordering = ['-created_at']
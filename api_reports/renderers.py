@@ -0,0 +1,21 @@
+import csv
+import io
+
+from rest_framework.renderers import BaseRenderer
+
+
+class ReportCSVRenderer(BaseRenderer):
+    """Renders a report result ({'columns': [...], 'rows': [...]}) as CSV."""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, dict) or 'rows' not in data:
+            # Errors are rendered as a one-column CSV of their messages.
+            data = {'columns': ['detail'], 'rows': [[data.get('detail', data) if isinstance(data, dict) else data]]}
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(data['columns'])
+        writer.writerows(data['rows'])
+        return output.getvalue().encode(self.charset)
@@ -0,0 +1,123 @@
+import datetime
+from collections import defaultdict
+
+from django.db.models import Q
+from django.utils import timezone
+
+from api_authentication.models import EmployeeModel
+from api_leave.models import LeaveRequestModel
+from api_timesheet import sharding
+from api_timesheet.models import TimesheetModel
+from .models import ReportJobModel
+
+
+REPORT_CHUNK_SIZE = 5000
+
+
+def iter_chunks(queryset, order_field, fields, chunk_size=REPORT_CHUNK_SIZE):
+    """
+    Yields `fields` tuples of `queryset` in (order_field, pk) order, one keyset page
+    of `chunk_size` rows per query, so memory stays bounded on large tables. An
+    index on `order_field` serves both the filter and the order.
+    """
+    queryset = queryset.order_by(order_field, 'pk')
+    # values_list() drops repeated names, so the keyset columns go after `fields`
+    # unless `fields` already has them.
+    names = list(dict.fromkeys([*fields, order_field, 'pk']))
+    order_index, pk_index = names.index(order_field), names.index('pk')
+    last = None
+    while True:
+        page = queryset
+        if last is not None:
+            value, pk = last
+            page = page.filter(Q(**{f'{order_field}__gt': value}) | Q(**{order_field: value, 'pk__gt': pk}))
+        chunk = list(page.values_list(*names)[:chunk_size])
+        if not chunk:
+            return
+        for row in chunk:
+            yield row[:len(fields)]
+        last = chunk[-1][order_index], chunk[-1][pk_index]
+
+
+def _employees(department=None):
+    employees = EmployeeModel.objects.select_related('user').order_by('department', 'user__username')
+    if department:
+        employees = employees.filter(department=department)
+    return {employee.user_id: employee for employee in employees}
+
+
+def department_monthly_hours(year, month, department=None):
+    """
+    Hours worked per employee in a calendar month (local time), by department.
+    Shifts count in the month they start in; open shifts are counted but add no
+    hours.
+    """
+    start = timezone.make_aware(datetime.datetime(year, month, 1))
+    end = timezone.make_aware(datetime.datetime(year + month // 12, month % 12 + 1, 1))
+    employees = _employees(department)
+
+    shifts = defaultdict(int)
+    hours = defaultdict(datetime.timedelta)
+    for using in sharding.shard_aliases() or [None]:
+        queryset = TimesheetModel.objects.using(using).filter(clock_in_time__gte=start, clock_in_time__lt=end)
+        for user_id, working_hours in iter_chunks(queryset, 'clock_in_time', ('user_id', 'working_hours')):
+            if user_id not in employees:
+                continue
+            shifts[user_id] += 1
+            if working_hours:
+                hours[user_id] += working_hours
+
+    rows = []
+    for user_id, employee in employees.items():
+        if user_id in shifts:
+            rows.append([
+                employee.department, str(employee.employee_id), employee.user.username,
+                employee.user.get_full_name(), shifts[user_id], round(hours[user_id].total_seconds() / 3600, 2),
+            ])
+    return {
+        'columns': ['department', 'employee_id', 'username', 'full_name', 'shifts', 'hours'],
+        'rows': rows,
+    }
+
+
+def annual_leave_summary(year, department=None):
+    """
+    Leave per employee in a calendar year: requests by status and leave days
+    (calendar days inside the year) approved and pending, next to the balance.
+    """
+    start = datetime.date(year, 1, 1)
+    end = datetime.date(year, 12, 31)
+    employees = _employees(department)
+
+    requests = defaultdict(lambda: defaultdict(int))
+    days = defaultdict(lambda: defaultdict(int))
+    queryset = LeaveRequestModel.objects.filter(start_date__lte=end, end_date__gte=start)
+    for user_id, start_date, end_date, status in iter_chunks(queryset, 'start_date', ('user_id', 'start_date', 'end_date', 'status')):
+        if user_id not in employees:
+            continue
+        requests[user_id][status] += 1
+        days[user_id][status] += (min(end_date, end) - max(start_date, start)).days + 1
+
+    Status = LeaveRequestModel.Status
+    rows = [
+        [
+            employee.department, str(employee.employee_id), employee.user.username, employee.user.get_full_name(),
+            employee.leave_balance, days[user_id][Status.APPROVED], days[user_id][Status.PENDING],
+            requests[user_id][Status.APPROVED], requests[user_id][Status.PENDING], requests[user_id][Status.REJECTED],
+        ]
+        for user_id, employee in employees.items()
+    ]
+    return {
+        'columns': [
+            'department', 'employee_id', 'username', 'full_name', 'leave_balance', 'approved_days',
+            'pending_days', 'approved_requests', 'pending_requests', 'rejected_requests',
+        ],
+        'rows': rows,
+    }
+
+
+# Generators are called with the parameters validated by serializers.PARAMETER_SERIALIZERS.
+REPORTS = {
+    ReportJobModel.Report.DEPARTMENT_MONTHLY_HOURS: department_monthly_hours,
+    ReportJobModel.Report.ANNUAL_LEAVE_SUMMARY: annual_leave_summary,
+}
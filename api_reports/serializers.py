@@ -0,0 +1,44 @@
+from rest_framework import serializers
+
+from . import models as my_models
+
+
+MIN_REPORT_YEAR = 2000
+MAX_REPORT_YEAR = 2100
+
+
+class DepartmentMonthlyHoursParametersSerializer(serializers.Serializer):
+    year = serializers.IntegerField(min_value=MIN_REPORT_YEAR, max_value=MAX_REPORT_YEAR)
+    month = serializers.IntegerField(min_value=1, max_value=12)
+    department = serializers.CharField(max_length=250, required=False)
+
+
+class AnnualLeaveSummaryParametersSerializer(serializers.Serializer):
+    year = serializers.IntegerField(min_value=MIN_REPORT_YEAR, max_value=MAX_REPORT_YEAR)
+    department = serializers.CharField(max_length=250, required=False)
+
+
+PARAMETER_SERIALIZERS = {
+    my_models.ReportJobModel.Report.DEPARTMENT_MONTHLY_HOURS: DepartmentMonthlyHoursParametersSerializer,
+    my_models.ReportJobModel.Report.ANNUAL_LEAVE_SUMMARY: AnnualLeaveSummaryParametersSerializer,
+}
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    parameters = serializers.DictField(required=False, default=dict)
+    requested_by = serializers.CharField(source='requested_by.username', read_only=True, default=None)
+
+    class Meta:
+        model = my_models.ReportJobModel
+        fields = [
+            'id', 'report', 'parameters', 'status', 'requested_by', 'row_count', 'error',
+            'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = ['status', 'row_count', 'error', 'created_at', 'started_at', 'finished_at']
+
+    def validate(self, data):
+        parameters = PARAMETER_SERIALIZERS[data['report']](data=data.get('parameters', {}))
+        if not parameters.is_valid():
+            raise serializers.ValidationError({'parameters': parameters.errors})
+        data['parameters'] = parameters.validated_data
+        return data
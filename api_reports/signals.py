@@ -0,0 +1,24 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from api_authentication.models import EmployeeModel
+from api_sync.models import ChangeLogModel
+from api_sync.utils import changes_recorded
+from .dashboard import METRICS, TIMESHEET_METRICS, LEAVE_METRICS, mark_dirty
+
+
+@receiver(changes_recorded)
+def refresh_activity_metrics(sender, resource, rows, **kwargs):
+    # Sent for single-row saves and deletes and for set-based updates such as bulk
+    # leave decisions and auto-closed shifts, which bypass model signals.
+    if resource == ChangeLogModel.Resource.TIMESHEET:
+        mark_dirty(TIMESHEET_METRICS)
+    elif resource == ChangeLogModel.Resource.LEAVE_REQUEST:
+        mark_dirty(LEAVE_METRICS)
+
+
+@receiver(post_save, sender=EmployeeModel)
+@receiver(post_delete, sender=EmployeeModel)
+def refresh_department_metrics(sender, instance, **kwargs):
+    # Headcount and department membership feed every metric.
+    mark_dirty(METRICS)
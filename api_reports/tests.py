@@ -0,0 +1,337 @@
+import datetime
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from api_authentication.models import EmployeeModel
+from api_leave.models import LeaveRequestModel
+from api_leave.serializers import BulkLeaveDecisionSerializer
+from api_timesheet.models import TimesheetModel
+from . import analytics, columnar, dashboard, jobs, reports
+from .columnar import ColumnStore, TimesheetColumnExporter
+from .models import ReportJobModel
+
+
+class ReportJobTests(TestCase):
+    # Timesheets go to their shards when TIMESHEET_SHARD_COUNT is set.
+    databases = {'default', *settings.TIMESHEET_SHARDS}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', is_staff=True)
+        cls.employees = []
+        for index, department in enumerate(['Engineering', 'Engineering', 'Sales']):
+            user = User.objects.create_user(f'employee{index}', first_name='Employee', last_name=str(index))
+            EmployeeModel.objects.create(user=user, department=department, leave_balance=20)
+            cls.employees.append(user)
+
+        start = timezone.make_aware(datetime.datetime(2026, 3, 1, 9))
+        for day in range(40):
+            for user in cls.employees[:2]:
+                clock_in = start + datetime.timedelta(days=day)
+                TimesheetModel.objects.create(user=user, clock_in_time=clock_in, clock_out_time=clock_in + datetime.timedelta(hours=8))
+
+        LeaveRequestModel.objects.create(
+            user=cls.employees[2], start_date=datetime.date(2026, 12, 30), end_date=datetime.date(2027, 1, 2),
+            reason='Holiday', status=LeaveRequestModel.Status.APPROVED,
+        )
+        LeaveRequestModel.objects.create(
+            user=cls.employees[2], start_date=datetime.date(2026, 6, 1), end_date=datetime.date(2026, 6, 2),
+            reason='Trip', status=LeaveRequestModel.Status.PENDING,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def submit(self, report, parameters):
+        # The worker pool is not started: jobs are run inline with run_job().
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post('/api/reports/jobs/', {'report': report, 'parameters': parameters}, format='json')
+        return response, callbacks
+
+    def test_job_lifecycle_and_download(self):
+        response, callbacks = self.submit('DEPARTMENT_MONTHLY_HOURS', {'year': 2026, 'month': 3})
+        self.assertEqual(response.status_code, 202, response.data)
+        self.assertEqual(response.data['status'], 'PENDING')
+        self.assertEqual(len(callbacks), 1)
+        job_id = response.data['id']
+
+        self.assertEqual(self.client.get(f'/api/reports/jobs/{job_id}/download/').status_code, 409)
+
+        self.assertTrue(jobs.run_job(job_id))
+        self.assertFalse(jobs.run_job(job_id))
+        self.assertEqual(self.client.get(f'/api/reports/jobs/{job_id}/').data['status'], 'SUCCEEDED')
+
+        result = self.client.get(f'/api/reports/jobs/{job_id}/download/').json()
+        self.assertEqual([row[2:] for row in result['rows']], [
+            ['employee0', 'Employee 0', 31, 248.0],
+            ['employee1', 'Employee 1', 31, 248.0],
+        ])
+
+        response = self.client.get(f'/api/reports/jobs/{job_id}/download/?format=csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        lines = response.content.decode().splitlines()
+        self.assertEqual(lines[0], 'department,employee_id,username,full_name,shifts,hours')
+        self.assertEqual(len(lines), 3)
+
+    def test_identical_parameters_reuse_the_job(self):
+        first, _ = self.submit('ANNUAL_LEAVE_SUMMARY', {'year': 2026, 'department': 'Sales'})
+        second, callbacks = self.submit('ANNUAL_LEAVE_SUMMARY', {'department': 'Sales', 'year': 2026})
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(callbacks, [])
+
+        jobs.run_job(first.data['id'])
+        job = ReportJobModel.objects.get(pk=first.data['id'])
+        self.assertEqual(job.result['rows'], [
+            ['Sales', str(self.employees[2].employeemodel.employee_id), 'employee2', 'Employee 2', 20.0, 2, 2, 1, 1, 0],
+        ])
+
+        third, _ = self.submit('ANNUAL_LEAVE_SUMMARY', {'year': 2026, 'department': 'Sales'})
+        self.assertEqual(third.data['id'], job.pk)
+        ReportJobModel.objects.filter(pk=job.pk).update(finished_at=timezone.now() - datetime.timedelta(days=1))
+        fourth, _ = self.submit('ANNUAL_LEAVE_SUMMARY', {'year': 2026, 'department': 'Sales'})
+        self.assertEqual(fourth.status_code, 202)
+
+    def test_concurrent_identical_submissions_share_one_job(self):
+        parameters = {'year': 2026, 'department': 'Sales'}
+        first, _ = self.submit('ANNUAL_LEAVE_SUMMARY', parameters)
+        digest = jobs.parameters_hash('ANNUAL_LEAVE_SUMMARY', parameters)
+        with transaction.atomic(), self.assertRaises(IntegrityError):
+            ReportJobModel.objects.create(report='ANNUAL_LEAVE_SUMMARY', parameters=parameters, parameters_hash=digest)
+
+        # A second request whose lookup ran before the first job was committed.
+        with mock.patch.object(jobs, 'reusable_job', side_effect=[None, jobs.reusable_job(digest)]):
+            second, callbacks = self.submit('ANNUAL_LEAVE_SUMMARY', parameters)
+        self.assertEqual((second.status_code, second.data['id']), (200, first.data['id']))
+        self.assertEqual(callbacks, [])
+        self.assertEqual(ReportJobModel.objects.count(), 1)
+
+    def test_submission_racing_a_job_that_fails(self):
+        parameters = {'year': 2026, 'department': 'Sales'}
+        first, _ = self.submit('ANNUAL_LEAVE_SUMMARY', parameters)
+        digest = jobs.parameters_hash('ANNUAL_LEAVE_SUMMARY', parameters)
+
+        # The active job fails between the rejected insert and the second lookup:
+        # nothing is reusable, but the constraint no longer blocks a new job.
+        lookups = []
+
+        def fail_first_job(digest):
+            lookups.append(digest)
+            if len(lookups) == 2:
+                ReportJobModel.objects.filter(pk=first.data['id']).update(status=ReportJobModel.Status.FAILED)
+            return None
+
+        with mock.patch.object(jobs, 'reusable_job', side_effect=fail_first_job):
+            second, callbacks = self.submit('ANNUAL_LEAVE_SUMMARY', parameters)
+        self.assertEqual(second.status_code, 202)
+        self.assertNotEqual(second.data['id'], first.data['id'])
+        self.assertEqual(len(callbacks), 1)
+
+        # Lookups that never see the active job still get it rather than nothing.
+        with mock.patch.object(jobs, 'reusable_job', return_value=None):
+            third, _ = self.submit('ANNUAL_LEAVE_SUMMARY', parameters)
+        self.assertEqual((third.status_code, third.data['id']), (200, second.data['id']))
+
+    def test_invalid_parameters_and_permissions(self):
+        response, _ = self.submit('DEPARTMENT_MONTHLY_HOURS', {'year': 2026, 'month': 13})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('month', response.data['parameters'])
+
+        self.client.force_authenticate(self.employees[0])
+        self.assertEqual(self.client.get('/api/reports/jobs/').status_code, 403)
+
+    def test_iter_chunks_pages_through_ties(self):
+        queryset = TimesheetModel.objects.for_user(self.employees[0])
+        rows = list(reports.iter_chunks(queryset, 'clock_in_time', ('id',), chunk_size=3))
+        self.assertEqual(sorted(rows), sorted(queryset.values_list('id')))
+        self.assertEqual(len(rows), 40)
+
+
+class TimesheetColumnStoreTests(TestCase):
+    databases = {'default', *settings.TIMESHEET_SHARDS}
+
+    @classmethod
+    def setUpTestData(cls):
+        engineer = User.objects.create_user('engineer')
+        EmployeeModel.objects.create(user=engineer, department='Engineering')
+        seller = User.objects.create_user('seller')
+        EmployeeModel.objects.create(user=seller, department='Sales')
+
+        def shift(user, day, hour, minute, hours):
+            clock_in = timezone.make_aware(datetime.datetime(2026, 3, day, hour, minute))
+            TimesheetModel.objects.create(user=user, clock_in_time=clock_in, clock_out_time=clock_in + datetime.timedelta(hours=hours))
+
+        for day in range(2, 12):
+            shift(engineer, day, 9, 0, 8)
+            # Late on odd days, with a second shift after lunch.
+            shift(seller, day, 9, 20 if day % 2 else 0, 4)
+            shift(seller, day, 14, 0, 3)
+        shift(seller, 30, 23, 0, 2)
+        # Open shifts and April (not closed yet on April 20th) are not exported.
+        TimesheetModel.objects.create(user=engineer, clock_in_time=timezone.make_aware(datetime.datetime(2026, 3, 20, 9)))
+        TimesheetModel.objects.create(
+            user=engineer, clock_in_time=timezone.make_aware(datetime.datetime(2026, 4, 1, 9)),
+            clock_out_time=timezone.make_aware(datetime.datetime(2026, 4, 1, 17)),
+        )
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = ColumnStore(directory.name)
+        self.now = timezone.make_aware(datetime.datetime(2026, 4, 20))
+
+    def test_export_is_incremental(self):
+        exporter = TimesheetColumnExporter(self.store, now=self.now)
+        self.assertEqual(exporter.export(), ['2026-03'])
+        self.assertEqual(exporter.export(), [])
+        self.assertEqual(TimesheetColumnExporter(self.store, now=self.now.replace(month=5, day=3)).export(), ['2026-04'])
+
+        name, columns = next(self.store.partitions())
+        self.assertEqual(name, '2026-03')
+        self.assertIsInstance(columns['start'], np.memmap)
+        self.assertEqual(len(columns['start']), 31)
+        self.assertTrue((columns['start'][1:] >= columns['start'][:-1]).all())
+
+    def test_analytics(self):
+        TimesheetColumnExporter(self.store, now=self.now).export()
+
+        distribution = analytics.hours_distribution(self.store, bins=(0, 4, 8, 24))
+        self.assertEqual(distribution['counts'], [11, 10, 10])
+
+        hours = {row['department']: row for row in analytics.department_hours(self.store)}
+        self.assertEqual((hours['Engineering']['shifts'], hours['Engineering']['hours']), (10, 80.0))
+        self.assertEqual((hours['Sales']['shifts'], hours['Sales']['hours']), (21, 72.0))
+
+        percentiles = analytics.department_percentiles(self.store, percentiles=(50,))
+        self.assertEqual(percentiles, {'Engineering': {'p50': 8.0}, 'Sales': {'p50': 3.0}})
+
+        [lateness] = analytics.lateness_by_month(self.store, grace_minutes=5)
+        self.assertEqual(lateness, {'month': '2026-03', 'employee_days': 21, 'late_days': 6, 'mean_minutes_late': 156.7})
+
+
+    def test_rebuild_replaces_the_month(self):
+        TimesheetColumnExporter(self.store, now=self.now).export()
+        clock_in = timezone.make_aware(datetime.datetime(2026, 3, 31, 9))
+        TimesheetModel.objects.create(
+            user=User.objects.get(username='engineer'), clock_in_time=clock_in, clock_out_time=clock_in + datetime.timedelta(hours=8),
+        )
+        self.assertEqual(TimesheetColumnExporter(self.store, now=self.now).export(rebuild=True), ['2026-03'])
+
+        self.assertEqual(len(dict(self.store.partitions())['2026-03']['start']), 32)
+        self.assertEqual(sorted(path.name for path in self.store.root.iterdir()), ['2026-03', 'manifest.json'])
+
+    def test_failed_swap_keeps_the_old_month(self):
+        TimesheetColumnExporter(self.store, now=self.now).export()
+        real_rename = columnar.os.rename
+
+        def rename(source, target):
+            # Fail swapping the new month in; moving the old one back works.
+            if Path(source).name.startswith('.') and not Path(source).name.endswith('-old'):
+                if not Path(target).name.startswith('.'):
+                    raise OSError('disk full')
+            real_rename(source, target)
+
+        with mock.patch.object(columnar.os, 'rename', rename), self.assertRaises(OSError):
+            TimesheetColumnExporter(self.store, now=self.now).export(rebuild=True)
+
+        self.assertEqual(len(dict(self.store.partitions())['2026-03']['start']), 31)
+        self.assertEqual(sorted(path.name for path in self.store.root.iterdir()), ['2026-03', 'manifest.json'])
+
+    def test_export_command_rejects_bad_months(self):
+        for month in ('2026-13', '2026-00', '2026', 'March'):
+            with self.subTest(month=month), self.assertRaisesMessage(CommandError, 'YYYY-MM'):
+                call_command('export_timesheet_columns', month=[month])
+
+class DepartmentDashboardTests(TestCase):
+    databases = {'default', *settings.TIMESHEET_SHARDS}
+
+    # The start of a cache bucket.
+    now = datetime.datetime(2026, 3, 2, 9, 0, tzinfo=datetime.timezone.utc)
+
+    @classmethod
+    def setUpTestData(cls):
+        for index, department in enumerate(['Engineering', 'Engineering', 'Sales']):
+            EmployeeModel.objects.create(user=User.objects.create_user(f'employee{index}'), department=department)
+
+    def setUp(self):
+        cache.clear()
+        self.computed = []
+        functions = {
+            metric: lambda now, metric=metric, compute=compute: self.computed.append(metric) or compute(now)
+            for metric, compute in dashboard.METRIC_FUNCTIONS.items()
+        }
+        patcher = mock.patch.dict(dashboard.METRIC_FUNCTIONS, functions)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def dashboard(self, seconds=0):
+        self.computed.clear()
+        return dashboard.get_department_dashboard(self.now + datetime.timedelta(seconds=seconds))
+
+    def test_cached_per_bucket(self):
+        rows = self.dashboard()
+        self.assertEqual(sorted(self.computed), sorted(dashboard.METRICS))
+        self.assertEqual([(row['department'], row['headcount']) for row in rows], [('Engineering', 2), ('Sales', 1)])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.dashboard(seconds=dashboard.DASHBOARD_BUCKET_SECONDS - 1), rows)
+        self.assertEqual(self.computed, [])
+
+        self.dashboard(seconds=dashboard.DASHBOARD_BUCKET_SECONDS)
+        self.assertEqual(sorted(self.computed), sorted(dashboard.METRICS))
+
+    def test_only_flagged_metrics_are_recomputed(self):
+        self.dashboard()
+        with mock.patch.object(dashboard.timezone, 'now', return_value=self.now + datetime.timedelta(seconds=1)):
+            dashboard.mark_dirty(dashboard.LEAVE_METRICS)
+        # Not before the minimum refresh interval has passed.
+        self.dashboard(seconds=dashboard.DASHBOARD_MIN_REFRESH_SECONDS - 1)
+        self.assertEqual(self.computed, [])
+        self.dashboard(seconds=dashboard.DASHBOARD_MIN_REFRESH_SECONDS)
+        self.assertEqual(sorted(self.computed), sorted(dashboard.LEAVE_METRICS))
+        self.dashboard(seconds=dashboard.DASHBOARD_MIN_REFRESH_SECONDS * 2)
+        self.assertEqual(self.computed, [])
+
+    def test_events_flag_the_metrics_they_affect(self):
+        user = User.objects.get(username='employee0')
+        TimesheetModel.objects.create(user=user, clock_in_time=self.now)
+        flagged = cache.get_many([dashboard._dirty_key(metric) for metric in dashboard.METRICS])
+        self.assertEqual(flagged.keys(), {dashboard._dirty_key(metric) for metric in dashboard.TIMESHEET_METRICS})
+
+        cache.clear()
+        LeaveRequestModel.objects.create(user=user, start_date=self.now.date(), end_date=self.now.date(), reason='Trip')
+        flagged = cache.get_many([dashboard._dirty_key(metric) for metric in dashboard.METRICS])
+        self.assertEqual(flagged.keys(), {dashboard._dirty_key(metric) for metric in dashboard.LEAVE_METRICS})
+
+    def test_bulk_leave_decisions_flag_leave_metrics(self):
+        # bulk_create and the decision's QuerySet.update() both bypass model signals.
+        user = User.objects.get(username='employee0')
+        leave_requests = LeaveRequestModel.objects.bulk_create([
+            LeaveRequestModel(user=user, start_date=self.now.date(), end_date=self.now.date(), reason='Trip'),
+        ])
+        cache.clear()
+
+        request = Request(APIRequestFactory().post('/'))
+        request.user = User.objects.create_user('staff', is_staff=True)
+        serializer = BulkLeaveDecisionSerializer(
+            data={'decisions': [{'id': leave_requests[0].pk, 'decision': 'APPROVE'}]}, context={'request': request},
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        flagged = cache.get_many([dashboard._dirty_key(metric) for metric in dashboard.METRICS])
+        self.assertEqual(flagged.keys(), {dashboard._dirty_key(metric) for metric in dashboard.LEAVE_METRICS})
@@ -0,0 +1,12 @@
+from django.urls import path
+
+
+from . import views as my_views
+
+
+urlpatterns = [
+    path('departments/dashboard/', my_views.DepartmentDashboardView.as_view(), name='department-dashboard'),
+    path('jobs/', my_views.ReportJobListCreateView.as_view(), name='report-job-list'),
+    path('jobs/<int:pk>/', my_views.ReportJobDetailView.as_view(), name='report-job-detail'),
+    path('jobs/<int:pk>/download/', my_views.ReportJobDownloadView.as_view(), name='report-job-download'),
+]
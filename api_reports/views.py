@@ -0,0 +1,72 @@
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+from . import dashboard, jobs
+from . import models as my_models, serializers as my_serializers
+from .renderers import ReportCSVRenderer
+from api_core.renderers import FastJSONRenderer
+
+
+class DepartmentDashboardView(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+    read_from_replica = True
+    request_priority = 'low'
+
+    def get(self, request, *args, **kwargs):
+        return Response({'departments': dashboard.get_department_dashboard()}, status=status.HTTP_200_OK)
+
+
+class ReportJobListCreateView(generics.ListCreateAPIView):
+    """
+    POST submits a report job and returns it with 202 Accepted; an identical job
+    that is queued, running or finished within REPORT_CACHE_SECONDS is returned
+    with 200 instead. GET lists recent jobs.
+    """
+    serializer_class = my_serializers.ReportJobSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+
+    def get_queryset(self):
+        return my_models.ReportJobModel.objects.select_related('requested_by').defer('result')
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job, created = jobs.submit(serializer.validated_data['report'], serializer.validated_data['parameters'], request.user)
+
+        return Response(
+            self.get_serializer(job).data,
+            status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK,
+        )
+
+
+class ReportJobDetailView(generics.RetrieveAPIView):
+    serializer_class = my_serializers.ReportJobSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+
+    def get_queryset(self):
+        return my_models.ReportJobModel.objects.select_related('requested_by').defer('result')
+
+
+class ReportJobDownloadView(generics.GenericAPIView):
+    """The finished report as JSON, or as CSV with `?format=csv`."""
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+    renderer_classes = [FastJSONRenderer, ReportCSVRenderer]
+    queryset = my_models.ReportJobModel.objects.all()
+
+    def get(self, request, *args, **kwargs):
+        job = self.get_object()
+        if job.status != my_models.ReportJobModel.Status.SUCCEEDED:
+            return Response(
+                {'detail': f"Report is not ready: {job.get_status_display().lower()}."},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        response = Response(job.result, status=status.HTTP_200_OK)
+        response['Content-Disposition'] = f'attachment; filename="{job.report.lower()}-{job.pk}.{request.accepted_renderer.format}"'
+        return response
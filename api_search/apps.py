@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ApiSearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'api_search'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,196 @@
+import abc
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.utils.module_loading import import_string
+
+
+DEFAULT_SEARCH_BACKEND = 'api_search.backends.SQLiteFTS5Backend'
+# Above this many matches, relevance ranking costs more than it is worth; results come newest first instead.
+DEFAULT_RANKED_MATCH_LIMIT = 20000
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+class BaseSearchBackend(abc.ABC):
+    """
+    Interface for full-text search backends.
+
+    Leave request documents are (id, reason) rows; employee documents are
+    (id, full_name, username, department, job_title) rows, where id is the
+    EmployeeModel primary key. Searches return ids ordered by relevance; callers
+    that already know the match count pass it as `total` so backends can pick a
+    cheaper order for very broad queries. Counts may stop early: a backend can
+    return any number above its ranking limit for a broader query.
+    """
+
+    @abc.abstractmethod
+    def index_leave_requests(self, rows):
+        ...
+
+    @abc.abstractmethod
+    def remove_leave_requests(self, ids):
+        ...
+
+    @abc.abstractmethod
+    def index_employees(self, rows):
+        ...
+
+    @abc.abstractmethod
+    def remove_employees(self, ids):
+        ...
+
+    @abc.abstractmethod
+    def count_leave_requests(self, query):
+        ...
+
+    @abc.abstractmethod
+    def search_leave_requests(self, query, offset, limit, total=None):
+        ...
+
+    @abc.abstractmethod
+    def count_employees(self, query):
+        ...
+
+    @abc.abstractmethod
+    def search_employees(self, query, offset, limit, total=None):
+        ...
+
+    @abc.abstractmethod
+    def clear(self):
+        ...
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    SQLite FTS5 backend. Documents live in two FTS5 virtual tables keyed by rowid,
+    ranked with bm25. Employee matches on names weigh more than on department or
+    job title.
+
+    Scoring has to visit every match, so queries matching more than
+    SEARCH_RANKED_MATCH_LIMIT documents are returned in rowid (newest first)
+    order, which FTS5 serves straight from the index. Counting stops there too:
+    a broader query counts as SEARCH_RANKED_MATCH_LIMIT + 1.
+    """
+    LEAVE_REQUEST_TABLE = 'api_search_leave_request_fts'
+    EMPLOYEE_TABLE = 'api_search_employee_fts'
+    EMPLOYEE_RANK = 'bm25(api_search_employee_fts, 10.0, 10.0, 2.0, 2.0)'
+
+    def __init__(self, using='default'):
+        self.using = using
+        self.ranked_match_limit = getattr(settings, 'SEARCH_RANKED_MATCH_LIMIT', DEFAULT_RANKED_MATCH_LIMIT)
+        self._schema_ready = False
+
+    @property
+    def connection(self):
+        connection = connections[self.using]
+        if connection.vendor != 'sqlite':
+            raise ImproperlyConfigured("SQLiteFTS5Backend requires an SQLite database.")
+        return connection
+
+    def cursor(self):
+        if not self._schema_ready:
+            self.ensure_schema()
+        return self.connection.cursor()
+
+    def ensure_schema(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.LEAVE_REQUEST_TABLE} "
+                "USING fts5(reason, tokenize='unicode61', prefix='2 3')"
+            )
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.EMPLOYEE_TABLE} "
+                "USING fts5(full_name, username, department, job_title, tokenize='unicode61', prefix='2 3')"
+            )
+        self._schema_ready = True
+
+    def build_match(self, query):
+        """
+        Turns free text into an FTS5 query: every word must match, the last one as
+        a prefix. Words are quoted so FTS5 operators in user input are inert.
+        """
+        tokens = TOKEN_PATTERN.findall(query or '')
+        if not tokens:
+            return None
+        return ' '.join(f'"{token}"' for token in tokens) + '*'
+
+    def _replace(self, table, columns, rows):
+        rows = list(rows)
+        if not rows:
+            return
+        placeholders = ', '.join(['%s'] * (len(columns) + 1))
+        with self.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {table} WHERE rowid = %s", [(row[0],) for row in rows])
+            cursor.executemany(
+                f"INSERT INTO {table} (rowid, {', '.join(columns)}) VALUES ({placeholders})",
+                [tuple(row) for row in rows],
+            )
+
+    def _remove(self, table, ids):
+        ids = list(ids)
+        if not ids:
+            return
+        with self.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {table} WHERE rowid = %s", [(pk,) for pk in ids])
+
+    def _count(self, table, query):
+        match = self.build_match(query)
+        if match is None:
+            return 0
+        with self.cursor() as cursor:
+            cursor.execute(
+                f"SELECT count(*) FROM (SELECT 1 FROM {table} WHERE {table} MATCH %s LIMIT %s)",
+                [match, self.ranked_match_limit + 1],
+            )
+            return cursor.fetchone()[0]
+
+    def _search(self, table, rank, query, offset, limit, total):
+        match = self.build_match(query)
+        if match is None:
+            return []
+        if total is not None and total > self.ranked_match_limit:
+            rank = 'rowid DESC'
+        with self.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {table} WHERE {table} MATCH %s ORDER BY {rank} LIMIT %s OFFSET %s",
+                [match, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def index_leave_requests(self, rows):
+        self._replace(self.LEAVE_REQUEST_TABLE, ['reason'], rows)
+
+    def remove_leave_requests(self, ids):
+        self._remove(self.LEAVE_REQUEST_TABLE, ids)
+
+    def index_employees(self, rows):
+        self._replace(self.EMPLOYEE_TABLE, ['full_name', 'username', 'department', 'job_title'], rows)
+
+    def remove_employees(self, ids):
+        self._remove(self.EMPLOYEE_TABLE, ids)
+
+    def count_leave_requests(self, query):
+        return self._count(self.LEAVE_REQUEST_TABLE, query)
+
+    def search_leave_requests(self, query, offset, limit, total=None):
+        return self._search(self.LEAVE_REQUEST_TABLE, 'rank', query, offset, limit, total)
+
+    def count_employees(self, query):
+        return self._count(self.EMPLOYEE_TABLE, query)
+
+    def search_employees(self, query, offset, limit, total=None):
+        return self._search(self.EMPLOYEE_TABLE, self.EMPLOYEE_RANK, query, offset, limit, total)
+
+    def clear(self):
+        with self.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.LEAVE_REQUEST_TABLE}")
+            cursor.execute(f"DELETE FROM {self.EMPLOYEE_TABLE}")
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    return import_string(getattr(settings, 'SEARCH_BACKEND', DEFAULT_SEARCH_BACKEND))()
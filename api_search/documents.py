@@ -0,0 +1,15 @@
+from api_authentication.models import EmployeeModel
+from api_leave.models import LeaveRequestModel
+
+
+def leave_request_rows(queryset=None):
+    queryset = LeaveRequestModel.objects.all() if queryset is None else queryset
+    return queryset.order_by('pk').values_list('pk', 'reason')
+
+
+def employee_rows(queryset=None):
+    queryset = EmployeeModel.objects.all() if queryset is None else queryset
+    for pk, first_name, last_name, username, department, job_title in queryset.order_by('pk').values_list(
+        'pk', 'user__first_name', 'user__last_name', 'user__username', 'department', 'job_title',
+    ):
+        yield (pk, f"{first_name} {last_name}".strip(), username, department or '', job_title or '')
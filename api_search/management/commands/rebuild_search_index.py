@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api_search.backends import get_search_backend
+from api_search.documents import employee_rows, leave_request_rows
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for leave requests and employees."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.clear()
+
+        self.index(backend.index_leave_requests, leave_request_rows().iterator(chunk_size=options['batch_size']), options['batch_size'], 'leave requests')
+        self.index(backend.index_employees, employee_rows(), options['batch_size'], 'employees')
+
+    def index(self, index_rows, rows, batch_size, label):
+        started = time.perf_counter()
+        indexed = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                index_rows(batch)
+                indexed += len(batch)
+                batch = []
+        index_rows(batch)
+        indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} {label} in {time.perf_counter() - started:.2f}s."))
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_index_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    from api_search.backends import SQLiteFTS5Backend
+
+    SQLiteFTS5Backend(using=schema_editor.connection.alias).ensure_schema()
+
+
+def drop_index_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    from api_search.backends import SQLiteFTS5Backend
+
+    schema_editor.execute(f"DROP TABLE IF EXISTS {SQLiteFTS5Backend.LEAVE_REQUEST_TABLE}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {SQLiteFTS5Backend.EMPLOYEE_TABLE}")
+
+
+class Migration(migrations.Migration):
+    """The FTS5 index tables aren't models; create them with the rest of the schema."""
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.RunPython(create_index_tables, drop_index_tables),
+    ]
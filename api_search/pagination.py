@@ -0,0 +1,32 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class SearchPagination(PageNumberPagination):
+    page_size = 20
+
+
+class SearchResults:
+    """
+    Lazy, sliceable view over a backend search so the standard paginator can page
+    it: the total comes from count(), and each page slice is one ranked query.
+    """
+    def __init__(self, count, search, query):
+        self._count = count
+        self._search = search
+        self.query = query
+        self._total = None
+
+    def count(self):
+        if self._total is None:
+            self._total = self._count(self.query)
+        return self._total
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            raise TypeError("SearchResults only supports slicing.")
+        start = index.start or 0
+        stop = self.count() if index.stop is None else index.stop
+        return self._search(self.query, start, max(stop - start, 0), total=self.count())
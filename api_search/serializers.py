@@ -0,0 +1,26 @@
+from rest_framework import serializers
+
+from api_authentication.models import EmployeeModel
+from api_leave.models import LeaveRequestModel
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(required=True, max_length=200)
+
+
+class LeaveRequestSearchSerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='user.username', read_only=True)
+
+    class Meta:
+        model = LeaveRequestModel
+        fields = ['id', 'username', 'start_date', 'end_date', 'reason', 'status']
+
+
+class EmployeeSearchSerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='user.username', read_only=True)
+    first_name = serializers.CharField(source='user.first_name', read_only=True)
+    last_name = serializers.CharField(source='user.last_name', read_only=True)
+
+    class Meta:
+        model = EmployeeModel
+        fields = ['employee_id', 'username', 'first_name', 'last_name', 'department', 'job_title', 'role']
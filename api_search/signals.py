@@ -0,0 +1,34 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.contrib.auth.models import User
+
+from api_authentication.models import EmployeeModel
+from api_leave.models import LeaveRequestModel
+from .backends import get_search_backend
+from .documents import employee_rows
+
+
+@receiver(post_save, sender=LeaveRequestModel)
+def index_leave_request(sender, instance, **kwargs):
+    get_search_backend().index_leave_requests([(instance.pk, instance.reason)])
+
+
+@receiver(post_delete, sender=LeaveRequestModel)
+def remove_leave_request(sender, instance, **kwargs):
+    get_search_backend().remove_leave_requests([instance.pk])
+
+
+@receiver(post_save, sender=EmployeeModel)
+def index_employee(sender, instance, **kwargs):
+    get_search_backend().index_employees(employee_rows(EmployeeModel.objects.filter(pk=instance.pk)))
+
+
+@receiver(post_save, sender=User)
+def index_employee_user(sender, instance, **kwargs):
+    # Names and usernames live on User.
+    get_search_backend().index_employees(employee_rows(EmployeeModel.objects.filter(user=instance)))
+
+
+@receiver(post_delete, sender=EmployeeModel)
+def remove_employee(sender, instance, **kwargs):
+    get_search_backend().remove_employees([instance.pk])
@@ -0,0 +1,87 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api_authentication.models import EmployeeModel
+from api_leave.models import LeaveRequestModel
+from .backends import SQLiteFTS5Backend, get_search_backend
+
+
+class SQLiteFTS5BackendTests(TestCase):
+    def setUp(self):
+        self.backend = SQLiteFTS5Backend()
+        self.backend.clear()
+
+    def test_match_quotes_every_word_and_prefixes_the_last(self):
+        self.assertEqual(self.backend.build_match('sick "leave" OR NEAR(x'), '"sick" "leave" "OR" "NEAR" "x"*')
+        self.assertIsNone(self.backend.build_match(' -* '))
+
+    def test_leave_requests_are_ranked_and_removable(self):
+        self.backend.index_leave_requests([
+            (1, 'Wedding of a cousin abroad, travelling for the whole week'),
+            (2, 'Wedding'),
+            (3, 'Doctor appointment'),
+        ])
+        self.assertEqual(self.backend.search_leave_requests('wedd', 0, 10), [2, 1])
+        self.assertEqual(self.backend.count_leave_requests('wedding'), 2)
+        self.assertEqual(self.backend.search_leave_requests('wedding', 1, 10), [1])
+
+        self.backend.index_leave_requests([(2, 'Dentist')])
+        self.backend.remove_leave_requests([1])
+        self.assertEqual(self.backend.search_leave_requests('wedding', 0, 10), [])
+        self.assertEqual(self.backend.search_leave_requests('dent', 0, 10), [2])
+
+    def test_employee_name_matches_outrank_department_matches(self):
+        self.backend.index_employees([
+            (1, 'Sam Jones', 'sjones', 'Sales', 'Sales lead'),
+            (2, 'Ada Sales', 'asales', 'Engineering', 'Developer'),
+        ])
+        self.assertEqual(self.backend.search_employees('sales', 0, 10), [2, 1])
+
+    def test_broad_queries_stop_counting_and_skip_ranking(self):
+        self.backend.ranked_match_limit = 2
+        self.backend.index_leave_requests([(pk, 'Family ' * pk) for pk in range(1, 6)])
+        total = self.backend.count_leave_requests('family')
+        self.assertEqual(total, 3)
+        # Newest first instead of bm25 (which would favour the most repeats).
+        self.assertEqual(self.backend.search_leave_requests('family', 0, 10, total=total), [5, 4, 3, 2, 1])
+
+
+class SearchViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', is_staff=True)
+        cls.employee = User.objects.create_user('employee', first_name='Grace', last_name='Hopper')
+        EmployeeModel.objects.create(user=cls.employee, department='Engineering')
+        start = datetime.date(2026, 7, 1)
+        cls.requests = [
+            LeaveRequestModel.objects.create(user=cls.employee, start_date=start, end_date=start, reason=reason)
+            for reason in ('Wedding', 'Wedding of a friend in another city', 'Moving house')
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_leave_requests_in_relevance_order(self):
+        # An id still indexed but no longer in the database is counted, then skipped.
+        get_search_backend().index_leave_requests([(10 ** 9, 'Wedding')])
+        response = self.client.get('/api/search/leave-requests/', {'q': 'wedding'})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual([row['id'] for row in response.data['results']], [self.requests[0].pk, self.requests[1].pk])
+        self.assertEqual(response.data['results'][0]['username'], 'employee')
+
+    def test_employees_are_indexed_from_user_changes(self):
+        self.employee.first_name = 'Ada'
+        self.employee.save()
+        response = self.client.get('/api/search/employees/', {'q': 'ada'})
+        self.assertEqual([row['username'] for row in response.data['results']], ['employee'])
+        self.assertEqual(self.client.get('/api/search/employees/', {'q': 'grace'}).data['results'], [])
+
+    def test_admin_only_and_query_required(self):
+        self.assertEqual(self.client.get('/api/search/employees/').status_code, 400)
+        self.client.force_authenticate(self.employee)
+        self.assertEqual(self.client.get('/api/search/employees/', {'q': 'ada'}).status_code, 403)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+
+from . import views as my_views
+
+
+urlpatterns = [
+    path('leave-requests/', my_views.LeaveRequestSearchView.as_view(), name='search-leave-requests'),
+    path('employees/', my_views.EmployeeSearchView.as_view(), name='search-employees'),
+]
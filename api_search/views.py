@@ -0,0 +1,49 @@
+from rest_framework import generics, permissions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+from . import serializers as my_serializers, pagination as my_pagination
+from .backends import get_search_backend
+from api_authentication.models import EmployeeModel
+from api_leave.models import LeaveRequestModel
+
+
+class SearchView(generics.GenericAPIView):
+    """
+    Pages the backend's ranked ids for `q` and returns those objects in that
+    order. Subclasses name the backend's `documents`: its count_<documents>()
+    and search_<documents>() methods serve the view.
+    """
+    documents = None
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+    pagination_class = my_pagination.SearchPagination
+    read_from_replica = True
+    request_priority = 'low'
+
+    def get(self, request, *args, **kwargs):
+        params = my_serializers.SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        backend = get_search_backend()
+        results = my_pagination.SearchResults(
+            getattr(backend, f'count_{self.documents}'), getattr(backend, f'search_{self.documents}'), params.validated_data['q'],
+        )
+        ids = self.paginate_queryset(results)
+        objects = self.get_queryset().in_bulk(ids)
+        # Keep the backend's relevance order; skip ids deleted since they were indexed.
+        page = [objects[pk] for pk in ids if pk in objects]
+
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+
+class LeaveRequestSearchView(SearchView):
+    serializer_class = my_serializers.LeaveRequestSearchSerializer
+    queryset = LeaveRequestModel.objects.select_related('user')
+    documents = 'leave_requests'
+
+
+class EmployeeSearchView(SearchView):
+    serializer_class = my_serializers.EmployeeSearchSerializer
+    queryset = EmployeeModel.objects.select_related('user')
+    documents = 'employees'
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import queue
+import threading
+from collections import defaultdict
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from api_timesheet.models import TimesheetModel
+from api_timesheet.sharding import fetch_by_ids
+from api_leave.models import LeaveRequestModel
+from .models import ChangeLogModel
+
+
+# Events buffered per subscriber before the stream is closed and the client has to resume with Last-Event-ID.
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+# Serializers are looked up by name on first use: this module is imported from
+# model signals at startup, before anything else needs DRF's serializer machinery.
+RESOURCE_SOURCES = {
+    ChangeLogModel.Resource.TIMESHEET: (TimesheetModel, 'TimesheetSyncSerializer'),
+    ChangeLogModel.Resource.LEAVE_REQUEST: (LeaveRequestModel, 'LeaveRequestSyncSerializer'),
+}
+
+
+class ChangeEvent:
+    def __init__(self, seq, resource, object_id, owner_id, operation, record):
+        self.seq = seq
+        self.resource = resource
+        self.object_id = object_id
+        self.owner_id = owner_id
+        self.operation = operation
+        self.record = record
+
+    @property
+    def name(self):
+        if self.resource == ChangeLogModel.Resource.LEAVE_REQUEST:
+            return 'leave_request'
+        if self.operation == ChangeLogModel.Operation.DELETE:
+            return 'timesheet_deleted'
+        return 'clock_out' if self.record and self.record['clock_out_time'] else 'clock_in'
+
+    def encode(self):
+        data = json.dumps({
+            'id': self.object_id,
+            'user': self.owner_id,
+            'operation': self.operation,
+            'record': self.record,
+        }, cls=DjangoJSONEncoder)
+        return f"id: {self.seq}\nevent: {self.name}\ndata: {data}\n\n"
+
+
+def build_events(entries):
+    """
+    Turns change log entries into events, loading and serializing each changed
+    record once with one query per resource.
+    """
+    from . import serializers as my_serializers
+
+    records = {}
+    for resource, (model, serializer_name) in RESOURCE_SOURCES.items():
+        serializer_class = getattr(my_serializers, serializer_name)
+        ids = [
+            entry.object_id for entry in entries
+            if entry.resource == resource and entry.operation == ChangeLogModel.Operation.UPSERT
+        ]
+        if ids:
+            queryset = fetch_by_ids(model.objects.all(), ids)
+            records.update({(resource, row['id']): row for row in serializer_class(queryset, many=True).data})
+
+    return [
+        ChangeEvent(
+            seq=entry.seq,
+            resource=entry.resource,
+            object_id=entry.object_id,
+            owner_id=entry.owner_id,
+            operation=entry.operation,
+            record=records.get((entry.resource, entry.object_id)),
+        )
+        for entry in sorted(entries, key=lambda entry: entry.seq)
+    ]
+
+
+class Subscription:
+    """
+    A subscriber's event queue. Pass the event loop of an async consumer to wait
+    with `aget()` without holding a thread; publishers wake it from their own thread.
+    """
+    def __init__(self, owner_ids, maxsize=SUBSCRIBER_QUEUE_SIZE, loop=None):
+        self.owner_ids = frozenset(owner_ids)
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._loop = loop
+        self._ready = asyncio.Event() if loop is not None else None
+
+    def put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._ready.set)
+            except RuntimeError:
+                # The consumer's loop is closed; it has gone away.
+                pass
+
+    def get(self, timeout):
+        return self._queue.get(timeout=timeout)
+
+    async def aget(self, timeout):
+        while True:
+            try:
+                return self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._ready.clear()
+            # Re-check after clearing so an event put in between is not missed.
+            try:
+                return self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except TimeoutError:
+                raise queue.Empty from None
+
+
+class ChangeBroker:
+    """
+    In-process pub/sub for change events.
+
+    Subscriptions are indexed by owner id, so publishing an event is one dict
+    lookup plus one queue put per interested subscriber, and records are only
+    loaded when somebody is listening for their owner.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, owner_ids, loop=None):
+        subscription = Subscription(owner_ids, loop=loop)
+        with self._lock:
+            for owner_id in subscription.owner_ids:
+                self._subscriptions[owner_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for owner_id in subscription.owner_ids:
+                subscribers = self._subscriptions.get(owner_id)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[owner_id]
+
+    def has_subscribers(self, owner_id):
+        return owner_id in self._subscriptions
+
+    def publish(self, entries):
+        entries = [entry for entry in entries if self.has_subscribers(entry.owner_id)]
+        if not entries:
+            return
+
+        for event in build_events(entries):
+            with self._lock:
+                subscribers = list(self._subscriptions.get(event.owner_id, ()))
+            for subscription in subscribers:
+                subscription.put(event)
+
+
+broker = ChangeBroker()
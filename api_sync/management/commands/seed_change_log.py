@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from api_timesheet import sharding
+from api_timesheet.models import TimesheetModel
+from api_leave.models import LeaveRequestModel
+from api_sync.models import ChangeLogModel
+from api_sync.utils import record_changes
+
+
+class Command(BaseCommand):
+    help = "Seed the sync change log with every existing timesheet and leave request, so a sync from 0 is a full bootstrap."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        # Sharded timesheets are read one shard at a time.
+        timesheets = [TimesheetModel.objects.using(alias) for alias in sharding.shard_aliases()] or [TimesheetModel.objects.all()]
+        sources = [
+            (ChangeLogModel.Resource.TIMESHEET, timesheets),
+            (ChangeLogModel.Resource.LEAVE_REQUEST, [LeaveRequestModel.objects.all()]),
+        ]
+
+        for resource, querysets in sources:
+            seeded = 0
+            batch = []
+            for queryset in querysets:
+                for row in queryset.order_by('pk').values_list('pk', 'user_id').iterator(chunk_size=batch_size):
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        record_changes(resource, batch)
+                        seeded += len(batch)
+                        batch = []
+            record_changes(resource, batch)
+            seeded += len(batch)
+
+            self.stdout.write(self.style.SUCCESS(f"Seeded {seeded} {resource} change entries."))
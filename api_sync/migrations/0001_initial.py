@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 16:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogModel',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('resource', models.CharField(choices=[('TIMESHEET', 'Timesheet'), ('LEAVE_REQUEST', 'Leave request')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('operation', models.CharField(choices=[('UPSERT', 'Upsert'), ('DELETE', 'Delete')], max_length=10)),
+                ('changed_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', 'seq'], name='api_sync_ch_owner_i_ef347d_idx'), models.Index(fields=['resource', 'object_id'], name='api_sync_ch_resourc_449423_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class ChangeLogModel(models.Model):
+    """
+    Change feed for timesheets and leave requests, used by delta-sync clients.
+
+    Fields:
+        seq (BigAutoField): Monotonic change sequence number, used as the sync token.
+        resource (CharField): The kind of record that changed (TIMESHEET, LEAVE_REQUEST).
+        object_id (BigIntegerField): Primary key of the changed record.
+        owner (ForeignKey): The user the changed record belongs to.
+        operation (CharField): UPSERT for creates/updates, DELETE for tombstones.
+        changed_at (DateTimeField): When the change was recorded.
+
+    Notes:
+        - Only the latest entry per (resource, object_id) is kept, so a sync from
+          token T returns each changed record once, and the table is bounded by the
+          number of records rather than the number of edits.
+        - owner is not a database constraint so tombstones survive user deletion.
+
+    Meta:
+        Adds an index on (owner, seq) so "changes since T" for a user or a team is
+        an index range scan, and on (resource, object_id) for compaction.
+    """
+    class Resource(models.TextChoices):
+        TIMESHEET = "TIMESHEET", "Timesheet"
+        LEAVE_REQUEST = "LEAVE_REQUEST", "Leave request"
+
+    class Operation(models.TextChoices):
+        UPSERT = "UPSERT", "Upsert"
+        DELETE = "DELETE", "Delete"
+
+    seq = models.BigAutoField(primary_key=True)
+    resource = models.CharField(max_length=20, choices=Resource.choices)
+    object_id = models.BigIntegerField()
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='+',
+    )
+    operation = models.CharField(max_length=10, choices=Operation.choices)
+    changed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'seq']),
+            models.Index(fields=['resource', 'object_id']),
+        ]
@@ -0,0 +1,11 @@
+from rest_framework.permissions import BasePermission
+
+class IsManager(BasePermission):
+    def has_permission(self, request, view):
+        return (
+            request.user.is_authenticated
+            and hasattr(request.user, 'employee')
+            and request.user.employee.role == 'MANAGER'
+            )
+
+
@@ -0,0 +1,31 @@
+from rest_framework import serializers
+
+from api_timesheet.models import TimesheetModel
+from api_leave.models import LeaveRequestModel
+
+
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_PAGE_SIZE = 1000
+
+
+class ChangeSyncQuerySerializer(serializers.Serializer):
+    SCOPE_CHOICES = (
+        ("me", "me"),
+        ("team", "team"),
+    )
+
+    since = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(min_value=1, max_value=SYNC_MAX_PAGE_SIZE, default=SYNC_PAGE_SIZE)
+    scope = serializers.ChoiceField(choices=SCOPE_CHOICES, default="me")
+
+
+class TimesheetSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TimesheetModel
+        fields = ['id', 'user', 'clock_in_time', 'clock_out_time', 'working_hours']
+
+
+class LeaveRequestSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LeaveRequestModel
+        fields = ['id', 'user', 'start_date', 'end_date', 'reason', 'status', 'approved_by']
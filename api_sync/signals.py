@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from api_timesheet.models import TimesheetModel
+from api_leave.models import LeaveRequestModel
+from .models import ChangeLogModel
+from .utils import record_change
+
+
+@receiver(post_save, sender=TimesheetModel)
+def record_timesheet_upsert(sender, instance, **kwargs):
+    record_change(ChangeLogModel.Resource.TIMESHEET, instance.pk, instance.user_id)
+
+
+@receiver(post_delete, sender=TimesheetModel)
+def record_timesheet_delete(sender, instance, **kwargs):
+    record_change(ChangeLogModel.Resource.TIMESHEET, instance.pk, instance.user_id, ChangeLogModel.Operation.DELETE)
+
+
+@receiver(post_save, sender=LeaveRequestModel)
+def record_leave_request_upsert(sender, instance, **kwargs):
+    record_change(ChangeLogModel.Resource.LEAVE_REQUEST, instance.pk, instance.user_id)
+
+
+@receiver(post_delete, sender=LeaveRequestModel)
+def record_leave_request_delete(sender, instance, **kwargs):
+    record_change(ChangeLogModel.Resource.LEAVE_REQUEST, instance.pk, instance.user_id, ChangeLogModel.Operation.DELETE)
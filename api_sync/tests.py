@@ -0,0 +1,241 @@
+import asyncio
+import datetime
+import json
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api_authentication.models import EmployeeModel
+from api_authentication.tokens import RevocableAccessToken
+from api_leave.models import LeaveRequestModel
+from api_timesheet.models import TimesheetModel
+from .broker import ChangeBroker, Subscription, broker
+from .models import ChangeLogModel
+
+
+SYNC_URL = '/api/sync/changes/'
+STREAM_URL = '/api/sync/team/stream/'
+
+
+class ChangeSyncTests(TestCase):
+    databases = {'default', *settings.TIMESHEET_SHARDS}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user('manager')
+        cls.user = User.objects.create_user('employee')
+        cls.outsider = User.objects.create_user('outsider')
+        EmployeeModel.objects.create(user=cls.user, manager=EmployeeModel.objects.create(user=cls.manager))
+        EmployeeModel.objects.create(user=cls.outsider)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def leave_request(self, user=None, days=0):
+        start = datetime.date(2026, 7, 1) + datetime.timedelta(days=days)
+        return LeaveRequestModel.objects.create(user=user or self.user, start_date=start, end_date=start, reason='Trip')
+
+    def sync(self, **params):
+        response = self.client.get(SYNC_URL, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    @override_settings(SYNC_SETTLE_SECONDS=0)
+    def test_upserts_and_tombstones_since_a_token(self):
+        timesheet = TimesheetModel.objects.create(user=self.user, clock_in_time=timezone.now())
+        kept, deleted = self.leave_request(), self.leave_request(days=10)
+        deleted_id = deleted.pk
+        deleted.delete()
+        self.leave_request(user=self.outsider)
+
+        data = self.sync()
+        self.assertEqual([row['id'] for row in data['timesheets']['upserts']], [timesheet.pk])
+        self.assertEqual([row['id'] for row in data['leave_requests']['upserts']], [kept.pk])
+        self.assertEqual(data['leave_requests']['deletes'], [deleted_id])
+        self.assertFalse(data['has_more'])
+
+        again = self.sync(since=data['next_since'])
+        self.assertEqual((again['timesheets']['upserts'], again['leave_requests']['upserts']), ([], []))
+        self.assertEqual(again['next_since'], data['next_since'])
+
+        kept.reason = 'Wedding'
+        kept.save()
+        self.assertEqual(self.sync(since=data['next_since'])['leave_requests']['upserts'][0]['reason'], 'Wedding')
+
+    @override_settings(SYNC_SETTLE_SECONDS=0)
+    def test_paging_and_team_scope(self):
+        requests = [self.leave_request(days=10 * index) for index in range(3)]
+        self.leave_request(user=self.outsider)
+
+        first = self.sync(limit=2)
+        self.assertTrue(first['has_more'])
+        second = self.sync(limit=2, since=first['next_since'])
+        self.assertFalse(second['has_more'])
+        synced = first['leave_requests']['upserts'] + second['leave_requests']['upserts']
+        self.assertEqual([row['id'] for row in synced], [request.pk for request in requests])
+
+        self.client.force_authenticate(self.manager)
+        team = self.sync(scope='team')
+        self.assertEqual([row['id'] for row in team['leave_requests']['upserts']], [request.pk for request in requests])
+
+    def test_recent_changes_hold_the_cursor(self):
+        # `late` gets the lower seq but its transaction commits after `early`'s.
+        late = self.leave_request()
+        late_entry = ChangeLogModel.objects.get(object_id=late.pk)
+        late_seq = late_entry.seq
+        late_entry.delete()
+        early = self.leave_request(days=10)
+
+        data = self.sync()
+        self.assertEqual([row['id'] for row in data['leave_requests']['upserts']], [early.pk])
+        self.assertEqual(data['next_since'], 0)
+        self.assertFalse(data['has_more'])
+
+        late_entry.seq = late_seq
+        late_entry.save(force_insert=True)
+        data = self.sync(since=data['next_since'])
+        self.assertEqual([row['id'] for row in data['leave_requests']['upserts']], [late.pk, early.pk])
+
+        ChangeLogModel.objects.update(changed_at=timezone.now() - datetime.timedelta(minutes=5))
+        self.assertEqual(self.sync()['next_since'], ChangeLogModel.objects.get(object_id=early.pk).seq)
+
+
+class ChangeBrokerTests(TestCase):
+    databases = {'default', *settings.TIMESHEET_SHARDS}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('employee')
+        cls.other = User.objects.create_user('other')
+
+    def leave_request(self, user):
+        start = datetime.date(2026, 7, 1)
+        request = LeaveRequestModel.objects.create(user=user, start_date=start, end_date=start, reason='Trip')
+        return request, ChangeLogModel.objects.get(object_id=request.pk)
+
+    def test_events_reach_only_subscribers_of_their_owner(self):
+        changes = ChangeBroker()
+        subscription = changes.subscribe([self.user.pk])
+        request, entry = self.leave_request(self.user)
+        _, other_entry = self.leave_request(self.other)
+
+        changes.publish([entry, other_entry])
+        event = subscription.get(timeout=0)
+        self.assertEqual((event.seq, event.name, event.record['id']), (entry.seq, 'leave_request', request.pk))
+        self.assertTrue(subscription._queue.empty())
+
+        changes.unsubscribe(subscription)
+        self.assertFalse(changes.has_subscribers(self.user.pk))
+        with self.assertNumQueries(0):
+            changes.publish([entry])
+
+    def test_full_queue_marks_the_subscription_overflowed(self):
+        subscription = Subscription([self.user.pk], maxsize=1)
+        subscription.put('first')
+        self.assertFalse(subscription.overflowed)
+        subscription.put('second')
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual(subscription.get(timeout=0), 'first')
+
+
+class TeamActivityStreamTests(TestCase):
+    databases = {'default', *settings.TIMESHEET_SHARDS}
+
+    @classmethod
+    def setUpTestData(cls):
+        # IsManager can never pass (it reads `user.employee`), so managers here are staff.
+        cls.manager = User.objects.create_user('manager', is_staff=True)
+        cls.user = User.objects.create_user('employee')
+        cls.outsider = User.objects.create_user('outsider')
+        EmployeeModel.objects.create(user=cls.user, manager=EmployeeModel.objects.create(user=cls.manager))
+        EmployeeModel.objects.create(user=cls.outsider)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def leave_request(self, user=None, days=0):
+        start = datetime.date(2026, 7, 1) + datetime.timedelta(days=days)
+        return LeaveRequestModel.objects.create(user=user or self.user, start_date=start, end_date=start, reason='Trip')
+
+    def open_stream(self, **headers):
+        response = self.client.get(STREAM_URL, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.addCleanup(response.close)
+        chunks = iter(response.streaming_content)
+        self.assertEqual(next(chunks), b'retry: 3000\n\n')
+        return chunks
+
+    def parse(self, chunk):
+        fields = dict(line.split(': ', 1) for line in chunk.decode().strip().split('\n'))
+        return fields.get('id'), fields['event'], json.loads(fields['data'])
+
+    def test_missed_changes_are_replayed_before_live_events(self):
+        first = self.leave_request()
+        since = ChangeLogModel.objects.get(object_id=first.pk).seq
+        missed = self.leave_request(days=10)
+        self.leave_request(user=self.outsider)
+
+        chunks = self.open_stream(last_event_id=str(since))
+        seq, name, data = self.parse(next(chunks))
+        self.assertEqual((int(seq), name, data['id']), (ChangeLogModel.objects.get(object_id=missed.pk).seq, 'leave_request', missed.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            live = self.leave_request(days=20)
+        self.assertEqual(self.parse(next(chunks))[2]['id'], live.pk)
+
+    def test_too_many_missed_changes_reset_the_client(self):
+        self.leave_request()
+        self.leave_request(days=10)
+        with mock.patch('api_sync.views.STREAM_REPLAY_LIMIT', 1):
+            chunks = self.open_stream(last_event_id='0')
+            seq, name, data = self.parse(next(chunks))
+        self.assertEqual((seq, name, data['since']), (None, 'reset', 0))
+        self.assertEqual(data['sync'], '/api/sync/changes/?scope=team&since=0')
+        self.assertEqual(list(chunks), [])
+        self.assertFalse(broker.has_subscribers(self.user.pk))
+
+    async def test_stream_is_served_asynchronously_under_asgi(self):
+        first = await sync_to_async(self.leave_request)()
+        since = (await ChangeLogModel.objects.aget(object_id=first.pk)).seq
+        missed = await sync_to_async(self.leave_request)(days=10)
+        token = await sync_to_async(RevocableAccessToken.for_user)(self.manager)
+
+        response = await AsyncClient().get(
+            STREAM_URL, headers={'authorization': f'Bearer {token}', 'last-event-id': str(since)},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        chunks = aiter(response)
+        self.assertEqual(await anext(chunks), b'retry: 3000\n\n')
+        self.assertEqual(self.parse(await anext(chunks))[2]['id'], missed.pk)
+
+        # A live event wakes the waiting stream without a thread parked on the queue.
+        pending = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0)
+        live = await sync_to_async(self.leave_request)(days=20)
+        entry = await ChangeLogModel.objects.aget(object_id=live.pk)
+        await sync_to_async(broker.publish)([entry])
+        self.assertEqual(self.parse(await asyncio.wait_for(pending, 5))[2]['id'], live.pk)
+
+        # A disconnect cancels the pending read, which ends the subscription.
+        pending = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertFalse(broker.has_subscribers(self.user.pk))
+
+    def test_managers_only_and_integer_event_ids(self):
+        self.assertEqual(self.client.get(STREAM_URL, headers={'last-event-id': 'x'}).status_code, 400)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(STREAM_URL).status_code, 403)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+
+from . import views as my_views
+
+
+urlpatterns = [
+    path('changes/', my_views.ChangeSyncView.as_view(), name='sync-changes'),
+    path('team/stream/', my_views.TeamActivityStreamView.as_view(), name='team-activity-stream'),
+]
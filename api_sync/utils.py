@@ -0,0 +1,44 @@
+from functools import partial
+
+from django.db import transaction
+from django.dispatch import Signal
+
+from .broker import broker
+from .models import ChangeLogModel
+
+
+# Sent by record_changes() with `resource` and the (object_id, owner_id) `rows`, so
+# caches of a user's data can follow single saves and set-based updates alike.
+changes_recorded = Signal()
+
+
+def record_change(resource, object_id, owner_id, operation=ChangeLogModel.Operation.UPSERT):
+    return record_changes(resource, [(object_id, owner_id)], operation)
+
+
+def record_changes(resource, rows, operation=ChangeLogModel.Operation.UPSERT):
+    """
+    Append change entries for (object_id, owner_id) rows, replacing older entries
+    for the same records.
+
+    Model signals cover single-row saves and deletes; call this directly after
+    set-based updates (QuerySet.update) which bypass signals. The new entries are
+    published to live subscribers once the surrounding transaction commits.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+
+    with transaction.atomic():
+        ChangeLogModel.objects.filter(
+            resource=resource,
+            object_id__in=[object_id for object_id, _ in rows],
+        ).delete()
+        entries = ChangeLogModel.objects.bulk_create([
+            ChangeLogModel(resource=resource, object_id=object_id, owner_id=owner_id, operation=operation)
+            for object_id, owner_id in rows
+        ])
+        transaction.on_commit(partial(broker.publish, entries))
+        changes_recorded.send(sender=ChangeLogModel, resource=resource, rows=rows)
+
+    return entries
@@ -0,0 +1,234 @@
+import asyncio
+import datetime
+import json
+import queue
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+from . import models as my_models, serializers as my_serializers, permissions as my_permissions
+from .broker import broker, build_events
+from api_authentication.rosters import filter_to_team, team_user_ids
+from api_timesheet.models import TimesheetModel
+from api_timesheet.sharding import fetch_by_ids
+from api_leave.models import LeaveRequestModel
+
+
+# Longest a transaction that records a change may stay open. Sequence numbers are
+# taken at insert, not at commit, so an entry younger than this may still be
+# joined by lower-numbered entries committing late; next_since stops before it.
+DEFAULT_SYNC_SETTLE_SECONDS = 30
+# Seconds between keep-alive comments on an idle event stream.
+STREAM_HEARTBEAT_SECONDS = 15
+# Reconnect delay suggested to EventSource clients.
+STREAM_RETRY_MILLISECONDS = 3000
+# Maximum number of missed changes replayed on reconnect. Clients further behind
+# get a `reset` event instead and must resync through the sync endpoint.
+STREAM_REPLAY_LIMIT = 1000
+
+
+class ChangeSyncView(generics.GenericAPIView):
+    """
+    Returns everything that changed after the `since` token for the caller's own
+    records (scope=me) or their direct reports' records (scope=team).
+
+    Changes are paged by sequence number: clients store `next_since` and pass it
+    back as `since` until `has_more` is false.
+
+    Entries recorded in the last SYNC_SETTLE_SECONDS are returned but not passed
+    by `next_since`, so they come again on the next call (upserts and deletes
+    are idempotent) along with any lower-numbered change that committed since.
+    A page that reaches them ends the sync with `has_more` false.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    request_priority = 'low'
+
+    def get(self, request, *args, **kwargs):
+        params = my_serializers.ChangeSyncQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        since = params.validated_data['since']
+        limit = params.validated_data['limit']
+
+        entries = list(
+            self.get_change_log(params.validated_data['scope'])
+            .filter(seq__gt=since)
+            .order_by('seq')
+            .values_list('seq', 'resource', 'object_id', 'operation', 'changed_at')[:limit + 1]
+        )
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+
+        settle_seconds = getattr(settings, 'SYNC_SETTLE_SECONDS', DEFAULT_SYNC_SETTLE_SECONDS)
+        settled_before = timezone.now() - datetime.timedelta(seconds=settle_seconds)
+        next_since = since
+        for seq, _, _, _, changed_at in entries:
+            if changed_at > settled_before:
+                has_more = False
+                break
+            next_since = seq
+
+        return Response({
+            'since': since,
+            'next_since': next_since,
+            'has_more': has_more,
+            'timesheets': self.build_changes(
+                entries,
+                my_models.ChangeLogModel.Resource.TIMESHEET,
+                TimesheetModel.objects.all(),
+                my_serializers.TimesheetSyncSerializer,
+            ),
+            'leave_requests': self.build_changes(
+                entries,
+                my_models.ChangeLogModel.Resource.LEAVE_REQUEST,
+                LeaveRequestModel.objects.all(),
+                my_serializers.LeaveRequestSyncSerializer,
+            ),
+        }, status=status.HTTP_200_OK)
+
+    def get_change_log(self, scope):
+        if scope == 'team':
+            return filter_to_team(my_models.ChangeLogModel.objects.all(), self.request.user.pk, field='owner')
+        return my_models.ChangeLogModel.objects.filter(owner=self.request.user)
+
+    def build_changes(self, entries, resource, queryset, serializer_class):
+        upsert_ids = []
+        deletes = []
+        for _, entry_resource, object_id, operation, _ in entries:
+            if entry_resource != resource:
+                continue
+            if operation == my_models.ChangeLogModel.Operation.DELETE:
+                deletes.append(object_id)
+            else:
+                upsert_ids.append(object_id)
+
+        upserts = fetch_by_ids(queryset, upsert_ids) if upsert_ids else queryset.none()
+        return {
+            'upserts': serializer_class(upserts, many=True).data,
+            'deletes': deletes,
+        }
+
+
+class TeamActivityStreamView(APIView):
+    """
+    Server-sent events stream of leave request and clock activity for the
+    manager's direct reports.
+
+    Each event's id is the change sequence number, so a reconnecting client that
+    sends `Last-Event-ID` (or `?last_event_id=`) gets the changes it missed
+    replayed from the change log before live events resume. A client that missed
+    more than STREAM_REPLAY_LIMIT changes gets one `reset` event and the stream
+    ends: it should sync from its last event id through /api/sync/changes/ and
+    reconnect with the returned next_since.
+
+    Under ASGI the stream is an async generator that waits on the broker without
+    holding a thread; Django would otherwise try to drain a sync stream, which
+    never ends, before sending anything.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsAdminUser | my_permissions.IsManager]
+    request_priority = 'low'
+
+    def get(self, request, *args, **kwargs):
+        last_event_id = request.META.get('HTTP_LAST_EVENT_ID') or request.query_params.get('last_event_id')
+        try:
+            last_event_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            return Response({"last_event_id": "Must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        team = team_user_ids(request.user.pk).tolist()
+
+        stream = self.astream if isinstance(request._request, ASGIRequest) else self.stream
+        response = StreamingHttpResponse(
+            stream(team, last_event_id),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def stream(self, team, last_event_id):
+        # Subscribe before replaying so nothing committed in between is lost.
+        subscription = broker.subscribe(team)
+        try:
+            chunks, last_seq = self.start(team, last_event_id)
+            yield from chunks
+            if last_seq is None:
+                return
+
+            while not subscription.overflowed:
+                try:
+                    event = subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                # Events published while the replay ran are already sent.
+                if event.seq <= last_seq:
+                    continue
+                last_seq = event.seq
+                yield event.encode()
+        finally:
+            broker.unsubscribe(subscription)
+
+    async def astream(self, team, last_event_id):
+        subscription = broker.subscribe(team, loop=asyncio.get_running_loop())
+        try:
+            chunks, last_seq = await sync_to_async(self.start)(team, last_event_id)
+            for chunk in chunks:
+                yield chunk
+            if last_seq is None:
+                return
+
+            while not subscription.overflowed:
+                try:
+                    event = await subscription.aget(timeout=STREAM_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event.seq <= last_seq:
+                    continue
+                last_seq = event.seq
+                yield event.encode()
+        finally:
+            # Also reached when the server cancels the response on disconnect.
+            broker.unsubscribe(subscription)
+
+    def start(self, team, last_event_id):
+        """
+        The chunks sent before live events and the last sequence number they
+        cover, or None for it when the client has to resync instead.
+        """
+        chunks = [f"retry: {STREAM_RETRY_MILLISECONDS}\n\n"]
+        if last_event_id is None:
+            return chunks, 0
+
+        events = self.replay(team, last_event_id)
+        if events is None:
+            return chunks + [self.encode_reset(last_event_id)], None
+        chunks += [event.encode() for event in events]
+        return chunks, events[-1].seq if events else last_event_id
+
+    def replay(self, team, last_event_id):
+        """The missed events, or None when there are more than STREAM_REPLAY_LIMIT."""
+        entries = list(
+            my_models.ChangeLogModel.objects
+            .filter(owner__in=team, seq__gt=last_event_id)
+            .order_by('seq')[:STREAM_REPLAY_LIMIT + 1]
+        )
+        if len(entries) > STREAM_REPLAY_LIMIT:
+            return None
+        return build_events(entries)
+
+    def encode_reset(self, last_event_id):
+        # No id: the client's Last-Event-ID stays where it was.
+        data = json.dumps({'since': last_event_id, 'sync': f'/api/sync/changes/?scope=team&since={last_event_id}'})
+        return f"event: reset\ndata: {data}\n\n"
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ApiTimesheetConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api_timesheet'
+
+    def ready(self):
+        from . import signals
+
+        post_migrate.connect(signals.reserve_shard_id_range, sender=self)
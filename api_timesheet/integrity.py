@@ -0,0 +1,182 @@
+import datetime
+import time
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, DateTimeField, DurationField, F, Q, Value, When
+from django.utils import timezone
+
+from .models import TimesheetModel
+from api_sync.models import ChangeLogModel
+from api_sync.utils import record_changes
+from api_audit.buffer import record_events
+from api_audit.models import AuditEventModel
+
+
+# Open shifts that started longer ago than this are considered forgotten clock-outs.
+STALE_SHIFT_HOURS = 16
+# Length given to an auto-closed shift, unless the employee clocked in again sooner.
+AUTO_CLOSE_SHIFT_HOURS = 8
+SCAN_CHUNK_SIZE = 2000
+
+Flag = TimesheetModel.IntegrityFlag
+
+
+class TimesheetIntegrityScanner:
+    """
+    Streams every timesheet ordered by (user, clock_in_time, id), one keyset page
+    at a time, and fixes or flags what it finds:
+
+    - open shifts older than `stale_after` are closed `close_after` after clock-in,
+      or at the employee's next clock-in if that comes first, and flagged AUTO_CLOSED;
+    - closed shifts starting before an earlier shift of the same employee ended
+      are flagged OVERLAP;
+    - shifts whose clock-out precedes their clock-in are flagged NEGATIVE_DURATION.
+
+    Only the current employee's running state is kept between rows, so memory is
+    bounded by the chunk size. Each chunk's fixes are written with a few set-based
+    UPDATEs in one transaction and recorded in the sync change log. Rows that
+    already carry a flag are left alone.
+
+    `using` picks the database to scan; sharded timesheets are scanned one shard
+    at a time, which keeps every employee's rows in one scan.
+    """
+
+    def __init__(self, stale_after=None, close_after=None, chunk_size=SCAN_CHUNK_SIZE, dry_run=False, now=None, using=None):
+        self.stale_after = stale_after or datetime.timedelta(hours=STALE_SHIFT_HOURS)
+        self.close_after = close_after or datetime.timedelta(hours=AUTO_CLOSE_SHIFT_HOURS)
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.using = using
+        self.now = now or timezone.now()
+        self.stale_before = self.now - self.stale_after
+
+        self.stats = Counter()
+        self.elapsed = 0.0
+
+        self._user_id = None
+        self._latest_end = None
+        self._pending_close = None
+        self._reset_batch()
+
+    def _reset_batch(self):
+        self._close = {}
+        self._flags = {Flag.OVERLAP: [], Flag.NEGATIVE_DURATION: []}
+        self._owners = {}
+
+    def chunks(self):
+        queryset = TimesheetModel.objects.using(self.using).filter(clock_in_time__isnull=False).order_by('user_id', 'clock_in_time', 'id')
+        fields = ('id', 'user_id', 'clock_in_time', 'clock_out_time', 'integrity_flag')
+        last = None
+        while True:
+            page = queryset
+            if last is not None:
+                user_id, clock_in_time, pk = last
+                page = page.filter(user_id__gte=user_id).filter(
+                    Q(user_id__gt=user_id)
+                    | Q(user_id=user_id, clock_in_time__gt=clock_in_time)
+                    | Q(user_id=user_id, clock_in_time=clock_in_time, id__gt=pk)
+                )
+            chunk = list(page.values_list(*fields)[:self.chunk_size])
+            if not chunk:
+                return
+            yield chunk
+            last = chunk[-1][1], chunk[-1][2], chunk[-1][0]
+
+    def run(self):
+        started = time.perf_counter()
+        for chunk in self.chunks():
+            for row in chunk:
+                self.inspect(*row)
+            self.stats['scanned'] += len(chunk)
+            self.stats['chunks'] += 1
+            self.flush()
+        self._finish_user()
+        self.flush()
+        self.elapsed = time.perf_counter() - started
+        return self.stats
+
+    def inspect(self, pk, user_id, clock_in_time, clock_out_time, integrity_flag):
+        if user_id != self._user_id:
+            self._finish_user()
+            self._user_id = user_id
+
+        if self._pending_close is not None:
+            # The employee clocked in again: the forgotten shift ends there at the latest.
+            pending_pk, pending_clock_in = self._pending_close
+            self._pending_close = None
+            self._auto_close(pending_pk, user_id, pending_clock_in, min(pending_clock_in + self.close_after, clock_in_time))
+
+        if clock_out_time is None:
+            if clock_in_time < self.stale_before:
+                self._pending_close = pk, clock_in_time
+            return
+
+        if clock_out_time < clock_in_time:
+            if integrity_flag is None:
+                self._flag(pk, user_id, Flag.NEGATIVE_DURATION)
+            return
+
+        if self._latest_end is not None and clock_in_time < self._latest_end and integrity_flag is None:
+            self._flag(pk, user_id, Flag.OVERLAP)
+        self._latest_end = clock_out_time if self._latest_end is None else max(self._latest_end, clock_out_time)
+
+    def _finish_user(self):
+        if self._pending_close is not None:
+            pending_pk, pending_clock_in = self._pending_close
+            self._auto_close(pending_pk, self._user_id, pending_clock_in, pending_clock_in + self.close_after)
+        self._pending_close = None
+        self._latest_end = None
+
+    def _auto_close(self, pk, user_id, clock_in_time, clock_out_time):
+        self._close[pk] = clock_in_time, clock_out_time
+        self._owners[pk] = user_id
+        self._latest_end = clock_out_time if self._latest_end is None else max(self._latest_end, clock_out_time)
+
+    def _flag(self, pk, user_id, flag):
+        self._flags[flag].append(pk)
+        self._owners[pk] = user_id
+
+    def flush(self):
+        self.stats[Flag.AUTO_CLOSED] += len(self._close)
+        for flag, pks in self._flags.items():
+            self.stats[flag] += len(pks)
+
+        if self._owners and not self.dry_run:
+            with transaction.atomic(using=self.using):
+                self._write()
+        self._reset_batch()
+
+    def _write(self):
+        if self._close:
+            # Shifts closed after the default length share one UPDATE; those cut short
+            # by a later clock-in get their own end time through a CASE.
+            default_close = [pk for pk, (clock_in, clock_out) in self._close.items() if clock_out - clock_in == self.close_after]
+            early_close = {pk: times for pk, times in self._close.items() if times[1] - times[0] != self.close_after}
+
+            TimesheetModel.objects.using(self.using).filter(pk__in=default_close, clock_out_time__isnull=True).update(
+                clock_out_time=F('clock_in_time') + Value(self.close_after, output_field=DurationField()),
+                working_hours=Value(self.close_after, output_field=DurationField()),
+                integrity_flag=Flag.AUTO_CLOSED,
+            )
+            if early_close:
+                TimesheetModel.objects.using(self.using).filter(pk__in=list(early_close), clock_out_time__isnull=True).update(
+                    clock_out_time=Case(
+                        *[When(pk=pk, then=Value(clock_out, output_field=DateTimeField())) for pk, (_, clock_out) in early_close.items()]
+                    ),
+                    working_hours=Case(
+                        *[When(pk=pk, then=Value(clock_out - clock_in, output_field=DurationField())) for pk, (clock_in, clock_out) in early_close.items()]
+                    ),
+                    integrity_flag=Flag.AUTO_CLOSED,
+                )
+
+        for flag, pks in self._flags.items():
+            if pks:
+                TimesheetModel.objects.using(self.using).filter(pk__in=pks, integrity_flag__isnull=True).update(integrity_flag=flag)
+
+        # Set-based updates bypass model signals.
+        record_changes(ChangeLogModel.Resource.TIMESHEET, self._owners.items())
+        record_events(
+            AuditEventModel.Action.SHIFT_AUTO_CLOSED, None, AuditEventModel.Subject.TIMESHEET,
+            [(pk, self._owners[pk]) for pk in self._close], using=self.using,
+        )
@@ -0,0 +1,202 @@
+import datetime
+import re
+import sqlite3
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models
+from django.db.models import Count, Sum
+from django.utils.duration import duration_microseconds
+
+from api_timesheet.models import TimesheetModel
+
+
+def _index(name, fields, condition=None):
+    return models.Index(fields=fields, name=name, condition=condition)
+
+
+# Index layouts to compare. 'previous' is the schema before the 0002 migration;
+# 'current' is what the model declares now.
+LAYOUTS = {
+    'previous': [
+        _index('bench_user', ['user']),
+        _index('bench_clock_in', ['clock_in_time']),
+        _index('bench_clock_out', ['clock_out_time']),
+        _index('bench_working_hours', ['working_hours']),
+        _index('bench_user_clock_in', ['user', 'clock_in_time']),
+    ],
+    'current': [
+        _index('bench_clock_in', ['clock_in_time']),
+        *TimesheetModel._meta.indexes,
+    ],
+}
+
+WRITE_ROUNDS = 3
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare TimesheetModel index layouts on a scratch in-memory SQLite "
+        "database: cost of clock-in inserts and clock-out updates, and read "
+        "latency of every query the app runs against the table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--days', type=int, default=200)
+        parser.add_argument('--events', type=int, default=2000, help="Clock-ins (and as many clock-outs) timed per layout.")
+        parser.add_argument('--repeat', type=int, default=50, help="Runs per read query; the median is reported.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stderr.write("The benchmark builds its scratch tables with the SQLite schema editor.")
+            return
+
+        self.now = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+        table_sql, index_sql = self.schema()
+        databases = {}
+        for layout in LAYOUTS:
+            db = sqlite3.connect(':memory:', isolation_level=None)
+            db.execute(table_sql)
+            for statement in index_sql[layout]:
+                db.execute(statement)
+            self.seed(db, options['users'], options['days'])
+            db.execute("ANALYZE")
+            databases[layout] = db
+
+        # Layouts take turns so that drift in machine load hits both alike; the
+        # best round is kept.
+        results = {layout: {} for layout in LAYOUTS}
+        for batch in range(WRITE_ROUNDS):
+            for layout, db in databases.items():
+                timings = self.bench_writes(db, options['users'], options['events'], batch)
+                for name, value in timings.items():
+                    results[layout][name] = min(value, results[layout].get(name, value))
+        for layout, db in databases.items():
+            results[layout].update(self.bench_reads(db, options['users'], options['repeat']))
+            results[layout]['indexes'] = len(index_sql[layout])
+            db.close()
+
+        rows = options['users'] * options['days']
+        self.stdout.write(f"{rows} timesheets, {options['users']} users (median µs per operation)\n")
+        self.stdout.write(f"{'':32}" + ''.join(f"{layout:>12}" for layout in LAYOUTS))
+        for metric in results['previous']:
+            values = [results[layout][metric] for layout in LAYOUTS]
+            line = f"{metric:32}" + ''.join(f"{value:>12,.1f}" if isinstance(value, float) else f"{value:>12}" for value in values)
+            self.stdout.write(line)
+
+    def schema(self):
+        with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+            editor.create_model(TimesheetModel)
+            table_sql = next(statement for statement in editor.collected_sql if statement.startswith('CREATE TABLE'))
+            # Keep the table alone and let each layout add its own indexes.
+            index_sql = {
+                layout: [str(index.create_sql(TimesheetModel, editor)) for index in indexes]
+                for layout, indexes in LAYOUTS.items()
+            }
+        return table_sql.rstrip(';'), index_sql
+
+    def seed(self, db, users, days):
+        start = self.now - datetime.timedelta(days=days)
+        rows = []
+        for user_id in range(1, users + 1):
+            for day in range(days):
+                clock_in = start + datetime.timedelta(days=day, hours=8, minutes=user_id % 60)
+                # One in fifty shifts is still open.
+                clock_out = None if (user_id + day) % 50 == 0 else clock_in + datetime.timedelta(hours=8)
+                rows.append(self.row(user_id, clock_in, clock_out))
+        db.execute("BEGIN")
+        db.executemany(
+            "INSERT INTO api_timesheet_timesheetmodel (user_id, clock_in_time, clock_out_time, working_hours, work_date, integrity_flag) "
+            "VALUES (?, ?, ?, ?, ?, NULL)",
+            rows,
+        )
+        db.execute("COMMIT")
+
+    def row(self, user_id, clock_in, clock_out):
+        adapt = connection.ops.adapt_datetimefield_value
+        # SQLite stores durations as integer microseconds.
+        working_hours = duration_microseconds(clock_out - clock_in) if clock_out else None
+        # The scratch users all work in UTC.
+        work_date = connection.ops.adapt_datefield_value(clock_in.date())
+        return user_id, adapt(clock_in), adapt(clock_out) if clock_out else None, working_hours, work_date
+
+    def bench_writes(self, db, users, events, batch):
+        """Each clock event is its own transaction, as in the API."""
+        clock_in = self.now + datetime.timedelta(days=1 + batch)
+        timings = {'clock-in insert': [], 'clock-out update': []}
+        ids = []
+        for event in range(events):
+            user_id, clock_in_at, _, _, work_date = self.row(event % users + 1, clock_in + datetime.timedelta(seconds=event), None)
+            started = time.perf_counter()
+            db.execute("BEGIN")
+            cursor = db.execute(
+                "INSERT INTO api_timesheet_timesheetmodel (user_id, clock_in_time, clock_out_time, working_hours, work_date, integrity_flag) "
+                "VALUES (?, ?, NULL, NULL, ?, NULL)",
+                (user_id, clock_in_at, work_date),
+            )
+            db.execute("COMMIT")
+            timings['clock-in insert'].append(time.perf_counter() - started)
+            ids.append(cursor.lastrowid)
+
+        for event, pk in enumerate(ids):
+            _, _, clock_out_at, working_hours, _ = self.row(0, clock_in, clock_in + datetime.timedelta(hours=8, seconds=event))
+            started = time.perf_counter()
+            db.execute("BEGIN")
+            db.execute(
+                "UPDATE api_timesheet_timesheetmodel SET clock_out_time = ?, working_hours = ? WHERE id = ?",
+                (clock_out_at, working_hours, pk),
+            )
+            db.execute("COMMIT")
+            timings['clock-out update'].append(time.perf_counter() - started)
+
+        return {name: statistics.median(values) * 1e6 for name, values in timings.items()}
+
+    def access_paths(self, users):
+        """
+        The app's queries against the table, as the ORM compiles them. The scratch
+        database has no employee table, so dashboard queries group by user
+        instead of by department.
+        """
+        objects = TimesheetModel.objects
+        user_id = users // 2
+        team = list(range(1, min(users, 12) + 1))
+        today = self.now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return {
+            'own history (me/)': objects.filter(user_id=user_id).order_by('-clock_in_time', '-id'),
+            'team history (team/)': objects.filter(user_id__in=team).order_by('-clock_in_time')[:10],
+            'clock-in once-a-day check': objects.filter(user_id=user_id, work_date=today.date()).values('id')[:1],
+            'own daily totals (me/daily/)': objects.filter(
+                user_id=user_id, work_date__gte=(today - datetime.timedelta(days=30)).date(), work_date__isnull=False,
+            ).values('work_date').annotate(total=Sum('working_hours')).order_by('-work_date'),
+            'clock-out open shift': objects.filter(
+                user_id=user_id, clock_in_time__isnull=False, clock_out_time__isnull=True,
+            ).order_by('-clock_in_time')[:1],
+            'dashboard hours this week': objects.filter(
+                clock_in_time__gte=today - datetime.timedelta(days=7), working_hours__isnull=False,
+            ).values('user_id').annotate(total=Sum('working_hours')).order_by(),
+            'dashboard clocked in': objects.filter(
+                clock_in_time__isnull=False, clock_out_time__isnull=True,
+            ).values('user_id').annotate(count=Count('pk')).order_by(),
+            'integrity scan page': objects.filter(clock_in_time__isnull=False).order_by('user_id', 'clock_in_time', 'id')[:2000],
+        }
+
+    def bench_reads(self, db, users, repeat):
+        results = {}
+        for name, queryset in self.access_paths(users).items():
+            sql, params = queryset.query.sql_with_params()
+            sql = re.sub(r'%s', '?', sql)
+            params = [
+                connection.ops.adapt_datetimefield_value(param) if isinstance(param, datetime.datetime)
+                else connection.ops.adapt_datefield_value(param) if isinstance(param, datetime.date)
+                else param
+                for param in params
+            ]
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                db.execute(sql, params).fetchall()
+                timings.append(time.perf_counter() - started)
+            results[name] = statistics.median(timings) * 1e6
+        return results
@@ -0,0 +1,55 @@
+import datetime
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from api_timesheet import sharding
+
+from api_timesheet.integrity import (
+    AUTO_CLOSE_SHIFT_HOURS, SCAN_CHUNK_SIZE, STALE_SHIFT_HOURS, Flag, TimesheetIntegrityScanner,
+)
+from api_reports.dashboard import TIMESHEET_METRICS, mark_dirty
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream every timesheet in chunks, auto-close open shifts older than "
+        "--stale-hours and flag overlapping shifts and negative durations. "
+        "Meant to run from cron, e.g. hourly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-hours', type=float, default=STALE_SHIFT_HOURS)
+        parser.add_argument('--close-after-hours', type=float, default=AUTO_CLOSE_SHIFT_HOURS)
+        parser.add_argument('--chunk-size', type=int, default=SCAN_CHUNK_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help="Report what would change without writing.")
+
+    def handle(self, *args, **options):
+        stats = Counter()
+        elapsed = 0.0
+        # One scan per shard when sharded; None scans the routed (default) database.
+        for using in sharding.shard_aliases() or [None]:
+            scanner = TimesheetIntegrityScanner(
+                stale_after=datetime.timedelta(hours=options['stale_hours']),
+                close_after=datetime.timedelta(hours=options['close_after_hours']),
+                chunk_size=options['chunk_size'],
+                dry_run=options['dry_run'],
+                using=using,
+            )
+            stats.update(scanner.run())
+            elapsed += scanner.elapsed
+
+        changed = stats[Flag.AUTO_CLOSED] + stats[Flag.OVERLAP] + stats[Flag.NEGATIVE_DURATION]
+        if changed and not options['dry_run']:
+            mark_dirty(TIMESHEET_METRICS)
+
+        rate = stats['scanned'] / elapsed if elapsed else 0
+        verb = "Would change" if options['dry_run'] else "Changed"
+        self.stdout.write(
+            f"Scanned {stats['scanned']} timesheets in {stats['chunks']} chunks, "
+            f"{elapsed:.2f}s ({rate:,.0f} rows/s)."
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {changed}: {stats[Flag.AUTO_CLOSED]} auto-closed, "
+            f"{stats[Flag.OVERLAP]} overlapping, {stats[Flag.NEGATIVE_DURATION]} negative durations."
+        ))
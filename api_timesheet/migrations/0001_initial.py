@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-19 16:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimesheetModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clock_in_time', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('clock_out_time', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('working_hours', models.DurationField(blank=True, db_index=True, editable=False, null=True)),
+                ('integrity_flag', models.CharField(blank=True, choices=[('AUTO_CLOSED', 'Auto-closed stale shift'), ('OVERLAP', 'Overlaps another shift'), ('NEGATIVE_DURATION', 'Clock-out before clock-in')], max_length=20, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-clock_in_time'],
+                'indexes': [models.Index(fields=['user', 'clock_in_time'], name='api_timeshe_user_id_2a82a6_idx')],
+            },
+        ),
+    ]
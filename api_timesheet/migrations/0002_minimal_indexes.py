@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-19 16:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_timesheet', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='timesheetmodel',
+            name='clock_out_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='timesheetmodel',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='timesheetmodel',
+            name='working_hours',
+            field=models.DurationField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='timesheetmodel',
+            index=models.Index(condition=models.Q(('clock_out_time__isnull', True)), fields=['user', 'clock_in_time'], name='timesheet_open_shift_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-19 16:42
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def backfill_work_date(apps, schema_editor):
+    # No employee had a time zone before this migration, so every day is in TIME_ZONE.
+    TimesheetModel = apps.get_model('api_timesheet', 'TimesheetModel')
+    timesheets = TimesheetModel.objects.using(schema_editor.connection.alias).filter(clock_in_time__isnull=False)
+    batch = []
+    for timesheet in timesheets.only('id', 'clock_in_time').order_by('id').iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        timesheet.work_date = timezone.localtime(timesheet.clock_in_time).date()
+        batch.append(timesheet)
+        if len(batch) == BACKFILL_BATCH_SIZE:
+            timesheets.bulk_update(batch, ['work_date'])
+            batch = []
+    timesheets.bulk_update(batch, ['work_date'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_timesheet', '0003_timesheet_user_no_db_constraint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timesheetmodel',
+            name='work_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='timesheetmodel',
+            index=models.Index(fields=['user', 'work_date'], name='api_timeshe_user_id_05796e_idx'),
+        ),
+        migrations.RunPython(backfill_work_date, migrations.RunPython.noop),
+    ]
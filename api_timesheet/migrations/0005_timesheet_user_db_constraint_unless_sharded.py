@@ -0,0 +1,25 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Restores the user foreign key constraint that 0003 dropped, unless timesheets
+# are sharded (TIMESHEET_SHARDS set), where users live in another database. Reads
+# the setting like the model does, so the two never disagree.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_timesheet', '0004_timesheet_work_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='timesheetmodel',
+            name='user',
+            field=models.ForeignKey(
+                db_constraint=not getattr(settings, 'TIMESHEET_SHARDS', []), db_index=False,
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
@@ -2,6 +2,46 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 
+from . import sharding, workdays
+
+
+class TimesheetQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """The user's timesheets, read from their shard when timesheets are sharded."""
+        user_id = getattr(user, 'pk', user)
+        queryset = self.filter(user_id=user_id)
+        if sharding.sharding_enabled():
+            queryset = queryset.using(sharding.shard_for_user(user_id))
+        return queryset
+
+    def create(self, **kwargs):
+        if self._db is None and sharding.sharding_enabled():
+            user_id = getattr(kwargs.get('user'), 'pk', kwargs.get('user_id'))
+            return self.using(sharding.shard_for_user(user_id)).create(**kwargs)
+        return super().create(**kwargs)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        fill_work_dates(objs)
+        if self._db is not None or not sharding.sharding_enabled():
+            return super().bulk_create(objs, *args, **kwargs)
+        by_shard = {}
+        for obj in objs:
+            by_shard.setdefault(sharding.shard_for_user(obj.user_id), []).append(obj)
+        for alias, shard_objs in by_shard.items():
+            self.using(alias).bulk_create(shard_objs, *args, **kwargs)
+        return objs
+
+
+def fill_work_dates(timesheets):
+    """Sets the missing work_date of clocked-in timesheets, looking up their users' time zones in one query."""
+    missing = [timesheet for timesheet in timesheets if timesheet.work_date is None and timesheet.clock_in_time is not None]
+    if not missing:
+        return
+    zones = workdays.user_timezones(timesheet.user_id for timesheet in missing)
+    for timesheet in missing:
+        timesheet.work_date = workdays.work_date(timesheet.clock_in_time, zones[timesheet.user_id])
+
 
 class TimesheetModel(models.Model):
     """
@@ -13,19 +53,48 @@ class TimesheetModel(models.Model):
         clock_in_time (DateTimeField): The datetime when the employee clocks in.
         clock_out_time (DateTimeField): The datetime when the employee clocks out.
         working_hours (DurationField): The duration between clock-in and clock-out, auto-calculated.
+        integrity_flag (CharField): Set by the scan_timesheets command on entries that need review.
+        work_date (DateField): Local date of clock_in_time in the employee's time zone, set on
+            save() and bulk_create(); the day the shift counts for. QuerySet.update() of
+            clock_in_time does not maintain it.
+
+    Managers:
+        objects: TimesheetQuerySet; use for_user() for per-user reads so they reach
+            the right shard (see sharding.py).
 
     Methods:
-        save(): Calculates and stores working_hours before saving.
+        save(): Calculates and stores working_hours, and work_date when clock_in_time is new or changed.
         clean(): Validates that clock_out_time is not before clock_in_time.
 
     Meta:
-        Adds an index on user and clock_in_time for efficient querying.
+        Indexes (user, clock_in_time) for per-employee history, (user, work_date)
+        for the once-a-day clock-in check, day ranges and daily totals,
+        clock_in_time for date-range reports, and open shifts only
+        (clock_out_time IS NULL) for clock-out and the "clocked in now" count. Run bench_timesheet_indexes
+        before adding more: every index is written on each clock event.
     """
-    
-    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=True,)
+    class IntegrityFlag(models.TextChoices):
+        AUTO_CLOSED = 'AUTO_CLOSED', 'Auto-closed stale shift'
+        OVERLAP = 'OVERLAP', 'Overlaps another shift'
+        NEGATIVE_DURATION = 'NEGATIVE_DURATION', 'Clock-out before clock-in'
+
+    # Lookups by user are served by the (user, clock_in_time) index. A database
+    # constraint only without sharding: sharded, users live in another database.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False, db_constraint=not sharding.sharding_enabled())
     clock_in_time = models.DateTimeField(null=True, blank=True,db_index=True)
-    clock_out_time = models.DateTimeField(null=True, blank=True, db_index=True)
-    working_hours = models.DurationField(null=True, blank=True, editable=False, db_index=True)
+    clock_out_time = models.DateTimeField(null=True, blank=True)
+    working_hours = models.DurationField(null=True, blank=True, editable=False)
+    integrity_flag = models.CharField(max_length=20, choices=IntegrityFlag.choices, null=True, blank=True)
+    work_date = models.DateField(null=True, blank=True, editable=False)
+
+    objects = TimesheetQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'clock_in_time' in field_names:
+            instance._loaded_clock_in_time = instance.clock_in_time
+        return instance
 
     def save(self, *args, **kwargs):
         if self.clock_in_time and self.clock_out_time:
@@ -33,6 +102,12 @@ class TimesheetModel(models.Model):
         else:
             self.working_hours = None
 
+        if self.clock_in_time is None:
+            self.work_date = None
+        elif self.work_date is None or self.clock_in_time != getattr(self, '_loaded_clock_in_time', self.clock_in_time):
+            self.work_date = workdays.work_date(self.clock_in_time, workdays.user_timezone(self.user_id))
+        self._loaded_clock_in_time = self.clock_in_time
+
         super().save(*args, **kwargs)
     
     def clean(self):
@@ -41,7 +116,13 @@ class TimesheetModel(models.Model):
     
     class Meta:
         indexes = [
-            models.Index(fields=['user', 'clock_in_time'])
+            models.Index(fields=['user', 'clock_in_time']),
+            models.Index(fields=['user', 'work_date']),
+            models.Index(
+                fields=['user', 'clock_in_time'],
+                condition=models.Q(clock_out_time__isnull=True),
+                name='timesheet_open_shift_idx',
+            ),
         ]
 
         ordering = ['-clock_in_time']
\ No newline at end of file
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class DailyTotalsPagination(CursorPagination):
+    """Newest work date first; the cursor keeps deep pages as cheap as the first one."""
+    page_size = 31
+    ordering = ('-work_date',)
+
+
+class TeamDailyTotalsPagination(DailyTotalsPagination):
+    # Several team members share a work date: the cursor's offset steps through them in user order.
+    ordering = ('-work_date', 'user_id')
@@ -1,10 +1,13 @@
 from rest_framework import serializers
-from . import models as my_models
+from . import models as my_models, workdays
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 
 from api_authentication.models import EmployeeModel
+from api_core.projection import Projection, datetime_representation, duration_representation
+from api_audit.buffer import record_event
+from api_audit.models import AuditEventModel
 
 
 User = get_user_model()
@@ -18,11 +21,13 @@ class ClockInSerializer(serializers.ModelSerializer):
         fields = ['clock_in_time']
     
     def validate(self, data):
-        request = self.context['request']
-        user = request.user
-        today = timezone.now().date()
+        user = self.context['request'].user
+        self.validated_clock_in_time = data.get('clock_in_time', timezone.now())
+        self.work_date = workdays.work_date(self.validated_clock_in_time, workdays.user_timezone(user.pk))
 
-        if my_models.TimesheetModel.filter(user=user, clock_in_time=today):
+        if my_models.TimesheetModel.objects.for_user(user).filter(work_date=self.work_date).exists():
+            if 'clock_in_time' in data:
+                raise serializers.ValidationError(f"You have already clocked in on {self.work_date}.")
             raise serializers.ValidationError("You have already clocked in today.")
         
         return data
@@ -30,10 +35,17 @@ class ClockInSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = self.context['request'].user
 
-        return my_models.TimesheetModel.objects.create(
+        timesheet = my_models.TimesheetModel.objects.create(
             user=user, 
-            clock_in_time=validated_data.get('clock_in_time', timezone.now()),
+            clock_in_time=self.validated_clock_in_time,
+            work_date=self.work_date,
         )
+        if 'clock_in_time' in validated_data:
+            record_event(
+                AuditEventModel.Action.CLOCK_IN_CORRECTED, user, AuditEventModel.Subject.TIMESHEET,
+                timesheet.pk, user, details={'clock_in_time': timesheet.clock_in_time},
+            )
+        return timesheet
     
 
 class ClockOutSerializer(serializers.ModelSerializer):
@@ -47,8 +59,7 @@ class ClockOutSerializer(serializers.ModelSerializer):
         user = self.context['request'].user
 
         try:
-            self.timesheet = my_models.TimesheetModel.objects.filter(
-                user=user,
+            self.timesheet = my_models.TimesheetModel.objects.for_user(user).filter(
                 clock_in_time__isnull=False,
                 clock_out_time__isnull=True,
             ).latest('clock_in_time')
@@ -61,12 +72,18 @@ class ClockOutSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Clock-out time must be after clock-in time.")
         
         self.validated_clock_out_time = clock_out_time
+        self.clock_out_time_entered = 'clock_out_time' in data
 
         return data
     
     def save(self, **kwargs):
         self.timesheet.clock_out_time = self.validated_clock_out_time
         self.timesheet.save()
+        if self.clock_out_time_entered:
+            record_event(
+                AuditEventModel.Action.CLOCK_OUT_CORRECTED, self.timesheet.user_id, AuditEventModel.Subject.TIMESHEET,
+                self.timesheet.pk, self.timesheet.user_id, details={'clock_out_time': self.timesheet.clock_out_time},
+            )
         return self.timesheet
     
 
@@ -76,6 +93,39 @@ class EmployeeTimesheetSerializer(serializers.ModelSerializer):
         fields = ['id', 'clock_in_time', 'clock_out_time', 'working_hours']
 
 
+# Lean equivalent of EmployeeTimesheetSerializer for list endpoints (see api_core.projection).
+EMPLOYEE_TIMESHEET_PROJECTION = {
+    'id': Projection('id'),
+    'clock_in_time': Projection('clock_in_time', build=datetime_representation),
+    'clock_out_time': Projection('clock_out_time', build=datetime_representation),
+    'working_hours': Projection('working_hours', build=duration_representation),
+}
+
+
+class WorkDateRangeSerializer(serializers.Serializer):
+    """`since`/`until` query parameters: first and last work date to include, both optional."""
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if 'since' in data and 'until' in data and data['since'] > data['until']:
+            raise serializers.ValidationError({"until": "Must not be before since."})
+        return data
+
+
+class DailyTimesheetSerializer(serializers.Serializer):
+    """One employee's shifts on one work date, totalled."""
+    work_date = serializers.DateField()
+    shifts = serializers.IntegerField()
+    working_hours = serializers.DurationField(allow_null=True)
+    first_clock_in = serializers.DateTimeField()
+    last_clock_out = serializers.DateTimeField(allow_null=True)
+
+
+class TeamDailyTimesheetSerializer(DailyTimesheetSerializer):
+    user = serializers.IntegerField(source='user_id')
+
+
 class EmployeeBasicInfoSerializer(serializers.ModelSerializer):
     class Meta:
         model = EmployeeModel
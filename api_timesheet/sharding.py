@@ -0,0 +1,223 @@
+import functools
+import hashlib
+import heapq
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import F
+
+from api_core.parallel import parallel_map
+from api_core.routers import _replica_reads, replica_alias
+
+
+SHARDED_MODEL = 'api_timesheet.timesheetmodel'
+# Each shard hands out timesheet ids from its own range, so ids are unique across
+# shards and a row's shard can be read off its id.
+SHARD_ID_RANGE = 2 ** 40
+
+
+def shard_aliases():
+    """Database aliases holding timesheets, in shard order; empty when not sharded."""
+    return getattr(settings, 'TIMESHEET_SHARDS', [])
+
+
+def sharding_enabled():
+    return bool(shard_aliases())
+
+
+def shard_for_user(user_id):
+    """
+    The shard holding `user_id`'s timesheets. The hash is stable across processes
+    and Python versions; adding or reordering shards requires moving rows.
+    """
+    shards = shard_aliases()
+    digest = hashlib.blake2b(str(user_id).encode(), digest_size=8).digest()
+    return shards[int.from_bytes(digest, 'big') % len(shards)]
+
+
+def shard_for_id(pk):
+    return shard_aliases()[pk // SHARD_ID_RANGE]
+
+
+def fan_out(func, aliases=None):
+    """
+    Calls func(alias) for every shard (or the given aliases) in parallel and
+    returns {alias: result}. Inside a transaction on any of them the calls run
+    in this thread instead, where the transaction's own writes are visible.
+    """
+    aliases = list(shard_aliases() if aliases is None else aliases)
+    if any(connections[alias].in_atomic_block for alias in aliases):
+        results = [func(alias) for alias in aliases]
+    else:
+        results = parallel_map(func, aliases)
+    return dict(zip(aliases, results))
+
+
+def order_expressions(ordering):
+    """
+    `ordering` as order_by() expressions whose NULL placement matches
+    merge_ordered(): first when ascending, last when descending.
+    """
+    return [
+        F(field[1:]).desc(nulls_last=True) if field.startswith('-') else F(field).asc(nulls_first=True)
+        for field in ordering
+    ]
+
+
+def _ordering_key(ordering):
+    fields = [(field.lstrip('-'), field.startswith('-')) for field in ordering]
+
+    def compare(a, b):
+        for field, descending in fields:
+            x, y = (a[field], b[field]) if isinstance(a, dict) else (getattr(a, field), getattr(b, field))
+            if x == y:
+                continue
+            result = -1 if x is None else 1 if y is None else -1 if x < y else 1
+            return -result if descending else result
+        return 0
+
+    return functools.cmp_to_key(compare)
+
+
+def merge_ordered(results, ordering):
+    """Lazily merges per-shard model instance (or values() row) lists, each already sorted by `ordering`."""
+    return heapq.merge(*results, key=_ordering_key(ordering))
+
+
+def fan_out_queryset(queryset, aliases=None, limit=None):
+    """
+    Evaluates `queryset` on every shard in parallel and merges the rows in the
+    queryset's order (or the model's default ordering). With `limit`, each shard
+    returns at most that many rows and only the first `limit` merged rows are kept.
+    """
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+    queryset = queryset.order_by(*order_expressions(ordering))
+    if limit is not None:
+        queryset = queryset[:limit]
+
+    results = fan_out(lambda alias: list(queryset.using(alias)), aliases)
+    merged = merge_ordered(results.values(), ordering)
+    return list(merged if limit is None else (row for _, row in zip(range(limit), merged)))
+
+
+class FanOutQuerySet:
+    """
+    Stand-in for a queryset over every shard, enough for CursorPagination:
+    filter() and order_by() apply to each shard's query, and a slice merges the
+    shards' rows in order, fetching at most `stop` rows from each.
+    """
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    def filter(self, *args, **kwargs):
+        return FanOutQuerySet(self.queryset.filter(*args, **kwargs))
+
+    def order_by(self, *fields):
+        return FanOutQuerySet(self.queryset.order_by(*fields))
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            raise TypeError("FanOutQuerySet only supports slicing.")
+        return fan_out_queryset(self.queryset, limit=index.stop)[index.start or 0:]
+
+
+def fetch_by_ids(queryset, ids):
+    """
+    queryset.filter(pk__in=ids), unordered. Timesheet ids are looked up on the
+    shards their ranges belong to, in parallel; returns a list when sharded.
+    """
+    if queryset.model._meta.label_lower != SHARDED_MODEL or not sharding_enabled():
+        return queryset.filter(pk__in=ids).order_by()
+
+    by_shard = defaultdict(list)
+    for pk in ids:
+        by_shard[shard_for_id(pk)].append(pk)
+    results = fan_out(lambda alias: list(queryset.using(alias).filter(pk__in=by_shard[alias]).order_by()), by_shard)
+    return [row for rows in results.values() for row in rows]
+
+
+def reserve_id_range(using):
+    """Starts a shard's id sequence at the beginning of its range, if it is below it."""
+    start = shard_aliases().index(using) * SHARD_ID_RANGE
+    if not start:
+        return
+
+    from .models import TimesheetModel
+
+    connection = connections[using]
+    table = TimesheetModel._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute("UPDATE sqlite_sequence SET seq = %s WHERE name = %s AND seq < %s", [start, table, start])
+            cursor.execute(
+                "INSERT INTO sqlite_sequence (name, seq) SELECT %s, %s "
+                "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = %s)",
+                [table, start, table],
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence(%s, 'id'), GREATEST(%s, (SELECT COALESCE(MAX(id), 0) FROM {connection.ops.quote_name(table)})))",
+                [table, start],
+            )
+        else:
+            raise ImproperlyConfigured(f"Cannot reserve timesheet id ranges on {connection.vendor}.")
+
+
+class TimesheetShardRouter:
+    """
+    With TIMESHEET_SHARDS set, stores each user's timesheets on the shard picked
+    by shard_for_user(). Saves are routed by the row's user, querysets from
+    TimesheetModel.objects.for_user() by the given user; multi-user reads go
+    through fan_out_queryset(). Shards hold only api_timesheet tables, so users
+    and other rows reached from a timesheet are read from the default database.
+
+    Querysets without a user are not routed and read the default database's
+    (empty) timesheet table.
+    """
+
+    def _shard(self, model, hints):
+        if model._meta.label_lower != SHARDED_MODEL or not sharding_enabled():
+            return None
+        instance = hints.get('instance')
+        if instance is None:
+            return None
+        if instance._meta.label_lower == SHARDED_MODEL:
+            return shard_for_user(instance.user_id) if instance.user_id is not None else None
+        # Assigning a user to a new timesheet routes it by that user.
+        if isinstance(instance, get_user_model()) and instance.pk is not None:
+            return shard_for_user(instance.pk)
+        return None
+
+    def _from_shard(self, hints):
+        instance = hints.get('instance')
+        return instance is not None and instance._state.db in shard_aliases()
+
+    def db_for_read(self, model, **hints):
+        shard = self._shard(model, hints)
+        if shard is not None:
+            return shard
+        if model._meta.label_lower != SHARDED_MODEL and self._from_shard(hints):
+            return (_replica_reads.get() and replica_alias()) or DEFAULT_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        shard = self._shard(model, hints)
+        if shard is not None:
+            return shard
+        if model._meta.label_lower != SHARDED_MODEL and self._from_shard(hints):
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        shards = shard_aliases()
+        if obj1._state.db in shards or obj2._state.db in shards:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in shard_aliases():
+            return app_label == 'api_timesheet'
+        return None
@@ -0,0 +1,18 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from . import sharding
+from .models import TimesheetModel
+
+
+@receiver(pre_delete, sender=User)
+def delete_sharded_timesheets(sender, instance, **kwargs):
+    # The user's cascade only reaches timesheets in the user's own database.
+    if sharding.sharding_enabled():
+        TimesheetModel.objects.for_user(instance).delete()
+
+
+def reserve_shard_id_range(sender, using, **kwargs):
+    if using in sharding.shard_aliases():
+        sharding.reserve_id_range(using)
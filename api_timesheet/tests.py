@@ -1,3 +1,480 @@
-from django.test import TestCase
+import datetime
+import unittest
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+from collections import Counter
+from pathlib import Path
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from api_audit.buffer import audit_buffer
+from api_audit.models import AuditEventModel
+from api_authentication.models import EmployeeModel
+from api_core.query_plans import QueryPlanTestCase, run_list_view
+from api_reports import dashboard
+from api_sync.models import ChangeLogModel
+from . import models as my_models, serializers as my_serializers, sharding, views as my_views
+from .pagination import DailyTotalsPagination, TeamDailyTotalsPagination
+from .integrity import TimesheetIntegrityScanner
+
+
+@unittest.skipIf(settings.TIMESHEET_SHARDS, "expected plans are recorded without sharding")
+class TimesheetQueryPlanTests(QueryPlanTestCase):
+    expected_plans_path = Path(__file__).with_name('query_plans.json')
+    table = my_models.TimesheetModel._meta.db_table
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user('manager')
+        manager_employee = EmployeeModel.objects.create(user=cls.manager, role='MANAGER', department='Engineering')
+
+        users = [User(username=f'employee{index}') for index in range(60)]
+        User.objects.bulk_create(users)
+        users = list(User.objects.filter(username__startswith='employee'))
+        EmployeeModel.objects.bulk_create([
+            EmployeeModel(user=user, manager=manager_employee if index < 8 else None, department='Engineering')
+            for index, user in enumerate(users)
+        ])
+        cls.employee = users[0]
+
+        start = timezone.now() - datetime.timedelta(days=200)
+        shifts = []
+        for user in users:
+            for day in range(200):
+                clock_in = start + datetime.timedelta(days=day, hours=9)
+                # Every employee's last shift is still open.
+                clock_out = clock_in + datetime.timedelta(hours=8) if day < 199 else None
+                shifts.append(my_models.TimesheetModel(
+                    user=user, clock_in_time=clock_in, clock_out_time=clock_out,
+                    working_hours=clock_out - clock_in if clock_out else None,
+                ))
+        my_models.TimesheetModel.objects.bulk_create(shifts, batch_size=2000)
+        cls.analyze()
+
+    def test_team_timesheets(self):
+        self.assertQueryPlans(
+            'team_timesheets',
+            lambda: run_list_view(my_views.TeamEmployeeTimesheetView, self.manager),
+            self.table,
+        )
+
+    def test_my_timesheets(self):
+        self.assertQueryPlans(
+            'my_timesheets',
+            lambda: run_list_view(my_views.EmployeeTimesheetView, self.employee),
+            self.table,
+        )
+
+    def test_for_user_lookups(self):
+        # The user column has no index of its own: (user, clock_in_time) serves it.
+        def lookups():
+            list(my_models.TimesheetModel.objects.for_user(self.employee)[:15])
+            my_models.TimesheetModel.objects.for_user(self.employee).count()
+
+        self.assertQueryPlans('for_user_lookups', lookups, self.table)
+
+    def test_clock_out_latest_open_shift(self):
+        request = Request(APIRequestFactory().post('/'))
+        request.user = self.employee
+
+        def clock_out():
+            serializer = my_serializers.ClockOutSerializer(data={}, context={'request': request})
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+        self.assertQueryPlans('clock_out_latest_open_shift', clock_out, self.table)
+
+    def test_clock_in_once_a_day_check(self):
+        request = Request(APIRequestFactory().post('/'))
+        request.user = self.employee
+
+        def clock_in():
+            my_serializers.ClockInSerializer(data={}, context={'request': request}).is_valid()
+
+        self.assertQueryPlans('clock_in_work_date', clock_in, self.table)
+
+    def test_my_daily_timesheets(self):
+        since = (timezone.now() - datetime.timedelta(days=30)).date()
+        self.assertQueryPlans(
+            'my_daily_timesheets',
+            lambda: run_list_view(my_views.EmployeeDailyTimesheetView, self.employee, {'since': since}),
+            self.table,
+        )
+
+
+class WorkDateTests(TestCase):
+    databases = {'default', *settings.TIMESHEET_SHARDS}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('employee')
+        EmployeeModel.objects.create(user=cls.user, timezone='America/Los_Angeles')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def clock_in(self, clock_in_time):
+        return self.client.post('/api/timesheet/api/timesheet/clock-in/', {'clock_in_time': clock_in_time.isoformat()})
+
+    def test_work_date_is_the_employees_local_date(self):
+        # 03:00 UTC is still the previous evening in Los Angeles.
+        evening = datetime.datetime(2026, 3, 2, 3, 0, tzinfo=datetime.timezone.utc)
+        response = self.clock_in(evening)
+        self.assertEqual(response.status_code, 201, response.data)
+        timesheet = my_models.TimesheetModel.objects.for_user(self.user).get()
+        self.assertEqual(timesheet.work_date, datetime.date(2026, 3, 1))
+
+        response = self.clock_in(evening - datetime.timedelta(hours=6))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(str(response.data['non_field_errors'][0]), "You have already clocked in on 2026-03-01.")
+        self.assertEqual(self.clock_in(evening + datetime.timedelta(hours=10)).status_code, 201)
+
+        timesheet.clock_in_time = evening + datetime.timedelta(days=2)
+        timesheet.save()
+        self.assertEqual(timesheet.work_date, datetime.date(2026, 3, 3))
+
+    def test_profile_timezone_change_applies_to_later_shifts(self):
+        response = self.client.patch('/api/auth//employee/me/', {'timezone': 'Mars/Olympus'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('timezone', response.data)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch('/api/auth//employee/me/', {'timezone': 'Pacific/Auckland'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['timezone'], 'Pacific/Auckland')
+
+        # 13:00 UTC is already the next morning in Auckland.
+        self.assertEqual(self.clock_in(datetime.datetime(2026, 3, 2, 13, 0, tzinfo=datetime.timezone.utc)).status_code, 201)
+        self.assertEqual(my_models.TimesheetModel.objects.for_user(self.user).get().work_date, datetime.date(2026, 3, 3))
+
+    def test_bulk_created_rows_get_a_work_date(self):
+        clock_in = datetime.datetime(2026, 3, 2, 3, 0, tzinfo=datetime.timezone.utc)
+        other = User.objects.create_user('no-profile')
+        my_models.TimesheetModel.objects.bulk_create([
+            my_models.TimesheetModel(user=self.user, clock_in_time=clock_in),
+            my_models.TimesheetModel(user=other, clock_in_time=clock_in),
+        ])
+        self.assertEqual(my_models.TimesheetModel.objects.for_user(self.user).get().work_date, datetime.date(2026, 3, 1))
+        self.assertEqual(my_models.TimesheetModel.objects.for_user(other).get().work_date, datetime.date(2026, 3, 2))
+
+    def test_daily_totals_and_day_range(self):
+        start = datetime.datetime(2026, 3, 2, 16, 0, tzinfo=datetime.timezone.utc)
+        my_models.TimesheetModel.objects.bulk_create([
+            my_models.TimesheetModel(
+                user=self.user, clock_in_time=start + datetime.timedelta(days=day, hours=hours),
+                clock_out_time=start + datetime.timedelta(days=day, hours=hours + 3),
+                working_hours=datetime.timedelta(hours=3),
+            )
+            for day in range(3) for hours in (0, 4)
+        ])
+
+        response = self.client.get('/api/timesheet/api/timesheet/me/daily/', {'since': '2026-03-03', 'until': '2026-03-04'})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual([(row['work_date'], row['shifts'], row['working_hours']) for row in response.data['results']], [
+            ('2026-03-04', 2, '06:00:00'),
+            ('2026-03-03', 2, '06:00:00'),
+        ])
+
+        # Without a range the history is paged rather than returned whole.
+        with mock.patch.object(DailyTotalsPagination, 'page_size', 2):
+            first = self.client.get('/api/timesheet/api/timesheet/me/daily/').data
+            second = self.client.get(first['next']).data
+        self.assertEqual([row['work_date'] for row in first['results'] + second['results']], ['2026-03-04', '2026-03-03', '2026-03-02'])
+        self.assertIsNone(second['next'])
+
+        response = self.client.get('/api/timesheet/api/timesheet/me/', {'since': '2026-03-04'})
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(self.client.get('/api/timesheet/api/timesheet/me/', {'since': '2026-03-04', 'until': '2026-03-01'}).status_code, 400)
+
+    def test_orderings_break_ties_by_id(self):
+        start = datetime.datetime(2026, 3, 2, 16, 0, tzinfo=datetime.timezone.utc)
+        my_models.TimesheetModel.objects.bulk_create([
+            my_models.TimesheetModel(
+                user=self.user, clock_in_time=start + datetime.timedelta(days=day),
+                clock_out_time=start + datetime.timedelta(days=day, hours=3),
+                working_hours=datetime.timedelta(hours=3),
+            )
+            for day in range(3)
+        ])
+        ids = sorted(my_models.TimesheetModel.objects.for_user(self.user).values_list('id', flat=True))
+
+        for ordering, expected in (('working_hours', ids), ('-working_hours', ids[::-1]), ('clock_out_time', ids)):
+            response = self.client.get('/api/timesheet/api/timesheet/me/', {'ordering': ordering})
+            self.assertEqual([row['id'] for row in response.data], expected, ordering)
+
+
+
+@override_settings(AUDIT_FLUSH_SECONDS=None)
+class TimesheetAdminTests(TestCase):
+    databases = {'default', *settings.TIMESHEET_SHARDS}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin')
+        cls.user = User.objects.create_user('employee')
+        now = timezone.now()
+        cls.old, cls.recent, cls.closed = [
+            my_models.TimesheetModel.objects.create(user=cls.user, clock_in_time=now - datetime.timedelta(hours=hours))
+            for hours in (30, 2, 50)
+        ]
+        cls.closed.clock_out_time = cls.closed.clock_in_time + datetime.timedelta(hours=4)
+        cls.closed.save()
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.using = sharding.shard_for_user(self.user.pk) if sharding.sharding_enabled() else 'default'
+        self.url = '/admin/api_timesheet/timesheetmodel/'
+        self.params = {'shard': self.using} if sharding.sharding_enabled() else {}
+
+    @override_settings(ADMIN_COUNT_LIMIT=2)
+    def test_changelist_does_not_count_the_table(self):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute("ANALYZE")
+        with CaptureQueriesContext(connections[self.using]) as queries:
+            response = self.client.get(self.url, self.params)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f'?clock_in_time__year={self.old.clock_in_time.year}')
+        self.assertFalse([query for query in queries.captured_queries if 'COUNT(' in query['sql']])
+
+        with CaptureQueriesContext(connections[self.using]) as queries:
+            response = self.client.get(self.url, {**self.params, 'open': 'yes'})
+        self.assertEqual(response.status_code, 200)
+        counts = [query['sql'] for query in queries.captured_queries if 'COUNT(' in query['sql']]
+        self.assertEqual(len(counts), 1)
+        self.assertIn('LIMIT 3', counts[0])
+
+    def test_close_forgotten_shifts_action(self):
+        with self.captureOnCommitCallbacks(using=self.using, execute=True):
+            response = self.client.post(f'{self.url}?shard={self.using}' if self.params else self.url, {
+                'action': 'close_forgotten_shifts', '_selected_action': [self.old.pk, self.recent.pk, self.closed.pk],
+            })
+        self.assertEqual(response.status_code, 302)
+
+        old, recent, closed = (my_models.TimesheetModel.objects.for_user(self.user).get(pk=t.pk) for t in (self.old, self.recent, self.closed))
+        self.assertEqual(old.clock_out_time - old.clock_in_time, datetime.timedelta(hours=8))
+        self.assertEqual(old.working_hours, datetime.timedelta(hours=8))
+        self.assertEqual(old.integrity_flag, my_models.TimesheetModel.IntegrityFlag.AUTO_CLOSED)
+        self.assertIsNone(recent.clock_out_time)
+        self.assertEqual(closed.clock_out_time - closed.clock_in_time, datetime.timedelta(hours=4))
+        self.assertEqual(ChangeLogModel.objects.filter(object_id=old.pk, changed_at__gte=old.clock_out_time).count(), 1)
+        audit_buffer.flush()
+        self.assertEqual(
+            list(AuditEventModel.objects.filter(action=AuditEventModel.Action.SHIFT_AUTO_CLOSED, actor=self.admin).values_list('subject_id', flat=True)),
+            [old.pk],
+        )
+
+
+@override_settings(TIMESHEET_SHARDS=['shard_a', 'shard_b', 'shard_c'])
+class ShardHelperTests(SimpleTestCase):
+    def test_users_spread_over_all_shards(self):
+        shards = [sharding.shard_for_user(user_id) for user_id in range(1, 3001)]
+        self.assertEqual(shards, [sharding.shard_for_user(user_id) for user_id in range(1, 3001)])
+        for alias in ('shard_a', 'shard_b', 'shard_c'):
+            self.assertAlmostEqual(shards.count(alias) / len(shards), 1 / 3, delta=0.05)
+
+    def test_shard_for_id_reads_the_id_range(self):
+        self.assertEqual(sharding.shard_for_id(1), 'shard_a')
+        self.assertEqual(sharding.shard_for_id(sharding.SHARD_ID_RANGE * 2 + 5), 'shard_c')
+
+    def test_merge_ordered_with_mixed_directions_and_nulls(self):
+        def row(pk, clock_out, clock_in):
+            return my_models.TimesheetModel(id=pk, clock_out_time=clock_out, clock_in_time=clock_in)
+
+        t = [timezone.now() + datetime.timedelta(hours=hour) for hour in range(4)]
+        ordering = ['-clock_out_time', 'clock_in_time']
+        shards = [
+            [row(1, t[3], t[0]), row(2, t[1], t[1]), row(3, None, t[0])],
+            [row(4, t[3], t[1]), row(5, t[2], t[0]), row(6, None, t[2])],
+        ]
+        merged = sharding.merge_ordered(shards, ordering)
+        self.assertEqual([timesheet.id for timesheet in merged], [1, 4, 5, 2, 3, 6])
+
+
+@unittest.skipUnless(len(settings.TIMESHEET_SHARDS) > 1, "run with TIMESHEET_SHARD_COUNT=3 to test sharded storage")
+class TimesheetShardingTests(TransactionTestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        self.manager = User.objects.create_user('manager')
+        manager_employee = EmployeeModel.objects.create(user=self.manager, role='MANAGER', department='Engineering')
+        self.team = []
+        for index in range(12):
+            user = User.objects.create_user(f'employee{index}')
+            EmployeeModel.objects.create(user=user, manager=manager_employee, department='Engineering')
+            self.team.append(user)
+
+        self.start = timezone.now() - datetime.timedelta(hours=12)
+        for index, user in enumerate(self.team):
+            clock_in = self.start + datetime.timedelta(minutes=index)
+            my_models.TimesheetModel.objects.create(user=user, clock_in_time=clock_in, clock_out_time=clock_in + datetime.timedelta(hours=2))
+        my_models.TimesheetModel.objects.bulk_create([
+            my_models.TimesheetModel(user=user, clock_in_time=self.start + datetime.timedelta(hours=3, minutes=index))
+            for index, user in enumerate(self.team)
+        ])
+
+    def test_rows_are_stored_on_their_users_shard_with_ids_in_its_range(self):
+        for user in self.team:
+            alias = sharding.shard_for_user(user.pk)
+            ids = list(my_models.TimesheetModel.objects.using(alias).filter(user=user).values_list('id', flat=True))
+            self.assertEqual(len(ids), 2)
+            self.assertTrue(all(sharding.shard_for_id(pk) == alias for pk in ids))
+        self.assertFalse(my_models.TimesheetModel.objects.using('default').exists())
+        self.assertEqual(len({sharding.shard_for_user(user.pk) for user in self.team}), len(settings.TIMESHEET_SHARDS))
+
+    def test_per_user_reads_hit_one_shard(self):
+        user = self.team[0]
+        contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in connections}
+        for context in contexts.values():
+            context.__enter__()
+        try:
+            response = run_list_view(my_views.EmployeeTimesheetView, user)
+        finally:
+            for context in contexts.values():
+                context.__exit__(None, None, None)
+
+        self.assertEqual(len(response.data), 2)
+        touched = {alias for alias, context in contexts.items() if any('api_timesheet_timesheetmodel' in query['sql'] for query in context)}
+        self.assertEqual(touched, {sharding.shard_for_user(user.pk)})
+
+    def test_team_view_merges_shards_in_order(self):
+        response = run_list_view(my_views.TeamEmployeeTimesheetView, self.manager)
+        clock_ins = [row['clock_in_time'] for row in response.data]
+        self.assertEqual(len(clock_ins), 24)
+        self.assertEqual(clock_ins, sorted(clock_ins, reverse=True))
+
+        response = run_list_view(my_views.TeamEmployeeTimesheetView, self.manager, {'ordering': 'clock_in_time'})
+        self.assertEqual([row['clock_in_time'] for row in response.data], clock_ins[::-1])
+
+        # Open shifts share a null clock_out_time and come first, in id order on every shard.
+        response = run_list_view(my_views.TeamEmployeeTimesheetView, self.manager, {'ordering': 'clock_out_time'})
+        clock_outs = [row['clock_out_time'] for row in response.data]
+        self.assertEqual(clock_outs[:12], [None] * 12)
+        self.assertEqual(clock_outs[12:], sorted(clock_outs[12:]))
+        open_ids = [row['id'] for row in response.data[:12]]
+        self.assertEqual(open_ids, sorted(open_ids))
+
+    def test_team_daily_totals_merge_shards(self):
+        rows, params = [], {}
+        with mock.patch.object(TeamDailyTotalsPagination, 'page_size', 5):
+            while True:
+                page = run_list_view(my_views.TeamDailyTimesheetView, self.manager, params).data
+                self.assertLessEqual(len(page['results']), 5)
+                rows += page['results']
+                if page['next'] is None:
+                    break
+                params = {'cursor': parse_qs(urlparse(page['next']).query)['cursor'][0]}
+        keys = [(row['work_date'], row['user']) for row in rows]
+        self.assertEqual(len(set(keys)), len(keys))
+        self.assertEqual(sum(row['shifts'] for row in rows), 24)
+        self.assertEqual({user for _, user in keys}, {user.pk for user in self.team})
+        self.assertEqual(keys, sorted(keys, key=lambda key: (-datetime.date.fromisoformat(key[0]).toordinal(), key[1])))
+
+    def test_dashboard_aggregates_across_shards(self):
+        self.assertEqual(dashboard.compute_clocked_in(timezone.now()), {'Engineering': 12})
+        self.assertEqual(dashboard.compute_hours_this_week(self.start + datetime.timedelta(days=1)).get('Engineering'), 24.0)
+
+    def test_fetch_by_ids_and_user_deletion(self):
+        ids = [timesheet.id for user in self.team for timesheet in my_models.TimesheetModel.objects.for_user(user)]
+        fetched = sharding.fetch_by_ids(my_models.TimesheetModel.objects.all(), ids)
+        self.assertEqual(sorted(timesheet.id for timesheet in fetched), sorted(ids))
+
+        user = self.team[0]
+        user.delete()
+        self.assertFalse(my_models.TimesheetModel.objects.for_user(user.pk).exists())
+
+
+class TimesheetIntegrityScannerTests(TestCase):
+    databases = {'default', *settings.TIMESHEET_SHARDS}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.now = timezone.now().replace(microsecond=0)
+        cls.user = User.objects.create_user('employee')
+        cls.other = User.objects.create_user('other')
+
+        def shift(user, clock_in_hours_ago, hours=None, flag=None):
+            clock_in = cls.now - datetime.timedelta(hours=clock_in_hours_ago)
+            clock_out = clock_in + datetime.timedelta(hours=hours) if hours is not None else None
+            return my_models.TimesheetModel.objects.create(user=user, clock_in_time=clock_in, clock_out_time=clock_out, integrity_flag=flag)
+
+        cls.shifts = {
+            'normal': shift(cls.user, 100, 8),
+            'overlap': shift(cls.user, 95, 5),
+            'negative': shift(cls.user, 80, -1),
+            # Forgotten, and the employee clocked in again 4 hours later.
+            'cut_short': shift(cls.user, 70),
+            'after_cut_short': shift(cls.user, 66, 6),
+            'forgotten': shift(cls.user, 40),
+            'running': shift(cls.user, 2),
+            'tie': shift(cls.other, 50, 1),
+            'tie_overlap': shift(cls.other, 50, 1),
+            'flagged': shift(cls.other, 30, -2, flag=my_models.TimesheetModel.IntegrityFlag.OVERLAP),
+        }
+
+    def scan(self, **options):
+        stats = Counter()
+        for using in sharding.shard_aliases() or [None]:
+            # Audit events are buffered once the scanned database's transaction commits.
+            with self.captureOnCommitCallbacks(using=using or 'default', execute=True):
+                stats.update(TimesheetIntegrityScanner(chunk_size=2, now=self.now, using=using, **options).run())
+        return stats
+
+    def reload(self):
+        return {
+            name: my_models.TimesheetModel.objects.for_user(shift.user_id).get(pk=shift.pk)
+            for name, shift in self.shifts.items()
+        }
+
+    def test_keyset_chunks_cover_every_row_once_across_ties(self):
+        for using in sharding.shard_aliases() or [None]:
+            # One row per chunk puts a page boundary between the two tied shifts.
+            scanner = TimesheetIntegrityScanner(chunk_size=1, using=using)
+            rows = [row for chunk in scanner.chunks() for row in chunk]
+            self.assertEqual(rows, sorted(rows, key=lambda row: (row[1], row[2], row[0])))
+            self.assertEqual(len({row[0] for row in rows}), len(rows))
+        self.assertEqual(self.scan(dry_run=True)['scanned'], len(self.shifts))
+
+    def test_flags_and_auto_closes(self):
+        stats = self.scan()
+        Flag = my_models.TimesheetModel.IntegrityFlag
+        self.assertEqual(
+            (stats[Flag.AUTO_CLOSED], stats[Flag.OVERLAP], stats[Flag.NEGATIVE_DURATION]), (2, 2, 1),
+        )
+
+        shifts = self.reload()
+        self.assertEqual({name: shift.integrity_flag for name, shift in shifts.items() if shift.integrity_flag}, {
+            'overlap': Flag.OVERLAP,
+            'negative': Flag.NEGATIVE_DURATION,
+            'cut_short': Flag.AUTO_CLOSED,
+            'forgotten': Flag.AUTO_CLOSED,
+            'tie_overlap': Flag.OVERLAP,
+            'flagged': Flag.OVERLAP,
+        })
+        # Closed at the next clock-in, through the CASE update, or after the default length.
+        self.assertEqual(shifts['cut_short'].clock_out_time, shifts['after_cut_short'].clock_in_time)
+        self.assertEqual(shifts['cut_short'].working_hours, datetime.timedelta(hours=4))
+        self.assertEqual(shifts['forgotten'].working_hours, datetime.timedelta(hours=8))
+        self.assertIsNone(shifts['running'].clock_out_time)
+
+        audit_buffer.flush()
+        self.assertEqual(
+            set(AuditEventModel.objects.filter(action=AuditEventModel.Action.SHIFT_AUTO_CLOSED).values_list('subject_id', flat=True)),
+            {self.shifts['cut_short'].pk, self.shifts['forgotten'].pk},
+        )
+        self.assertEqual(self.scan()[Flag.AUTO_CLOSED], 0)
+
+    def test_dry_run_writes_nothing(self):
+        changes = ChangeLogModel.objects.count()
+        stats = self.scan(dry_run=True)
+        self.assertEqual(stats[my_models.TimesheetModel.IntegrityFlag.AUTO_CLOSED], 2)
+        self.assertEqual(ChangeLogModel.objects.count(), changes)
+        self.assertIsNone(self.reload()['forgotten'].clock_out_time)
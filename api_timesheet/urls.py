@@ -8,4 +8,6 @@ urlpatterns = [
     path('api/timesheet/clock-out/', my_views.ClockOutView.as_view(), name='clock-out'),
     path('api/timesheet/me/', my_views.EmployeeTimesheetView.as_view(), name='my-timesheet'),
     path('api/timesheet/team/', my_views.TeamEmployeeTimesheetView.as_view(), name='team-timesheet'),
+    path('api/timesheet/me/daily/', my_views.EmployeeDailyTimesheetView.as_view(), name='my-daily-timesheet'),
+    path('api/timesheet/team/daily/', my_views.TeamDailyTimesheetView.as_view(), name='team-daily-timesheet'),
 ]
\ No newline at end of file
@@ -1,25 +1,55 @@
 from django.shortcuts import render
 from . import serializers as my_serializers
-from rest_framework import generics, filters, status
+from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
 from django.contrib.auth import get_user_model
+from django.db.models import Count, Max, Min, Sum
 
 
 from . import models as my_models
 from . import permissions as my_permissions
-from api_authentication.models import EmployeeModel
+from . import sharding
+from .pagination import DailyTotalsPagination, TeamDailyTotalsPagination
+from api_authentication.rosters import filter_to_team
+from api_core.filters import TieBreakOrderingFilter
+from api_core.projection import FieldProjectionMixin
+from api_core.throttling import UserTokenBucketThrottle, IPTokenBucketThrottle
 
 
 User = get_user_model()
 
 
+def filter_work_dates(queryset, query_params):
+    """`queryset` limited to the `since`/`until` work dates (inclusive) given in the query string."""
+    params = my_serializers.WorkDateRangeSerializer(data=query_params)
+    params.is_valid(raise_exception=True)
+    if 'since' in params.validated_data:
+        queryset = queryset.filter(work_date__gte=params.validated_data['since'])
+    if 'until' in params.validated_data:
+        queryset = queryset.filter(work_date__lte=params.validated_data['until'])
+    return queryset
+
+
+def daily_totals(queryset, *fields):
+    """Per work date (and `fields`): shift count, hours worked, first clock-in and last clock-out."""
+    return queryset.filter(work_date__isnull=False).values(*fields, 'work_date').annotate(
+        shifts=Count('id'),
+        working_hours=Sum('working_hours'),
+        first_clock_in=Min('clock_in_time'),
+        last_clock_out=Max('clock_out_time'),
+    )
+
+
 class ClockInView(generics.CreateAPIView):
     serializer_class = my_serializers.ClockInSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scope = 'clock'
+    request_priority = 'critical'
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -36,6 +66,9 @@ class ClockOutView(generics.UpdateAPIView):
     serializer_class = my_serializers.ClockOutSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scope = 'clock'
+    request_priority = 'critical'
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data, context={'request': request})
@@ -49,33 +82,76 @@ class ClockOutView(generics.UpdateAPIView):
         }, status=status.HTTP_200_OK)
     
 
-class EmployeeTimesheetView(generics.ListAPIView):
+class EmployeeTimesheetView(FieldProjectionMixin, generics.ListAPIView):
     serializer_class = my_serializers.EmployeeTimesheetSerializer
+    projection = my_serializers.EMPLOYEE_TIMESHEET_PROJECTION
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
     pagination_class = PageNumberPagination
     page_size = 15
-    filter_backends = [filters.OrderingFilter]
+    filter_backends = [TieBreakOrderingFilter]
     ordering_fields = ['clock_in_time', 'clock_out_time', 'working_hours']
-    ordering = ['-clock_in_time', '-clock_out_time']
+    # Ties broken by id, which the (user, clock_in_time) index already orders.
+    ordering = ['-clock_in_time', '-id']
     
     def get_queryset(self):
-        return my_models.TimesheetModel.objects.filter(user=self.request.user)
+        return filter_work_dates(my_models.TimesheetModel.objects.for_user(self.request.user), self.request.query_params)
 
 
 class TeamEmployeeTimesheetView(generics.ListAPIView):
     serializer_class = my_serializers.TeamEmployeeTimesheetSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, my_permissions.IsManager]
+    read_from_replica = True
 
     pagination_class = PageNumberPagination
     page_size = 10
 
-    filter_backends = [filters.OrderingFilter]
+    filter_backends = [TieBreakOrderingFilter]
     ordering_fields = ['clock_in_time', 'clock_out_time', 'working_hours']
-    ordering = ['-clock_in_time']
+    ordering = ['-clock_in_time', '-id']
+
+    def get_queryset(self):
+        queryset = filter_to_team(my_models.TimesheetModel.objects.all(), self.request.user.pk)
+        return filter_work_dates(queryset, self.request.query_params)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if sharding.sharding_enabled():
+            # The team is spread over the shards: query them in parallel and merge in order.
+            return sharding.fan_out_queryset(queryset)
+        return queryset
+
+
+class EmployeeDailyTimesheetView(generics.ListAPIView):
+    """Own daily totals, newest work date first, for the `since`/`until` work dates."""
+    serializer_class = my_serializers.DailyTimesheetSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    read_from_replica = True
+    pagination_class = DailyTotalsPagination
+
+    def get_queryset(self):
+        queryset = filter_work_dates(my_models.TimesheetModel.objects.for_user(self.request.user), self.request.query_params)
+        return daily_totals(queryset).order_by('-work_date')
+
+
+class TeamDailyTimesheetView(generics.ListAPIView):
+    """Managers: daily totals per team member, newest work date first."""
+    serializer_class = my_serializers.TeamDailyTimesheetSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, my_permissions.IsManager]
+    read_from_replica = True
+    pagination_class = TeamDailyTotalsPagination
 
     def get_queryset(self):
-        current_employee = EmployeeModel.objects.get(user=self.request.user)
-        team_employees = EmployeeModel.objects.filter(manager=current_employee).values_list('user', flat=True)
-        return my_models.TimesheetModel.objects.filter(user__in=team_employees)
+        queryset = filter_to_team(my_models.TimesheetModel.objects.all(), self.request.user.pk)
+        return daily_totals(filter_work_dates(queryset, self.request.query_params), 'user_id').order_by('-work_date', 'user_id')
+
+    def filter_queryset(self, queryset):
+        if sharding.sharding_enabled():
+            # Each user's days are all on one shard, so each page only needs the
+            # next page's worth of rows from every shard, merged.
+            return sharding.FanOutQuerySet(queryset)
+        return queryset
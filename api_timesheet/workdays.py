@@ -0,0 +1,29 @@
+import zoneinfo
+
+from django.utils import timezone
+
+from api_authentication.models import EmployeeModel
+from api_authentication.profiles import get_profile
+
+
+def work_date(moment, tzinfo):
+    """The local date of `moment` in `tzinfo`: the day a shift starting then is booked on."""
+    return timezone.localtime(moment, tzinfo).date()
+
+
+def user_timezone(user_id):
+    """The user's time zone, read from their cached profile; TIME_ZONE without one."""
+    profile = get_profile(user_id)
+    name = profile and profile.get('timezone')
+    return zoneinfo.ZoneInfo(name) if name else timezone.get_default_timezone()
+
+
+def user_timezones(user_ids):
+    """{user_id: time zone} for many users in one query; TIME_ZONE for those without one."""
+    user_ids = set(user_ids)
+    names = dict(
+        EmployeeModel.objects.filter(user_id__in=user_ids, timezone__gt='')
+        .values_list('user_id', 'timezone')
+    )
+    default = timezone.get_default_timezone()
+    return {user_id: zoneinfo.ZoneInfo(names[user_id]) if user_id in names else default for user_id in user_ids}